@@ -0,0 +1,434 @@
+"""initial schema
+
+Full schema as of the move from create_all-at-import to Alembic.
+Tables and indexes are only created when missing, so databases that were
+built by the old create_all can run `alembic upgrade head` as well: it
+adds the indexes create_all never added to existing tables.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 18:13:15.929766
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _missing_table(name: str) -> bool:
+    if context.is_offline_mode():
+        return True
+    return not sa.inspect(op.get_bind()).has_table(name)
+
+
+def _create_table(name: str, *columns, **kw) -> None:
+    if _missing_table(name):
+        op.create_table(name, *columns, **kw)
+
+
+def _create_index(name: str, table: str, columns, unique: bool = False) -> None:
+    if not context.is_offline_mode():
+        existing = {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+        if name in existing:
+            return
+    op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade() -> None:
+    _create_table('cohort_performance',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cohort_month', sa.String(length=7), nullable=False),
+    sa.Column('months_on_book', sa.Integer(), nullable=False),
+    sa.Column('loans_count', sa.Integer(), nullable=False),
+    sa.Column('disbursed_principal', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('expected_amount', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('collected_amount', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('cumulative_expected', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('cumulative_collected', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_cohort_performance_id', 'cohort_performance', ['id'], unique=False)
+    _create_index('ux_cohort_performance_cohort_mob', 'cohort_performance', ['cohort_month', 'months_on_book'], unique=True)
+
+    _create_table('cohort_refresh_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('last_loan_id', sa.Integer(), nullable=False),
+    sa.Column('last_event_id', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table('loan_products',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('interest_rate', sa.Float(), nullable=False),
+    sa.Column('max_tenor_months', sa.Integer(), nullable=False),
+    sa.Column('min_amount', sa.Float(), nullable=True),
+    sa.Column('max_amount', sa.Float(), nullable=True),
+    sa.Column('repayment_frequency', sa.String(length=50), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_loan_products_created_id', 'loan_products', ['created_at', 'id'], unique=False)
+    _create_index('ix_loan_products_id', 'loan_products', ['id'], unique=False)
+
+    _create_table('partner_organizations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('phone', sa.String(length=50), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('contact_person_name', sa.String(length=255), nullable=True),
+    sa.Column('contact_person_email', sa.String(length=255), nullable=True),
+    sa.Column('contact_person_phone', sa.String(length=50), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    _create_index('ix_partner_organizations_id', 'partner_organizations', ['id'], unique=False)
+
+    _create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.Enum('ADMIN', 'LOAN_OFFICER', 'MANAGER', 'CASHIER', 'AUTHORIZER', name='userrole'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_users_email', 'users', ['email'], unique=True)
+    _create_index('ix_users_id', 'users', ['id'], unique=False)
+
+    _create_table('company_loan_links',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('token', sa.String(length=100), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['partner_organizations.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['loan_products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_company_loan_links_created_id', 'company_loan_links', ['created_at', 'id'], unique=False)
+    _create_index('ix_company_loan_links_id', 'company_loan_links', ['id'], unique=False)
+    _create_index('ix_company_loan_links_org_created_id', 'company_loan_links', ['organization_id', 'created_at', 'id'], unique=False)
+    _create_index('ix_company_loan_links_token', 'company_loan_links', ['token'], unique=True)
+
+    _create_table('customers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=50), nullable=False),
+    sa.Column('staff_id', sa.String(length=100), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('bvn', sa.String(length=11), nullable=True),
+    sa.Column('net_monthly_salary', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('nun_account_number', sa.String(length=20), nullable=True),
+    sa.Column('account_balance', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['partner_organizations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_customers_created_id', 'customers', ['created_at', 'id'], unique=False)
+    _create_index('ix_customers_id', 'customers', ['id'], unique=False)
+    _create_index('ix_customers_nun_account_number', 'customers', ['nun_account_number'], unique=True)
+
+    _create_table('organization_data_versions',
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['partner_organizations.id'], ),
+    sa.PrimaryKeyConstraint('organization_id')
+    )
+    _create_table('outstanding_checkpoints',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('as_of', sa.DateTime(), nullable=False),
+    sa.Column('total_scheduled', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('total_paid', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['partner_organizations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_outstanding_checkpoints_id', 'outstanding_checkpoints', ['id'], unique=False)
+    _create_index('ux_outstanding_checkpoints_org_as_of', 'outstanding_checkpoints', ['organization_id', 'as_of'], unique=True)
+
+    _create_table('partner_remittance_accounts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('account_number', sa.String(length=32), nullable=False),
+    sa.Column('bank_name', sa.String(length=255), nullable=True),
+    sa.Column('account_name', sa.String(length=255), nullable=True),
+    sa.Column('provider', sa.String(length=100), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['partner_organizations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_partner_remittance_accounts_account_number', 'partner_remittance_accounts', ['account_number'], unique=True)
+    _create_index('ix_partner_remittance_accounts_id', 'partner_remittance_accounts', ['id'], unique=False)
+    _create_index('ix_partner_remittance_accounts_organization_id', 'partner_remittance_accounts', ['organization_id'], unique=False)
+
+    _create_table('partner_users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=True),
+    sa.Column('role', sa.Enum('PARTNER_ADMIN', 'PARTNER_STAFF', name='partneruserrole'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['partner_organizations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_partner_users_email', 'partner_users', ['email'], unique=True)
+    _create_index('ix_partner_users_id', 'partner_users', ['id'], unique=False)
+    _create_index('ix_partner_users_organization_id', 'partner_users', ['organization_id'], unique=False)
+
+    _create_table('report_artifacts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('data_version', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['partner_organizations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_report_artifacts_id', 'report_artifacts', ['id'], unique=False)
+    _create_index('ux_report_artifacts_org_period_version', 'report_artifacts', ['organization_id', 'year', 'month', 'data_version'], unique=True)
+
+    _create_table('inbound_transactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('remittance_account_id', sa.Integer(), nullable=True),
+    sa.Column('organization_id', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('reference', sa.String(length=100), nullable=False),
+    sa.Column('narration', sa.Text(), nullable=True),
+    sa.Column('sender_name', sa.String(length=255), nullable=True),
+    sa.Column('paid_at', sa.DateTime(), nullable=False),
+    sa.Column('match_status', sa.Enum('UNMATCHED', 'MATCHED', 'DISPUTED', name='transactionmatchstatus'), nullable=False),
+    sa.Column('raw_payload', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['partner_organizations.id'], ),
+    sa.ForeignKeyConstraint(['remittance_account_id'], ['partner_remittance_accounts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_inbound_transactions_id', 'inbound_transactions', ['id'], unique=False)
+    _create_index('ix_inbound_transactions_organization_id', 'inbound_transactions', ['organization_id'], unique=False)
+    _create_index('ix_inbound_transactions_reference', 'inbound_transactions', ['reference'], unique=True)
+    _create_index('ix_inbound_transactions_remittance_account_id', 'inbound_transactions', ['remittance_account_id'], unique=False)
+
+    _create_table('loan_applications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('link_id', sa.Integer(), nullable=True),
+    sa.Column('requested_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('approved_amount', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('tenor_months', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('officer_comment', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['link_id'], ['company_loan_links.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['loan_products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_loan_applications_created_id', 'loan_applications', ['created_at', 'id'], unique=False)
+    _create_index('ix_loan_applications_id', 'loan_applications', ['id'], unique=False)
+    _create_index('ix_loan_applications_status', 'loan_applications', ['status'], unique=False)
+    _create_index('ix_loan_applications_status_created_id', 'loan_applications', ['status', 'created_at', 'id'], unique=False)
+
+    _create_table('partner_invite_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('partner_user_id', sa.Integer(), nullable=False),
+    sa.Column('token_hash', sa.String(length=255), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('used_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['partner_user_id'], ['partner_users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_partner_invite_tokens_id', 'partner_invite_tokens', ['id'], unique=False)
+    _create_index('ix_partner_invite_tokens_partner_user_id', 'partner_invite_tokens', ['partner_user_id'], unique=False)
+    _create_index('ix_partner_invite_tokens_token_hash', 'partner_invite_tokens', ['token_hash'], unique=False)
+
+    _create_table('loans',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('principal_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('interest_rate', sa.Numeric(precision=5, scale=4), nullable=False),
+    sa.Column('total_payable', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('start_date', sa.DateTime(), nullable=True),
+    sa.Column('end_date', sa.DateTime(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('disbursed_at', sa.DateTime(), nullable=True),
+    sa.Column('disbursement_reference', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['application_id'], ['loan_applications.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['loan_products.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('application_id')
+    )
+    _create_index('ix_loans_created_id', 'loans', ['created_at', 'id'], unique=False)
+    _create_index('ix_loans_disbursement_reference', 'loans', ['disbursement_reference'], unique=True)
+    _create_index('ix_loans_id', 'loans', ['id'], unique=False)
+    _create_index('ix_loans_status', 'loans', ['status'], unique=False)
+    _create_index('ix_loans_status_created_id', 'loans', ['status', 'created_at', 'id'], unique=False)
+
+    _create_table('disbursements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('loan_application_id', sa.Integer(), nullable=False),
+    sa.Column('loan_id', sa.Integer(), nullable=True),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('method', sa.String(length=30), nullable=False),
+    sa.Column('reference', sa.String(length=50), nullable=True),
+    sa.Column('narration', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['loan_application_id'], ['loan_applications.id'], ),
+    sa.ForeignKeyConstraint(['loan_id'], ['loans.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_disbursements_customer_id', 'disbursements', ['customer_id'], unique=False)
+    _create_index('ix_disbursements_id', 'disbursements', ['id'], unique=False)
+    _create_index('ix_disbursements_loan_application_id', 'disbursements', ['loan_application_id'], unique=False)
+    _create_index('ix_disbursements_loan_id', 'disbursements', ['loan_id'], unique=False)
+    _create_index('ix_disbursements_reference', 'disbursements', ['reference'], unique=True)
+
+    _create_table('repayments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('loan_id', sa.Integer(), nullable=False),
+    sa.Column('installment_number', sa.Integer(), nullable=False),
+    sa.Column('due_date', sa.DateTime(), nullable=False),
+    sa.Column('amount_due', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('amount_paid', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('is_paid', sa.Boolean(), nullable=True),
+    sa.Column('paid_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['loan_id'], ['loans.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_repayments_created_at', 'repayments', ['created_at'], unique=False)
+    _create_index('ix_repayments_id', 'repayments', ['id'], unique=False)
+
+    _create_table('allocation_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.Enum('APPLIED', 'REVERSED', name='allocationeventtype'), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('loan_id', sa.Integer(), nullable=False),
+    sa.Column('repayment_id', sa.Integer(), nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('effective_at', sa.DateTime(), nullable=True),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['loan_id'], ['loans.id'], ),
+    sa.ForeignKeyConstraint(['organization_id'], ['partner_organizations.id'], ),
+    sa.ForeignKeyConstraint(['repayment_id'], ['repayments.id'], ),
+    sa.ForeignKeyConstraint(['transaction_id'], ['inbound_transactions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_allocation_events_id', 'allocation_events', ['id'], unique=False)
+    _create_index('ix_allocation_events_loan_occurred', 'allocation_events', ['loan_id', 'occurred_at', 'id'], unique=False)
+    _create_index('ix_allocation_events_org_occurred', 'allocation_events', ['organization_id', 'occurred_at', 'id'], unique=False)
+    _create_index('ix_allocation_events_repayment_id', 'allocation_events', ['repayment_id'], unique=False)
+    _create_index('ix_allocation_events_transaction_id', 'allocation_events', ['transaction_id'], unique=False)
+
+    _create_table('journal_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entry_type', sa.Enum('DISBURSEMENT_CREDIT', 'REPAYMENT_DEBIT', 'REVERSAL', name='journalentrytype'), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('disbursement_id', sa.Integer(), nullable=True),
+    sa.Column('reverses_entry_id', sa.Integer(), nullable=True),
+    sa.Column('reference', sa.String(length=60), nullable=True),
+    sa.Column('narration', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['disbursement_id'], ['disbursements.id'], ),
+    sa.ForeignKeyConstraint(['reverses_entry_id'], ['journal_entries.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('reverses_entry_id')
+    )
+    _create_index('ix_journal_entries_customer_id', 'journal_entries', ['customer_id'], unique=False)
+    _create_index('ix_journal_entries_disbursement_id', 'journal_entries', ['disbursement_id'], unique=False)
+    _create_index('ix_journal_entries_id', 'journal_entries', ['id'], unique=False)
+    _create_index('ix_journal_entries_reference', 'journal_entries', ['reference'], unique=True)
+
+    _create_table('transaction_allocations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=False),
+    sa.Column('repayment_id', sa.Integer(), nullable=False),
+    sa.Column('amount_applied', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['repayment_id'], ['repayments.id'], ),
+    sa.ForeignKeyConstraint(['transaction_id'], ['inbound_transactions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_transaction_allocations_id', 'transaction_allocations', ['id'], unique=False)
+    _create_index('ix_transaction_allocations_repayment_id', 'transaction_allocations', ['repayment_id'], unique=False)
+    _create_index('ix_transaction_allocations_transaction_id', 'transaction_allocations', ['transaction_id'], unique=False)
+
+    _create_table('journal_postings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('account', sa.String(length=50), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('balance_after', sa.Numeric(precision=14, scale=2), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['entry_id'], ['journal_entries.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_journal_postings_customer_created', 'journal_postings', ['customer_id', 'created_at', 'id'], unique=False)
+    _create_index('ix_journal_postings_entry_id', 'journal_postings', ['entry_id'], unique=False)
+    _create_index('ix_journal_postings_id', 'journal_postings', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('journal_postings')
+    op.drop_table('transaction_allocations')
+    op.drop_table('journal_entries')
+    op.drop_table('allocation_events')
+    op.drop_table('repayments')
+    op.drop_table('disbursements')
+    op.drop_table('loans')
+    op.drop_table('partner_invite_tokens')
+    op.drop_table('loan_applications')
+    op.drop_table('inbound_transactions')
+    op.drop_table('report_artifacts')
+    op.drop_table('partner_users')
+    op.drop_table('partner_remittance_accounts')
+    op.drop_table('outstanding_checkpoints')
+    op.drop_table('organization_data_versions')
+    op.drop_table('customers')
+    op.drop_table('company_loan_links')
+    op.drop_table('users')
+    op.drop_table('partner_organizations')
+    op.drop_table('loan_products')
+    op.drop_table('cohort_refresh_state')
+    op.drop_table('cohort_performance')
+
+    # PostgreSQL keeps enum types after their tables are dropped
+    for name in ("userrole", "partneruserrole", "transactionmatchstatus", "allocationeventtype", "journalentrytype"):
+        sa.Enum(name=name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,48 @@
+"""public apply keys
+
+- unique customer key (organization_id, staff_id): public applications
+  upsert customers on it
+- loan_applications (customer_id, status): the open-application / active-loan
+  guard on submit
+
+Duplicate customer rows must be
+merged first; the upgrade stops and lists them rather than guessing which
+record (and which applications) to keep.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 20:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode():
+        duplicates = op.get_bind().execute(sa.text(
+            "SELECT organization_id, staff_id, COUNT(*) FROM customers "
+            "GROUP BY organization_id, staff_id HAVING COUNT(*) > 1 "
+            "ORDER BY organization_id, staff_id LIMIT 20"
+        )).all()
+        if duplicates:
+            listed = ", ".join(f"org {o} staff {s!r} x{n}" for o, s, n in duplicates)
+            raise RuntimeError(
+                f"customers has duplicate (organization_id, staff_id) rows; merge them before upgrading: {listed}"
+            )
+    op.create_index('ux_customers_org_staff', 'customers', ['organization_id', 'staff_id'], unique=True)
+    op.create_index('ix_loan_applications_customer_status', 'loan_applications', ['customer_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_loan_applications_customer_status', table_name='loan_applications')
+    op.drop_index('ux_customers_org_staff', table_name='customers')
@@ -0,0 +1,42 @@
+"""unique customer BVN per organization
+
+Roster imports and public applications treat a BVN as belonging to one
+staff record per organization; this makes the database enforce it. NULL
+BVNs are not constrained. Duplicates must be resolved first; the upgrade
+stops and lists them.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 21:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode():
+        duplicates = op.get_bind().execute(sa.text(
+            "SELECT organization_id, bvn, COUNT(*) FROM customers WHERE bvn IS NOT NULL "
+            "GROUP BY organization_id, bvn HAVING COUNT(*) > 1 "
+            "ORDER BY organization_id, bvn LIMIT 20"
+        )).all()
+        if duplicates:
+            listed = ", ".join(f"org {o} bvn {b!r} x{n}" for o, b, n in duplicates)
+            raise RuntimeError(
+                f"customers has duplicate (organization_id, bvn) rows; resolve them before upgrading: {listed}"
+            )
+    op.create_index('ux_customers_org_bvn', 'customers', ['organization_id', 'bvn'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_customers_org_bvn', table_name='customers')
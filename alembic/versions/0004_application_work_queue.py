@@ -0,0 +1,44 @@
+"""application work queue
+
+- loan_applications.priority (lower first, default 100)
+- loan_applications.claimed_by_id / claim_expires_at: an officer's lease
+- ix_loan_applications_queue (status, priority, created_at, id): the claim
+  order, so the next pending rows come off the index
+- ix_loan_applications_claimed_by: an officer's current claims
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 23:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('loan_applications') as batch_op:
+        batch_op.add_column(sa.Column('priority', sa.Integer(), server_default='100', nullable=False))
+        batch_op.add_column(sa.Column('claimed_by_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('claim_expires_at', sa.DateTime(), nullable=True))
+        batch_op.create_foreign_key('fk_loan_applications_claimed_by_id_users', 'users', ['claimed_by_id'], ['id'])
+        batch_op.create_index('ix_loan_applications_queue', ['status', 'priority', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_loan_applications_claimed_by', ['claimed_by_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('loan_applications') as batch_op:
+        batch_op.drop_index('ix_loan_applications_claimed_by')
+        batch_op.drop_index('ix_loan_applications_queue')
+        batch_op.drop_constraint('fk_loan_applications_claimed_by_id_users', type_='foreignkey')
+        batch_op.drop_column('claim_expires_at')
+        batch_op.drop_column('claimed_by_id')
+        batch_op.drop_column('priority')
@@ -0,0 +1,49 @@
+"""created_at NOT NULL on cursor-paginated tables
+
+List endpoints page on (created_at, id); a row with NULL created_at produced
+a cursor that could not be decoded. Existing NULLs are backfilled (from
+updated_at / disbursed_at where the table has one, else 1970-01-01 so they
+sort as the oldest rows) and the column becomes NOT NULL on:
+- company_loan_links
+- customers
+- loan_applications
+- loans
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-20 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EPOCH = "'1970-01-01 00:00:00'"
+
+BACKFILL = {
+    'company_loan_links': EPOCH,
+    'customers': EPOCH,
+    'loan_applications': f"COALESCE(updated_at, {EPOCH})",
+    'loans': f"COALESCE(disbursed_at, {EPOCH})",
+}
+
+
+def upgrade() -> None:
+    for table, value in BACKFILL.items():
+        op.execute(f"UPDATE {table} SET created_at = {value} WHERE created_at IS NULL")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    for table in reversed(list(BACKFILL)):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
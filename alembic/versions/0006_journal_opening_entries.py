@@ -0,0 +1,34 @@
+"""journal OPENING entry type
+
+Balances that existed before the journal are carried in with one OPENING
+entry per customer (ledger_crud.backfill_opening_entries, run from
+POST /customers/ledger/opening-entries). PostgreSQL needs the enum value
+first; elsewhere the column is a plain string.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-20 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # ADD VALUE cannot run inside a transaction block before PostgreSQL 12
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE journalentrytype ADD VALUE IF NOT EXISTS 'OPENING'")
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop an enum value; an unused OPENING value is harmless
+    pass
@@ -43,6 +43,72 @@ class Settings(BaseSettings):
     
     RESET_TOKEN_EXPIRE_MINUTES: int = Field(default=30)
     FRONTEND_RESET_URL: str = Field(default="http://localhost:5173/reset-password")
+    MIN_PASSWORD_LEN: int = Field(default=6)
+
+    
+    UNALLOCATED_SWEEP_ENABLED: bool = Field(default=False)
+    UNALLOCATED_SWEEP_INTERVAL_SECONDS: int = Field(default=300)
+    UNALLOCATED_SWEEP_MAX_ORGS: int = Field(default=50)
+    UNALLOCATED_SWEEP_MAX_ALLOCATIONS: int = Field(default=5000)
+
+    
+    AS_OF_CHECKPOINT_ENABLED: bool = Field(default=False)
+    AS_OF_CHECKPOINT_INTERVAL_SECONDS: int = Field(default=3600)
+
+    
+    REPORT_CACHE_TTL_SECONDS: int = Field(default=300)
+    SINGLE_FLIGHT_RESULT_TTL_SECONDS: float = Field(default=2.0)
+
+    
+    COHORT_REFRESH_ENABLED: bool = Field(default=False)
+    COHORT_REFRESH_INTERVAL_SECONDS: int = Field(default=3600)
+
+    
+    MONTH_CLOSE_ENABLED: bool = Field(default=False)
+    MONTH_CLOSE_INTERVAL_SECONDS: int = Field(default=21600)
+    MONTH_CLOSE_WORKERS: int = Field(default=4)
+
+    
+    ADMISSION_CONTROL_ENABLED: bool = Field(default=True)
+    ADMISSION_REPORTS_MAX_CONCURRENT: int = Field(default=4)
+    ADMISSION_REPORTS_MAX_QUEUE: int = Field(default=16)
+    ADMISSION_REPORTS_QUEUE_TIMEOUT_SECONDS: float = Field(default=10.0)
+    ADMISSION_TRANSACTIONAL_MAX_CONCURRENT: int = Field(default=24)
+    ADMISSION_TRANSACTIONAL_MAX_QUEUE: int = Field(default=64)
+    ADMISSION_TRANSACTIONAL_QUEUE_TIMEOUT_SECONDS: float = Field(default=5.0)
+    ADMISSION_AUTH_MAX_CONCURRENT: int = Field(default=8)
+    ADMISSION_AUTH_MAX_QUEUE: int = Field(default=32)
+    ADMISSION_AUTH_QUEUE_TIMEOUT_SECONDS: float = Field(default=5.0)
+
+    
+    SQL_INSTRUMENTATION_ENABLED: bool = Field(default=True)
+    SQL_STRICT_MODE: bool = Field(default=False)
+    SQL_MAX_DUPLICATE_STATEMENTS: int = Field(default=10)
+    SQL_DEFAULT_QUERY_BUDGET: int = Field(default=0)
+
+    
+    METRICS_ENABLED: bool = Field(default=True)
+
+    
+    CATALOGUE_CACHE_TTL_SECONDS: int = Field(default=60)
+    CATALOGUE_CACHE_MAX_ENTRIES: int = Field(default=10000)
+    CATALOGUE_CACHE_NOTIFY_ENABLED: bool = Field(default=False)
+    CATALOGUE_CACHE_NOTIFY_CHANNEL: str = Field(default="catalogue_cache")
+
+    
+    ROSTER_IMPORT_CHUNK_SIZE: int = Field(default=1000)
+    ROSTER_IMPORT_MAX_ERRORS: int = Field(default=100)
+
+    
+    MAX_REPAYMENT_TO_SALARY_RATIO: float = Field(default=0.75)
+
+    
+    BULK_STATUS_CHUNK_SIZE: int = Field(default=500)
+    BULK_STATUS_MAX_ITEMS: int = Field(default=5000)
+
+    
+    QUEUE_CLAIM_LEASE_SECONDS: int = Field(default=900)
+    QUEUE_CLAIM_MAX_BATCH: int = Field(default=50)
 
     def cors_origins_list(self) -> List[str]:
         return [o.strip() for o in self.FRONTEND_ORIGINS.split(",") if o.strip()]
@@ -54,26 +54,55 @@ def get_org_remittance_summary(db: Session, organization_id: int) -> Dict:
     }
 
 
+def inbound_transaction_columns():
+    """
+    Columns of InboundTransactionOut, for projected (non-ORM) list queries.
+    """
+    t = model.InboundTransaction
+    return (
+        t.id,
+        t.organization_id,
+        t.remittance_account_id,
+        t.amount,
+        t.reference,
+        t.narration,
+        t.sender_name,
+        t.paid_at,
+        t.match_status,
+        t.created_at,
+    )
+
+
 def list_org_transactions_with_allocation(db: Session, organization_id: int) -> Dict:
     """
-    Returns each tx and how much was applied vs unallocated
+    Returns each tx and how much was applied vs unallocated.
+    One query: applied amounts come from a grouped subquery, and rows are
+    projected columns rather than hydrated ORM objects.
     """
-    txs: List[model.InboundTransaction] = (
-        db.query(model.InboundTransaction)
+    applied_sq = (
+        db.query(
+            model.TransactionAllocation.transaction_id.label("transaction_id"),
+            func.sum(model.TransactionAllocation.amount_applied).label("applied"),
+        )
+        .group_by(model.TransactionAllocation.transaction_id)
+        .subquery()
+    )
+
+    columns = inbound_transaction_columns()
+    result = (
+        db.query(*columns, func.coalesce(applied_sq.c.applied, 0))
+        .outerjoin(applied_sq, applied_sq.c.transaction_id == model.InboundTransaction.id)
         .filter(model.InboundTransaction.organization_id == organization_id)
         .order_by(model.InboundTransaction.paid_at.desc())
         .all()
     )
 
+    names = [c.key for c in columns]
     rows = []
-    for tx in txs:
-        applied = (
-            db.query(func.coalesce(func.sum(model.TransactionAllocation.amount_applied), 0))
-            .filter(model.TransactionAllocation.transaction_id == tx.id)
-            .scalar()
-        )
-        applied = Decimal(str(applied or "0"))
-        amt = Decimal(str(tx.amount or "0"))
+    for r in result:
+        tx = dict(zip(names, r[:-1]))
+        applied = Decimal(str(r[-1] or "0")).quantize(Decimal("0.01"))
+        amt = Decimal(str(tx["amount"] or "0"))
         rows.append(
             {
                 "tx": tx,
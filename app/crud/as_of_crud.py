@@ -0,0 +1,237 @@
+# app/crud/as_of_crud.py
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Optional, Set
+
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+
+from .. import model
+
+
+def _to_dec(x) -> Decimal:
+    return Decimal(str(x or "0")).quantize(Decimal("0.01"))
+
+
+def _org_scheduled_query(db: Session):
+    return (
+        db.query(func.coalesce(func.sum(model.Repayment.amount_due), 0))
+        .join(model.Loan, model.Loan.id == model.Repayment.loan_id)
+        .join(model.LoanApplication, model.LoanApplication.id == model.Loan.application_id)
+        .join(model.Customer, model.Customer.id == model.LoanApplication.customer_id)
+    )
+
+
+def get_latest_checkpoint(
+    db: Session, organization_id: int, as_of: datetime
+) -> Optional[model.OutstandingCheckpoint]:
+    return (
+        db.query(model.OutstandingCheckpoint)
+        .filter(
+            model.OutstandingCheckpoint.organization_id == organization_id,
+            model.OutstandingCheckpoint.as_of <= as_of,
+        )
+        .order_by(model.OutstandingCheckpoint.as_of.desc())
+        .first()
+    )
+
+
+def get_org_outstanding_as_of(db: Session, organization_id: int, as_of: datetime) -> Dict:
+    """
+    outstanding(as_of) = scheduled installments that existed at as_of
+                         - net allocation events that had happened by as_of
+
+    Starts from the latest checkpoint at/before as_of and only replays the
+    rows after it (indexed on created_at / (organization_id, occurred_at)).
+    """
+    cp = get_latest_checkpoint(db, organization_id, as_of)
+    since = cp.as_of if cp else None
+
+    scheduled_q = (
+        _org_scheduled_query(db)
+        .filter(model.Customer.organization_id == organization_id)
+        .filter(model.Repayment.created_at <= as_of)
+    )
+    paid_q = (
+        db.query(func.coalesce(func.sum(model.AllocationEvent.amount), 0))
+        .filter(model.AllocationEvent.organization_id == organization_id)
+        .filter(model.AllocationEvent.occurred_at <= as_of)
+    )
+    if since is not None:
+        scheduled_q = scheduled_q.filter(model.Repayment.created_at > since)
+        paid_q = paid_q.filter(model.AllocationEvent.occurred_at > since)
+
+    total_scheduled = _to_dec(scheduled_q.scalar()) + (_to_dec(cp.total_scheduled) if cp else Decimal("0.00"))
+    total_paid = _to_dec(paid_q.scalar()) + (_to_dec(cp.total_paid) if cp else Decimal("0.00"))
+
+    return {
+        "as_of": as_of,
+        "organization_id": organization_id,
+        "loan_id": None,
+        "total_scheduled": total_scheduled,
+        "total_paid": total_paid,
+        "outstanding": total_scheduled - total_paid,
+        "checkpoint_as_of": since,
+    }
+
+
+def get_loan_outstanding_as_of(db: Session, loan_id: int, as_of: datetime) -> Dict:
+    total_scheduled = (
+        db.query(func.coalesce(func.sum(model.Repayment.amount_due), 0))
+        .filter(model.Repayment.loan_id == loan_id)
+        .filter(model.Repayment.created_at <= as_of)
+        .scalar()
+    )
+    total_paid = (
+        db.query(func.coalesce(func.sum(model.AllocationEvent.amount), 0))
+        .filter(model.AllocationEvent.loan_id == loan_id)
+        .filter(model.AllocationEvent.occurred_at <= as_of)
+        .scalar()
+    )
+
+    total_scheduled = _to_dec(total_scheduled)
+    total_paid = _to_dec(total_paid)
+
+    return {
+        "as_of": as_of,
+        "organization_id": None,
+        "loan_id": loan_id,
+        "total_scheduled": total_scheduled,
+        "total_paid": total_paid,
+        "outstanding": total_scheduled - total_paid,
+        "checkpoint_as_of": None,
+    }
+
+
+def create_checkpoints(
+    db: Session,
+    as_of: datetime,
+    organization_ids: Optional[Set[int]] = None,
+    commit: bool = True,
+) -> int:
+    """
+    Writes one checkpoint per organization at as_of (idempotent: orgs that
+    already have a checkpoint at as_of are skipped). Two grouped queries total.
+    organization_ids limits the write to those orgs.
+    """
+    existing = {
+        org_id
+        for (org_id,) in db.query(model.OutstandingCheckpoint.organization_id)
+        .filter(model.OutstandingCheckpoint.as_of == as_of)
+        .all()
+    }
+
+    scheduled_by_org = dict(
+        db.query(
+            model.Customer.organization_id,
+            func.coalesce(func.sum(model.Repayment.amount_due), 0),
+        )
+        .select_from(model.Repayment)
+        .join(model.Loan, model.Loan.id == model.Repayment.loan_id)
+        .join(model.LoanApplication, model.LoanApplication.id == model.Loan.application_id)
+        .join(model.Customer, model.Customer.id == model.LoanApplication.customer_id)
+        .filter(model.Repayment.created_at <= as_of)
+        .group_by(model.Customer.organization_id)
+        .all()
+    )
+
+    paid_by_org = dict(
+        db.query(
+            model.AllocationEvent.organization_id,
+            func.coalesce(func.sum(model.AllocationEvent.amount), 0),
+        )
+        .filter(model.AllocationEvent.occurred_at <= as_of)
+        .group_by(model.AllocationEvent.organization_id)
+        .all()
+    )
+
+    created = 0
+    for org_id in set(scheduled_by_org) | set(paid_by_org):
+        if org_id in existing or (organization_ids is not None and org_id not in organization_ids):
+            continue
+        db.add(
+            model.OutstandingCheckpoint(
+                organization_id=org_id,
+                as_of=as_of,
+                total_scheduled=_to_dec(scheduled_by_org.get(org_id)),
+                total_paid=_to_dec(paid_by_org.get(org_id)),
+            )
+        )
+        created += 1
+
+    if commit:
+        db.commit()
+    return created
+
+
+def backfill_allocation_events(db: Session) -> int:
+    """
+    One-off: seeds APPLIED events from TransactionAllocation rows written before
+    the event history existed (allocations that already have events are skipped).
+
+    Checkpoints only replay events after their as_of, so an org's checkpoints at
+    or after its earliest backfilled event are rebuilt in the same run.
+    """
+    has_event = (
+        db.query(model.AllocationEvent.id)
+        .filter(
+            model.AllocationEvent.transaction_id == model.TransactionAllocation.transaction_id,
+            model.AllocationEvent.repayment_id == model.TransactionAllocation.repayment_id,
+        )
+        .exists()
+    )
+
+    rows = (
+        db.query(
+            model.TransactionAllocation,
+            model.Repayment.loan_id,
+            model.InboundTransaction.organization_id,
+            model.InboundTransaction.paid_at,
+        )
+        .join(model.Repayment, model.Repayment.id == model.TransactionAllocation.repayment_id)
+        .join(model.InboundTransaction, model.InboundTransaction.id == model.TransactionAllocation.transaction_id)
+        .filter(~has_event)
+        .all()
+    )
+
+    earliest_by_org: Dict[int, datetime] = {}
+    for alloc, loan_id, org_id, paid_at in rows:
+        occurred_at = alloc.created_at or datetime.utcnow()
+        db.add(
+            model.AllocationEvent(
+                event_type=model.AllocationEventType.APPLIED,
+                organization_id=org_id,
+                loan_id=loan_id,
+                repayment_id=alloc.repayment_id,
+                transaction_id=alloc.transaction_id,
+                amount=alloc.amount_applied,
+                effective_at=paid_at,
+                occurred_at=occurred_at,
+            )
+        )
+        if org_id not in earliest_by_org or occurred_at < earliest_by_org[org_id]:
+            earliest_by_org[org_id] = occurred_at
+
+    db.flush()
+    _rebuild_checkpoints_since(db, earliest_by_org)
+    db.commit()
+    return len(rows)
+
+
+def _rebuild_checkpoints_since(db: Session, earliest_by_org: Dict[int, datetime]) -> None:
+    """
+    Drops each org's checkpoints with as_of >= the given time and writes them
+    again from the (now complete) event history. Caller commits.
+    """
+    stale_as_of = set()
+    for org_id, since in earliest_by_org.items():
+        stale = db.query(model.OutstandingCheckpoint).filter(
+            model.OutstandingCheckpoint.organization_id == org_id,
+            model.OutstandingCheckpoint.as_of >= since,
+        )
+        stale_as_of.update(as_of for (as_of,) in stale.with_entities(model.OutstandingCheckpoint.as_of))
+        stale.delete(synchronize_session=False)
+
+    for as_of in sorted(stale_as_of):
+        create_checkpoints(db, as_of, organization_ids=set(earliest_by_org), commit=False)
@@ -0,0 +1,205 @@
+# app/crud/cohort_crud.py
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from .. import model
+from .report_crud import month_bucket, month_bucket_value, month_label
+
+_IN_CHUNK = 200
+
+
+def _dec(x) -> Decimal:
+    return Decimal(str(x or "0")).quantize(Decimal("0.01"))
+
+
+def _cohort_expr(db: Session):
+    return month_bucket(db, func.coalesce(model.Loan.disbursed_at, model.Loan.created_at))
+
+
+def _get_state(db: Session) -> model.CohortRefreshState:
+    state = db.query(model.CohortRefreshState).filter(model.CohortRefreshState.id == 1).first()
+    if not state:
+        state = model.CohortRefreshState(id=1, last_loan_id=0, last_event_id=0)
+        db.add(state)
+        db.flush()
+    return state
+
+
+def _touched_cohorts(db: Session, state: model.CohortRefreshState, max_loan_id: int, max_event_id: int) -> Set[str]:
+    """
+    Cohorts with new loans or new allocation events since the last refresh.
+    """
+    cohort = _cohort_expr(db)
+
+    new_loans = (
+        db.query(cohort)
+        .filter(model.Loan.id > state.last_loan_id, model.Loan.id <= max_loan_id)
+        .distinct()
+        .all()
+    )
+    new_events = (
+        db.query(cohort)
+        .select_from(model.AllocationEvent)
+        .join(model.Loan, model.Loan.id == model.AllocationEvent.loan_id)
+        .filter(model.AllocationEvent.id > state.last_event_id, model.AllocationEvent.id <= max_event_id)
+        .distinct()
+        .all()
+    )
+    return {month_label(v) for (v,) in new_loans + new_events if v is not None}
+
+
+def _compute_cohorts(db: Session, labels: List[str]) -> List[Dict[str, Any]]:
+    """
+    Curves for the given cohorts. Per-month sums are grouped in SQL and the
+    cumulative columns come from SUM() OVER (PARTITION BY cohort ORDER BY mob).
+    """
+    cohort = _cohort_expr(db)
+    values = [month_bucket_value(db, label) for label in labels]
+
+    per_mob = (
+        db.query(
+            cohort.label("cohort"),
+            model.Repayment.installment_number.label("mob"),
+            func.sum(model.Repayment.amount_due).label("expected"),
+            func.sum(func.coalesce(model.Repayment.amount_paid, 0)).label("collected"),
+        )
+        .select_from(model.Repayment)
+        .join(model.Loan, model.Loan.id == model.Repayment.loan_id)
+        .filter(cohort.in_(values))
+        .group_by(cohort, model.Repayment.installment_number)
+        .subquery()
+    )
+
+    curve_rows = db.query(
+        per_mob.c.cohort,
+        per_mob.c.mob,
+        per_mob.c.expected,
+        per_mob.c.collected,
+        func.sum(per_mob.c.expected).over(partition_by=per_mob.c.cohort, order_by=per_mob.c.mob),
+        func.sum(per_mob.c.collected).over(partition_by=per_mob.c.cohort, order_by=per_mob.c.mob),
+    ).all()
+
+    loan_rows = (
+        db.query(cohort, func.count(model.Loan.id), func.coalesce(func.sum(model.Loan.principal_amount), 0))
+        .filter(cohort.in_(values))
+        .group_by(cohort)
+        .all()
+    )
+    loans_by_cohort = {month_label(c): (int(n or 0), _dec(p)) for c, n, p in loan_rows}
+
+    now = datetime.utcnow()
+    out = []
+    for c, mob, expected, collected, cum_expected, cum_collected in curve_rows:
+        label = month_label(c)
+        loans_count, principal = loans_by_cohort.get(label, (0, Decimal("0.00")))
+        out.append(
+            {
+                "cohort_month": label,
+                "months_on_book": int(mob),
+                "loans_count": loans_count,
+                "disbursed_principal": principal,
+                "expected_amount": _dec(expected),
+                "collected_amount": _dec(collected),
+                "cumulative_expected": _dec(cum_expected),
+                "cumulative_collected": _dec(cum_collected),
+                "refreshed_at": now,
+            }
+        )
+    return out
+
+
+def refresh_cohorts(db: Session, full: bool = False) -> Dict[str, Any]:
+    """
+    Incremental refresh: only cohorts touched since the last run are rebuilt
+    (full=True rebuilds every cohort).
+    """
+    state = _get_state(db)
+    max_loan_id = db.query(func.coalesce(func.max(model.Loan.id), 0)).scalar()
+    max_event_id = db.query(func.coalesce(func.max(model.AllocationEvent.id), 0)).scalar()
+
+    if full:
+        labels = sorted(
+            month_label(v) for (v,) in db.query(_cohort_expr(db)).distinct().all() if v is not None
+        )
+        db.query(model.CohortPerformance).delete(synchronize_session=False)
+    else:
+        labels = sorted(_touched_cohorts(db, state, max_loan_id, max_event_id))
+
+    rows_written = 0
+    for i in range(0, len(labels), _IN_CHUNK):
+        chunk = labels[i:i + _IN_CHUNK]
+        rows = _compute_cohorts(db, chunk)
+
+        if not full:
+            db.query(model.CohortPerformance).filter(
+                model.CohortPerformance.cohort_month.in_(chunk)
+            ).delete(synchronize_session=False)
+        if rows:
+            db.execute(insert(model.CohortPerformance), rows)
+        rows_written += len(rows)
+
+    state.last_loan_id = max_loan_id
+    state.last_event_id = max_event_id
+    state.refreshed_at = datetime.utcnow()
+    db.add(state)
+    db.commit()
+
+    return {
+        "full": full,
+        "cohorts_refreshed": labels,
+        "rows_written": rows_written,
+        "refreshed_at": state.refreshed_at,
+    }
+
+
+def get_cohort_report(
+    db: Session,
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None,
+) -> Dict[str, Any]:
+    query = db.query(model.CohortPerformance)
+    if from_month:
+        query = query.filter(model.CohortPerformance.cohort_month >= from_month)
+    if to_month:
+        query = query.filter(model.CohortPerformance.cohort_month <= to_month)
+
+    rows = query.order_by(
+        model.CohortPerformance.cohort_month.asc(),
+        model.CohortPerformance.months_on_book.asc(),
+    ).all()
+
+    cohorts: Dict[str, Dict[str, Any]] = {}
+    for r in rows:
+        c = cohorts.setdefault(
+            r.cohort_month,
+            {
+                "cohort_month": r.cohort_month,
+                "loans_count": r.loans_count,
+                "disbursed_principal": r.disbursed_principal,
+                "curve": [],
+            },
+        )
+        cum_expected = _dec(r.cumulative_expected)
+        c["curve"].append(
+            {
+                "months_on_book": r.months_on_book,
+                "expected_amount": r.expected_amount,
+                "collected_amount": r.collected_amount,
+                "cumulative_expected": cum_expected,
+                "cumulative_collected": r.cumulative_collected,
+                "collection_rate": (
+                    float(_dec(r.cumulative_collected) / cum_expected * 100) if cum_expected > 0 else None
+                ),
+            }
+        )
+
+    state = db.query(model.CohortRefreshState).filter(model.CohortRefreshState.id == 1).first()
+    return {
+        "refreshed_at": state.refreshed_at if state else None,
+        "cohorts": list(cohorts.values()),
+    }
@@ -1,15 +1,28 @@
 # app/crud/customer_crud.py
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from decimal import Decimal
 import secrets
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
 from .. import model, schema
+from .data_version_crud import mark_organization_changed
+from ..utils.pagination import paginate
+from . import load_profiles
+
+
+BVN_TAKEN = "This BVN is already registered to another staff ID in your organization."
+STAFF_ID_TAKEN = "Customer with this staff ID already exists in this organization."
 
 
 def create_customer(db: Session, customer_in: schema.CustomerCreate) -> model.Customer:
+    """
+    Raises ValueError when the org already has this staff ID or BVN
+    (ux_customers_org_bvn / the staff ID unique key).
+    """
     customer = model.Customer(
         full_name=customer_in.full_name,
         email=customer_in.email,
@@ -20,28 +33,41 @@ def create_customer(db: Session, customer_in: schema.CustomerCreate) -> model.Cu
         bvn=customer_in.bvn,
     )
     db.add(customer)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        if get_customer_by_staff_and_org(db, customer_in.staff_id, customer_in.organization_id):
+            raise ValueError(STAFF_ID_TAKEN)
+        raise ValueError(BVN_TAKEN)
+    mark_organization_changed(db, customer.organization_id)
     db.refresh(customer)
     return customer
 
 
 def get_customer(db: Session, customer_id: int) -> Optional[model.Customer]:
     return (
-        db.query(model.Customer)
-        .options(joinedload(model.Customer.organization))
+        load_profiles.apply(db.query(model.Customer), "CustomerOut")
         .filter(model.Customer.id == customer_id)
         .first()
     )
 
 
-def list_customers(db: Session, skip: int = 0, limit: int = 100) -> List[model.Customer]:
-    return (
-        db.query(model.Customer)
-        .options(joinedload(model.Customer.organization))
-        .order_by(model.Customer.id.asc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+def list_customers(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> List[model.Customer]:
+    # oldest first, as before (ids and created_at grow together)
+    return paginate(
+        load_profiles.apply(db.query(model.Customer), "CustomerOut"),
+        model.Customer.created_at,
+        model.Customer.id,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+        descending=False,
     )
 
 
@@ -62,8 +88,7 @@ def list_customers_by_org(
     db: Session, organization_id: int, skip: int = 0, limit: int = 100
 ) -> List[model.Customer]:
     return (
-        db.query(model.Customer)
-        .options(joinedload(model.Customer.organization))
+        load_profiles.apply(db.query(model.Customer), "CustomerOut")
         .filter(model.Customer.organization_id == organization_id)
         .order_by(model.Customer.id.asc())
         .offset(skip)
@@ -81,22 +106,28 @@ def update_customer(
         setattr(customer, field, value)
     db.add(customer)
     db.commit()
+    mark_organization_changed(db, customer.organization_id)
     db.refresh(customer)
     return customer
 
 
+def list_customer_loans(db: Session, customer_id: int) -> List[model.Loan]:
+    return (
+        load_profiles.apply(db.query(model.Loan), "LoanOut")
+        .join(model.LoanApplication)
+        .filter(model.LoanApplication.customer_id == customer_id)
+        .order_by(model.Loan.created_at.desc(), model.Loan.id.desc())
+        .all()
+    )
+
+
 def get_customer_loan_history(db: Session, customer_id: int) -> List[model.LoanApplication]:
     """
     Returns all loan applications for this customer (latest first),
     with product + link + customer loaded for frontend display.
     """
     return (
-        db.query(model.LoanApplication)
-        .options(
-            joinedload(model.LoanApplication.product),
-            joinedload(model.LoanApplication.link),
-            joinedload(model.LoanApplication.customer).joinedload(model.Customer.organization),
-        )
+        load_profiles.apply(db.query(model.LoanApplication), "LoanApplicationOut")
         .filter(model.LoanApplication.customer_id == customer_id)
         .order_by(model.LoanApplication.id.desc())
         .all()
@@ -133,3 +164,45 @@ def ensure_customer_account(db: Session, customer: model.Customer, prefix: str =
             return customer
 
     raise RuntimeError("Unable to generate unique account number.")
+
+
+def allocate_customer_accounts(db: Session, customer_ids: Iterable[int], prefix: str = "248") -> Dict[int, str]:
+    """
+    Bulk ensure_customer_account for customers without an account number, in
+    one collision check per round instead of one per customer. Does not commit.
+    Customers that already have a number (or got one meanwhile) are left alone.
+    """
+    customers = model.Customer.__table__
+    pending = list(dict.fromkeys(customer_ids))
+    allocated: Dict[int, str] = {}
+
+    for _ in range(30):
+        if not pending:
+            break
+        candidates: Dict[str, int] = {}
+        for customer_id in pending:
+            acc = _generate_10_digit_account(prefix=prefix)
+            while acc in candidates or acc in allocated.values():
+                acc = _generate_10_digit_account(prefix=prefix)
+            candidates[acc] = customer_id
+        taken = set(
+            db.execute(
+                select(customers.c.nun_account_number).where(customers.c.nun_account_number.in_(list(candidates)))
+            ).scalars()
+        )
+        pending = [customer_id for acc, customer_id in candidates.items() if acc in taken]
+        allocated.update((customer_id, acc) for acc, customer_id in candidates.items() if acc not in taken)
+    if pending:
+        raise RuntimeError("Unable to generate unique account number.")
+
+    if allocated:
+        db.execute(
+            update(customers)
+            .where(customers.c.id == bindparam("b_id"), customers.c.nun_account_number.is_(None))
+            .values(
+                nun_account_number=bindparam("b_account"),
+                account_balance=func.coalesce(customers.c.account_balance, Decimal("0.00")),
+            ),
+            [{"b_id": customer_id, "b_account": acc} for customer_id, acc in allocated.items()],
+        )
+    return allocated
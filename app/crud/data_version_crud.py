@@ -0,0 +1,94 @@
+# app/crud/data_version_crud.py
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import model
+from ..utils.report_cache import report_cache
+
+
+def get_data_version(db: Session, organization_id: int) -> int:
+    version = (
+        db.query(model.OrganizationDataVersion.version)
+        .filter(model.OrganizationDataVersion.organization_id == organization_id)
+        .scalar()
+    )
+    return int(version or 0)
+
+
+def get_global_data_version(db: Session) -> str:
+    """
+    Version for cross-org views: sum of the per-org counters (monotonic, since
+    each counter is) plus the row count, so no single hot row is written.
+    """
+    total, rows = db.query(
+        func.coalesce(func.sum(model.OrganizationDataVersion.version), 0),
+        func.count(model.OrganizationDataVersion.organization_id),
+    ).one()
+    return f"{int(total or 0)}.{int(rows or 0)}"
+
+
+def _bump(db: Session, organization_id: int) -> None:
+    updated = db.execute(
+        update(model.OrganizationDataVersion)
+        .where(model.OrganizationDataVersion.organization_id == organization_id)
+        .values(
+            version=model.OrganizationDataVersion.version + 1,
+            updated_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if updated:
+        return
+
+    try:
+        with db.begin_nested():
+            db.add(model.OrganizationDataVersion(organization_id=organization_id, version=1))
+    except IntegrityError:
+        # another writer created the row first
+        _bump(db, organization_id)
+
+
+def mark_organization_changed(db: Session, organization_id: Optional[int]) -> None:
+    """
+    Call AFTER the data change is committed:
+    - bumps the org's data version (own small transaction)
+    - drops the org's cached report results
+
+    Bumping after the commit is what keeps artifacts safe: anything computed
+    before the bump is stored under the old version and is never served again.
+    """
+    if organization_id is None:
+        return
+    _bump(db, organization_id)
+    db.commit()
+    report_cache.invalidate_organization(organization_id)
+
+
+def mark_organizations_changed(db: Session, organization_ids: Iterable[Optional[int]]) -> None:
+    """
+    mark_organization_changed for several orgs at once (bulk writes): existing
+    counters are bumped in one UPDATE, missing ones created, one commit.
+    """
+    org_ids = sorted({o for o in organization_ids if o is not None})
+    if not org_ids:
+        return
+    versions = model.OrganizationDataVersion
+    existing = set(db.execute(select(versions.organization_id).where(versions.organization_id.in_(org_ids))).scalars())
+    if existing:
+        db.execute(
+            update(versions)
+            .where(versions.organization_id.in_(sorted(existing)))
+            .values(version=versions.version + 1, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+    for organization_id in org_ids:
+        if organization_id not in existing:
+            _bump(db, organization_id)
+    db.commit()
+    for organization_id in org_ids:
+        report_cache.invalidate_organization(organization_id)
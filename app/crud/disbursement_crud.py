@@ -7,7 +7,9 @@ import uuid
 from sqlalchemy.orm import Session
 
 from .. import model, schema
-from . import customer_crud
+from ..metrics import DISBURSEMENTS, DISBURSED_AMOUNT
+from .data_version_crud import mark_organization_changed
+from . import customer_crud, ledger_crud
 from .loan_crud import ensure_loan_for_application_after_disbursement
 
 
@@ -24,7 +26,7 @@ def disburse_application(
     Disburse ONLY APPROVED applications.
     - Create (or ensure) customer NUN account
     - Create Disbursement record
-    - Credit simulated customer balance
+    - Credit simulated customer balance (journal entry + atomic balance update)
     - Create Loan (ACTIVE) + Repayment Schedule (ensured inside loan_crud)
     - Mark application as DISBURSED
     """
@@ -71,15 +73,13 @@ def disburse_application(
         created_at=datetime.utcnow(),
     )
 
-    
-    current_bal = Decimal(str(customer.account_balance or 0)).quantize(Decimal("0.01"))
-    customer.account_balance = (current_bal + disburse_amount).quantize(Decimal("0.01"))
-
-    db.add(customer)
     db.add(disb)
     db.flush()
 
     
+    ledger_crud.post_disbursement_credit(db, customer_id=customer.id, disbursement=disb)
+
+    
     loan = ensure_loan_for_application_after_disbursement(
         db=db,
         application=application,
@@ -93,6 +93,9 @@ def disburse_application(
     db.add(disb)
     db.add(application)
     db.commit()
+    DISBURSEMENTS.inc()
+    DISBURSED_AMOUNT.inc(float(disburse_amount))
+    mark_organization_changed(db, customer.organization_id)
 
     db.refresh(customer)
     db.refresh(disb)
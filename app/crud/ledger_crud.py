@@ -0,0 +1,315 @@
+# app/crud/ledger_crud.py
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session, joinedload
+
+from .. import model
+
+CUSTOMER_ACCOUNT = "CUSTOMER_DEPOSIT"
+DISBURSEMENT_CLEARING = "LOAN_DISBURSEMENT_CLEARING"
+REPAYMENT_CLEARING = "REPAYMENT_CLEARING"
+OPENING_BALANCE = "OPENING_BALANCE_EQUITY"
+
+
+def _apply_balance_delta(db: Session, customer_id: int, delta: Decimal) -> Decimal:
+    """
+    Atomic balance = balance + :delta (no read-modify-write in Python).
+    The UPDATE row-locks the customer, so concurrent postings serialize and
+    the RETURNING value is the exact running balance after this posting.
+    """
+    new_balance = db.execute(
+        update(model.Customer)
+        .where(model.Customer.id == customer_id)
+        .values(account_balance=model.Customer.account_balance + delta)
+        .returning(model.Customer.account_balance)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+
+    if new_balance is None:
+        raise ValueError("Customer not found.")
+
+    customer = db.identity_map.get(db.identity_key(model.Customer, customer_id))
+    if customer is not None:
+        db.expire(customer, ["account_balance"])
+
+    return Decimal(str(new_balance)).quantize(Decimal("0.01"))
+
+
+def post_customer_entry(
+    db: Session,
+    customer_id: int,
+    entry_type: model.JournalEntryType,
+    delta: Decimal,
+    contra_account: str,
+    reference: Optional[str] = None,
+    narration: Optional[str] = None,
+    disbursement_id: Optional[int] = None,
+    reverses_entry_id: Optional[int] = None,
+) -> model.JournalEntry:
+    """
+    Posts a balanced entry: customer leg (+delta) and contra leg (-delta).
+    DOES NOT COMMIT; the caller owns the transaction.
+    """
+    delta = Decimal(str(delta)).quantize(Decimal("0.01"))
+    if delta == 0:
+        raise ValueError("Journal amount must not be zero.")
+
+    balance_after = _apply_balance_delta(db, customer_id, delta)
+    now = datetime.utcnow()
+
+    entry = model.JournalEntry(
+        entry_type=entry_type,
+        customer_id=customer_id,
+        disbursement_id=disbursement_id,
+        reverses_entry_id=reverses_entry_id,
+        reference=reference,
+        narration=narration,
+        created_at=now,
+    )
+    entry.postings = [
+        model.JournalPosting(
+            account=CUSTOMER_ACCOUNT,
+            customer_id=customer_id,
+            amount=delta,
+            balance_after=balance_after,
+            created_at=now,
+        ),
+        model.JournalPosting(
+            account=contra_account,
+            customer_id=None,
+            amount=-delta,
+            balance_after=None,
+            created_at=now,
+        ),
+    ]
+    db.add(entry)
+    db.flush()
+    return entry
+
+
+def post_disbursement_credit(
+    db: Session,
+    customer_id: int,
+    disbursement: model.Disbursement,
+) -> model.JournalEntry:
+    return post_customer_entry(
+        db,
+        customer_id=customer_id,
+        entry_type=model.JournalEntryType.DISBURSEMENT_CREDIT,
+        delta=Decimal(str(disbursement.amount)),
+        contra_account=DISBURSEMENT_CLEARING,
+        reference=disbursement.reference,
+        narration=disbursement.narration,
+        disbursement_id=disbursement.id,
+    )
+
+
+def post_repayment_debit(
+    db: Session,
+    customer_id: int,
+    amount: Decimal,
+    reference: Optional[str] = None,
+    narration: Optional[str] = None,
+) -> model.JournalEntry:
+    amount = Decimal(str(amount)).quantize(Decimal("0.01"))
+    if amount <= 0:
+        raise ValueError("Repayment debit must be greater than 0.")
+
+    return post_customer_entry(
+        db,
+        customer_id=customer_id,
+        entry_type=model.JournalEntryType.REPAYMENT_DEBIT,
+        delta=-amount,
+        contra_account=REPAYMENT_CLEARING,
+        reference=reference,
+        narration=narration,
+    )
+
+
+def reverse_entry(
+    db: Session,
+    entry: model.JournalEntry,
+    narration: Optional[str] = None,
+) -> model.JournalEntry:
+    """
+    Posts the mirror image of an entry. DOES NOT COMMIT.
+    """
+    if entry.entry_type == model.JournalEntryType.REVERSAL:
+        raise ValueError("A reversal entry cannot be reversed.")
+
+    already = (
+        db.query(model.JournalEntry.id)
+        .filter(model.JournalEntry.reverses_entry_id == entry.id)
+        .first()
+    )
+    if already:
+        raise ValueError("This journal entry has already been reversed.")
+
+    customer_leg = next((p for p in entry.postings if p.account == CUSTOMER_ACCOUNT), None)
+    contra_leg = next((p for p in entry.postings if p.account != CUSTOMER_ACCOUNT), None)
+    if customer_leg is None or contra_leg is None:
+        raise ValueError("Journal entry has no customer posting.")
+
+    return post_customer_entry(
+        db,
+        customer_id=entry.customer_id,
+        entry_type=model.JournalEntryType.REVERSAL,
+        delta=-Decimal(str(customer_leg.amount)),
+        contra_account=contra_leg.account,
+        reference=f"REV-{entry.id}",
+        narration=narration or f"Reversal of journal entry #{entry.id}",
+        reverses_entry_id=entry.id,
+    )
+
+
+def get_journal_entry(db: Session, entry_id: int) -> Optional[model.JournalEntry]:
+    return (
+        db.query(model.JournalEntry)
+        .options(joinedload(model.JournalEntry.postings))
+        .filter(model.JournalEntry.id == entry_id)
+        .first()
+    )
+
+
+def get_customer_balance(
+    db: Session,
+    customer_id: int,
+    as_of: Optional[datetime] = None,
+) -> Decimal:
+    """
+    - current balance: read straight from customers.account_balance (O(1))
+    - as_of balance: latest customer posting at/before as_of (index seek on
+      customer_id, created_at, id); 0 if the account had no postings yet
+      (balances from before the journal need backfill_opening_entries)
+    """
+    if as_of is None:
+        bal = (
+            db.query(model.Customer.account_balance)
+            .filter(model.Customer.id == customer_id)
+            .scalar()
+        )
+        return Decimal(str(bal or 0)).quantize(Decimal("0.01"))
+
+    bal = (
+        db.query(model.JournalPosting.balance_after)
+        .filter(
+            model.JournalPosting.customer_id == customer_id,
+            model.JournalPosting.created_at <= as_of,
+        )
+        .order_by(model.JournalPosting.created_at.desc(), model.JournalPosting.id.desc())
+        .limit(1)
+        .scalar()
+    )
+    return Decimal(str(bal or 0)).quantize(Decimal("0.01"))
+
+
+def list_customer_postings(
+    db: Session,
+    customer_id: int,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[model.JournalPosting]:
+    return (
+        db.query(model.JournalPosting)
+        .options(joinedload(model.JournalPosting.entry))
+        .filter(model.JournalPosting.customer_id == customer_id)
+        .order_by(model.JournalPosting.created_at.desc(), model.JournalPosting.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def backfill_opening_entries(db: Session) -> int:
+    """
+    One-off: accounts funded before the journal existed have an
+    account_balance their postings do not add up to, so as_of balances before
+    the first posting read 0. Writes one OPENING entry per such customer for
+    the difference, dated just before its first posting (or at created_at if
+    that is earlier). account_balance is not changed: the later postings'
+    balance_after already include the opening amount. Customers that already
+    have an OPENING entry are skipped.
+    """
+    postings = model.JournalPosting
+    customers = model.Customer
+    has_opening = (
+        db.query(model.JournalEntry.id)
+        .filter(
+            model.JournalEntry.customer_id == customers.id,
+            model.JournalEntry.entry_type == model.JournalEntryType.OPENING,
+        )
+        .exists()
+    )
+    posted = (
+        db.query(
+            postings.customer_id.label("customer_id"),
+            func.sum(postings.amount).label("total"),
+            func.min(postings.created_at).label("first_at"),
+        )
+        .filter(postings.account == CUSTOMER_ACCOUNT)
+        .group_by(postings.customer_id)
+        .subquery()
+    )
+    candidates = (
+        db.query(customers.id)
+        .outerjoin(posted, posted.c.customer_id == customers.id)
+        .filter(customers.account_balance != func.coalesce(posted.c.total, 0))
+        .filter(~has_opening)
+        .order_by(customers.id)
+        .all()
+    )
+
+    written = 0
+    for (customer_id,) in candidates:
+        # recheck under the row lock every posting takes, so a concurrent
+        # posting cannot land between the sum and the opening entry
+        balance, created_at = (
+            db.query(customers.account_balance, customers.created_at)
+            .filter(customers.id == customer_id)
+            .with_for_update()
+            .one()
+        )
+        total, first_at = (
+            db.query(func.coalesce(func.sum(postings.amount), 0), func.min(postings.created_at))
+            .filter(postings.customer_id == customer_id, postings.account == CUSTOMER_ACCOUNT)
+            .one()
+        )
+        opening = (Decimal(str(balance or 0)) - Decimal(str(total or 0))).quantize(Decimal("0.01"))
+        if opening == 0:
+            continue
+
+        at = created_at
+        if first_at is not None and (at is None or at >= first_at):
+            at = first_at - timedelta(microseconds=1)
+        entry = model.JournalEntry(
+            entry_type=model.JournalEntryType.OPENING,
+            customer_id=customer_id,
+            reference=f"OPENING-{customer_id}",
+            narration="Opening balance carried over from before the journal",
+            created_at=at,
+        )
+        entry.postings = [
+            model.JournalPosting(
+                account=CUSTOMER_ACCOUNT,
+                customer_id=customer_id,
+                amount=opening,
+                balance_after=opening,
+                created_at=at,
+            ),
+            model.JournalPosting(
+                account=OPENING_BALANCE,
+                customer_id=None,
+                amount=-opening,
+                balance_after=None,
+                created_at=at,
+            ),
+        ]
+        db.add(entry)
+        written += 1
+
+    db.commit()
+    return written
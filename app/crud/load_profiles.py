@@ -0,0 +1,47 @@
+# app/crud/load_profiles.py
+"""
+Eager-load profiles: one loader-option set per response schema, so that
+serializing a page never lazy-loads per row.
+
+Everything the Out schemas touch is many-to-one, so it is joined into the
+page query: no extra round trips and no row multiplication under LIMIT.
+Use selectinload if a profile ever needs a collection.
+"""
+
+from typing import Dict, Tuple
+
+from sqlalchemy.orm import joinedload
+
+from .. import model
+
+CUSTOMER_OUT = (
+    joinedload(model.Customer.organization),
+)
+
+COMPANY_LOAN_LINK_OUT = (
+    joinedload(model.CompanyLoanLink.organization),
+    joinedload(model.CompanyLoanLink.product),
+)
+
+LOAN_APPLICATION_OUT = (
+    joinedload(model.LoanApplication.customer).joinedload(model.Customer.organization),
+    joinedload(model.LoanApplication.product),
+    joinedload(model.LoanApplication.link).joinedload(model.CompanyLoanLink.organization),
+    joinedload(model.LoanApplication.link).joinedload(model.CompanyLoanLink.product),
+)
+
+# LoanOut / LoanProductOut are column-only
+LOAN_OUT: Tuple = ()
+LOAN_PRODUCT_OUT: Tuple = ()
+
+PROFILES: Dict[str, Tuple] = {
+    "CustomerOut": CUSTOMER_OUT,
+    "CompanyLoanLinkOut": COMPANY_LOAN_LINK_OUT,
+    "LoanApplicationOut": LOAN_APPLICATION_OUT,
+    "LoanOut": LOAN_OUT,
+    "LoanProductOut": LOAN_PRODUCT_OUT,
+}
+
+
+def apply(query, profile: str):
+    return query.options(*PROFILES[profile])
@@ -1,9 +1,26 @@
 # app/crud/loan_application_crud.py
 
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, bindparam, exists, insert, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from .. import model, schema
+from ..config import settings
+from .data_version_crud import mark_organization_changed, mark_organizations_changed
+from . import customer_crud
+from ..utils.pagination import paginate
+from ..utils.upsert import dialect_insert
+from . import load_profiles
+
+
+def _org_id_for_customer(db: Session, customer_id: int) -> Optional[int]:
+    return (
+        db.query(model.Customer.organization_id)
+        .filter(model.Customer.id == customer_id)
+        .scalar()
+    )
 
 
 def create_loan_application(
@@ -20,6 +37,7 @@ def create_loan_application(
     )
     db.add(application)
     db.commit()
+    mark_organization_changed(db, _org_id_for_customer(db, application.customer_id))
     db.refresh(application)
     return application
 
@@ -28,7 +46,7 @@ def get_loan_application(
     db: Session, application_id: int
 ) -> Optional[model.LoanApplication]:
     return (
-        db.query(model.LoanApplication)
+        load_profiles.apply(db.query(model.LoanApplication), "LoanApplicationOut")
         .filter(model.LoanApplication.id == application_id)
         .first()
     )
@@ -40,8 +58,9 @@ def list_loan_applications(
     limit: int = 100,
     status: Optional[str] = None,
     organization_id: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> List[model.LoanApplication]:
-    query = db.query(model.LoanApplication)
+    query = load_profiles.apply(db.query(model.LoanApplication), "LoanApplicationOut")
 
     if status is not None:
         query = query.filter(model.LoanApplication.status == status)
@@ -51,7 +70,14 @@ def list_loan_applications(
             model.Customer.organization_id == organization_id
         )
 
-    return query.offset(skip).limit(limit).all()
+    return paginate(
+        query,
+        model.LoanApplication.created_at,
+        model.LoanApplication.id,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
 
 
 def _application_has_disbursement(db: Session, application_id: int) -> bool:
@@ -100,29 +126,402 @@ def update_application_status(
 
     for field, value in data.items():
         setattr(application, field, value)
+    if data.get("status", QUEUE_STATUS) != QUEUE_STATUS:
+        # decided: it leaves the work queue, so the lease goes with it
+        application.claimed_by_id = None
+        application.claim_expires_at = None
 
     db.add(application)
     db.commit()
+    mark_organization_changed(db, _org_id_for_customer(db, application.customer_id))
     db.refresh(application)
     return application
 
 
-def create_loan_application_from_public(
+DECISION_STATUSES = ["PENDING", "UNDER_REVIEW", "APPROVED", "REJECTED"]
+
+_LOCKED = "This application has already been DISBURSED and cannot be changed."
+
+
+def decision_error(status_in: schema.LoanApplicationUpdateStatus) -> Optional[str]:
+    """
+    The request-only checks of PATCH /loan-applications/{id}/status.
+    """
+    if status_in.status is None:
+        return "Status is required."
+    if status_in.status == "DISBURSED":
+        return "DISBURSED cannot be set here. Use the disbursement endpoint instead."
+    if status_in.status not in DECISION_STATUSES:
+        return f"Invalid status. Allowed: {DECISION_STATUSES}"
+    if status_in.status == "APPROVED" and status_in.approved_amount is None:
+        return "approved_amount is required when approving an application."
+    return None
+
+
+def claim_error(claimed_by_id: Optional[int], claim_expires_at: Optional[datetime], user_id: int) -> Optional[str]:
+    """
+    Set when another officer holds a live work-queue claim on the application
+    (the routes answer 409).
+    """
+    if claimed_by_id is None or claimed_by_id == user_id:
+        return None
+    if claim_expires_at is None or claim_expires_at < datetime.utcnow():
+        return None
+    return f"This application is claimed by another officer until {claim_expires_at:%Y-%m-%d %H:%M:%S} UTC."
+
+
+def bulk_update_application_status(
     db: Session,
-    customer: model.Customer,
-    product: model.LoanProduct,
-    link: model.CompanyLoanLink,
-    app_in: schema.PublicLoanApplicationCreate,
-) -> model.LoanApplication:
-    application = model.LoanApplication(
-        customer_id=customer.id,
-        product_id=product.id,
-        link_id=link.id,
-        requested_amount=app_in.requested_amount,
-        tenor_months=app_in.tenor_months,
-        status="PENDING",
+    decisions: List[schema.LoanApplicationBulkStatusItem],
+    user_id: int,
+) -> dict:
+    """
+    Many status decisions at once, with the single endpoint's rules. Per chunk
+    of BULK_STATUS_CHUNK_SIZE decisions:
+    - one SELECT of the applications with their customer's org and account
+      number and whether a disbursement or loan exists
+    - account numbers for newly approved customers allocated together
+    - one bulk UPDATE of the applications, one commit
+    A failing decision (including one on an application another officer has
+    claimed) is reported in its result; the others still apply.
+    """
+    if len(decisions) > settings.BULK_STATUS_MAX_ITEMS:
+        raise ValueError(f"At most {settings.BULK_STATUS_MAX_ITEMS} decisions per request.")
+
+    results: List[Optional[dict]] = [None] * len(decisions)
+    first_index = {}
+    valid = []
+    for i, decision in enumerate(decisions):
+        error = decision_error(decision)
+        first = first_index.setdefault(decision.application_id, i)
+        if error is None and first != i:
+            error = f"Duplicate application_id (first at index {first})."
+        if error:
+            results[i] = _bulk_result(decision, error)
+        else:
+            valid.append((i, decision))
+
+    chunk_size = max(settings.BULK_STATUS_CHUNK_SIZE, 1)
+    for start in range(0, len(valid), chunk_size):
+        _apply_decision_chunk(db, valid[start:start + chunk_size], results, user_id)
+
+    succeeded = sum(1 for r in results if r["ok"])
+    return {
+        "total": len(decisions),
+        "succeeded": succeeded,
+        "failed": len(decisions) - succeeded,
+        "results": results,
+    }
+
+
+def _bulk_result(decision, error: Optional[str] = None) -> dict:
+    return {
+        "application_id": decision.application_id,
+        "ok": error is None,
+        "status": None if error else decision.status,
+        "detail": error,
+    }
+
+
+def _apply_decision_chunk(db: Session, chunk: list, results: list, user_id: int) -> None:
+    apps = model.LoanApplication
+    found = {
+        row.id: row
+        for row in db.execute(
+            select(
+                apps.id,
+                apps.status,
+                apps.customer_id,
+                apps.claimed_by_id,
+                apps.claim_expires_at,
+                model.Customer.organization_id,
+                model.Customer.nun_account_number,
+                exists().where(model.Disbursement.loan_application_id == apps.id).label("has_disbursement"),
+                exists().where(model.Loan.application_id == apps.id).label("has_loan"),
+            )
+            .join(model.Customer, model.Customer.id == apps.customer_id)
+            .where(apps.id.in_([d.application_id for _, d in chunk]))
+        )
+    }
+
+    now = datetime.utcnow()
+    accepted, updates, needs_account, org_ids = [], [], [], set()
+    for i, decision in chunk:
+        row = found.get(decision.application_id)
+        if row is None:
+            results[i] = _bulk_result(decision, "Loan application not found.")
+            continue
+        if row.status == "DISBURSED" or row.has_disbursement or row.has_loan:
+            results[i] = _bulk_result(decision, _LOCKED)
+            continue
+        error = claim_error(row.claimed_by_id, row.claim_expires_at, user_id)
+        if error:
+            results[i] = _bulk_result(decision, error)
+            continue
+        data = decision.dict(exclude_unset=True, exclude={"application_id"})
+        if decision.status != QUEUE_STATUS:
+            data.update(claimed_by_id=None, claim_expires_at=None)
+        updates.append(dict(data, id=decision.application_id, updated_at=now))
+        if decision.status == "APPROVED" and not row.nun_account_number:
+            needs_account.append(row.customer_id)
+        org_ids.add(row.organization_id)
+        accepted.append((i, decision))
+
+    if not updates:
+        return
+    for attempt in range(3):
+        try:
+            customer_crud.allocate_customer_accounts(db, needs_account, prefix="248")
+            _update_applications(db, updates)
+            db.commit()
+            break
+        except IntegrityError:
+            # an account number taken by a concurrent approval; draw again
+            db.rollback()
+    else:
+        for i, decision in accepted:
+            results[i] = _bulk_result(decision, "Could not allocate an account number; please retry.")
+        return
+
+    for i, decision in accepted:
+        results[i] = _bulk_result(decision)
+    mark_organizations_changed(db, org_ids)
+
+
+def _update_applications(db: Session, updates: List[dict]) -> None:
+    """
+    One executemany UPDATE per distinct set of fields. (The ORM's bulk UPDATE
+    by primary key goes row by row on drivers without a reliable executemany
+    rowcount, SQLite among them.)
+    """
+    apps = model.LoanApplication.__table__
+    by_fields = {}
+    for row in updates:
+        by_fields.setdefault(tuple(sorted(k for k in row if k != "id")), []).append(row)
+    for fields, rows in by_fields.items():
+        stmt = (
+            update(apps)
+            .where(apps.c.id == bindparam("b_id"))
+            .values({f: bindparam(f"b_{f}") for f in fields})
+        )
+        db.execute(stmt, [{f"b_{k}": v for k, v in row.items()} for row in rows])
+
+
+# =========================
+# Work queue
+# =========================
+
+QUEUE_STATUS = "PENDING"
+
+
+def _queue_order():
+    apps = model.LoanApplication
+    return (apps.priority, apps.created_at, apps.id)
+
+
+def _claimable(now: datetime):
+    apps = model.LoanApplication
+    return and_(
+        apps.status == QUEUE_STATUS,
+        or_(apps.claimed_by_id.is_(None), apps.claim_expires_at < now),
+    )
+
+
+def claim_applications(db: Session, user_id: int, limit: int) -> Tuple[List[model.LoanApplication], datetime]:
+    """
+    Leases the next `limit` unclaimed PENDING applications (lowest priority
+    value, then oldest) to user_id for QUEUE_CLAIM_LEASE_SECONDS, in one
+    UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING id.
+
+    Concurrent claimers skip each other's locked rows instead of waiting on
+    them, so officers never get the same application. SQLite has no row
+    locks; its write lock serializes the statement instead. Returns the
+    claimed applications (queue order) and the lease expiry.
+    """
+    apps = model.LoanApplication
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=settings.QUEUE_CLAIM_LEASE_SECONDS)
+
+    next_ids = (
+        select(apps.id)
+        .where(_claimable(now))
+        .order_by(*_queue_order())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = db.execute(
+        update(apps)
+        .where(apps.id.in_(next_ids.scalar_subquery()), _claimable(now))
+        .values(claimed_by_id=user_id, claim_expires_at=expires_at)
+        .returning(apps.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+
+    if not claimed:
+        return [], expires_at
+    applications = (
+        load_profiles.apply(db.query(apps), "LoanApplicationOut")
+        .filter(apps.id.in_(claimed))
+        .order_by(*_queue_order())
+        .all()
     )
+    return applications, expires_at
+
+
+def list_claimed_applications(db: Session, user_id: int) -> List[model.LoanApplication]:
+    apps = model.LoanApplication
+    return (
+        load_profiles.apply(db.query(apps), "LoanApplicationOut")
+        .filter(
+            apps.claimed_by_id == user_id,
+            apps.claim_expires_at >= datetime.utcnow(),
+            apps.status == QUEUE_STATUS,
+        )
+        .order_by(*_queue_order())
+        .all()
+    )
+
+
+def renew_claim(db: Session, application_id: int, user_id: int) -> datetime:
+    """
+    Extends the caller's live claim by a full lease. Raises ValueError if the
+    claim is not the caller's or has lapsed.
+    """
+    apps = model.LoanApplication
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=settings.QUEUE_CLAIM_LEASE_SECONDS)
+    renewed = db.execute(
+        update(apps)
+        .where(apps.id == application_id, apps.claimed_by_id == user_id, apps.claim_expires_at >= now)
+        .values(claim_expires_at=expires_at)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not renewed:
+        db.rollback()
+        raise ValueError("You do not hold a live claim on this application.")
+    db.commit()
+    return expires_at
+
+
+def release_claim(db: Session, application_id: int, user_id: int) -> None:
+    """
+    Returns the application to the queue. Raises ValueError if the caller
+    does not hold the claim.
+    """
+    apps = model.LoanApplication
+    released = db.execute(
+        update(apps)
+        .where(apps.id == application_id, apps.claimed_by_id == user_id)
+        .values(claimed_by_id=None, claim_expires_at=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not released:
+        db.rollback()
+        raise ValueError("You do not hold a claim on this application.")
+    db.commit()
+
+
+def set_priority(db: Session, application: model.LoanApplication, priority: int) -> model.LoanApplication:
+    application.priority = priority
     db.add(application)
     db.commit()
     db.refresh(application)
     return application
+
+
+def submit_public_application(
+    db: Session,
+    link,
+    product,
+    app_in: schema.PublicLoanApplicationCreate,
+) -> model.LoanApplication:
+    """
+    Public form submit in two round trips (link/product come from the catalogue cache):
+    1. customer upsert on (organization_id, staff_id) RETURNING id (a BVN
+       held by another staff record trips ux_customers_org_bvn here)
+    2. INSERT ... SELECT of the application, guarded by one WHERE NOT EXISTS
+       covering: an active loan, a pending application, the BVN being held by
+       another staff record in the org
+    When the guard blocks the insert, nothing is written and ValueError says why.
+    """
+    customers = model.Customer.__table__
+    apps = model.LoanApplication.__table__
+
+    stmt = dialect_insert(db, customers).values(
+        full_name=app_in.full_name,
+        email=app_in.email,
+        phone=app_in.phone,
+        staff_id=app_in.staff_id,
+        organization_id=link.organization_id,
+        net_monthly_salary=app_in.net_pay,
+        bvn=app_in.bvn,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[customers.c.organization_id, customers.c.staff_id],
+        set_={
+            "full_name": stmt.excluded.full_name,
+            "email": stmt.excluded.email,
+            "phone": stmt.excluded.phone,
+            "net_monthly_salary": stmt.excluded.net_monthly_salary,
+            "bvn": stmt.excluded.bvn,
+        },
+    ).returning(customers.c.id)
+    try:
+        customer_id = db.execute(stmt).scalar_one()
+    except IntegrityError:
+        # the only other unique key on customers is (organization_id, bvn)
+        db.rollback()
+        raise ValueError(customer_crud.BVN_TAKEN)
+
+    blockers = _public_apply_blockers(customer_id, link.organization_id, app_in.bvn)
+    row = select(
+        literal(customer_id),
+        literal(product.id),
+        literal(link.id),
+        literal(app_in.requested_amount, apps.c.requested_amount.type),
+        literal(app_in.tenor_months),
+        literal("PENDING"),
+    ).where(~or_(*blockers.values()))
+    application_id = db.execute(
+        insert(apps)
+        .from_select(
+            ["customer_id", "product_id", "link_id", "requested_amount", "tenor_months", "status"],
+            row,
+        )
+        .returning(apps.c.id)
+    ).scalar()
+
+    if application_id is None:
+        reasons = db.execute(select(*(e.label(k) for k, e in blockers.items()))).one()
+        db.rollback()
+        if reasons.active_loan:
+            raise ValueError("You already have an active loan. Please complete repayment before applying for a new one.")
+        if reasons.pending_application:
+            raise ValueError("You already have a loan application under review. Please wait for a decision.")
+        raise ValueError(customer_crud.BVN_TAKEN)
+
+    db.commit()
+    mark_organization_changed(db, link.organization_id)
+    return get_loan_application(db, application_id)
+
+
+def _public_apply_blockers(customer_id: int, organization_id: int, bvn: Optional[str]) -> dict:
+    blockers = {
+        "active_loan": exists().where(
+            model.Loan.application_id == model.LoanApplication.id,
+            model.LoanApplication.customer_id == customer_id,
+            model.Loan.status == "ACTIVE",
+        ),
+        "pending_application": exists().where(
+            model.LoanApplication.customer_id == customer_id,
+            model.LoanApplication.status.in_(["PENDING", "UNDER_REVIEW"]),
+        ),
+    }
+    if bvn:
+        blockers["bvn_taken"] = exists().where(
+            model.Customer.organization_id == organization_id,
+            model.Customer.bvn == bvn,
+            model.Customer.id != customer_id,
+        )
+    return blockers
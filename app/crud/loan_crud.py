@@ -7,7 +7,10 @@ from decimal import Decimal
 from sqlalchemy.orm import Session
 
 from .. import model, schema
+from ..utils.pagination import paginate
+from . import load_profiles
 from ..crud import repayment_crud 
+from .data_version_crud import mark_organization_changed
 
 NUN_INTEREST_RATE = Decimal("6")  
 
@@ -43,8 +46,9 @@ def list_loans(
     limit: int = 100,
     status: Optional[str] = None,
     organization_id: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> List[model.Loan]:
-    query = db.query(model.Loan)
+    query = load_profiles.apply(db.query(model.Loan), "LoanOut")
 
     if status is not None:
         query = query.filter(model.Loan.status == status)
@@ -56,7 +60,7 @@ def list_loans(
             .filter(model.Customer.organization_id == organization_id)
         )
 
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, model.Loan.created_at, model.Loan.id, cursor=cursor, skip=skip, limit=limit)
 
 
 def update_loan_status(db: Session, loan: model.Loan, status_in: "schema.LoanUpdateStatus") -> model.Loan:
@@ -65,6 +69,7 @@ def update_loan_status(db: Session, loan: model.Loan, status_in: "schema.LoanUpd
         setattr(loan, field, value)
     db.add(loan)
     db.commit()
+    mark_organization_changed(db, repayment_crud._org_id_for_loan(db, loan.id))
     db.refresh(loan)
     return loan
 
@@ -1,9 +1,12 @@
 # app/crud/loan_link_crud.py
 
 from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 
 from .. import model, schema
+from ..utils.pagination import paginate
+from ..utils.catalogue_cache import LinkSnapshot, catalogue_cache, invalidate
+from . import load_profiles
 
 
 def create_company_loan_link(
@@ -25,11 +28,7 @@ def create_company_loan_link(
 
     
     return (
-        db.query(model.CompanyLoanLink)
-        .options(
-            joinedload(model.CompanyLoanLink.organization),
-            joinedload(model.CompanyLoanLink.product),
-        )
+        load_profiles.apply(db.query(model.CompanyLoanLink), "CompanyLoanLinkOut")
         .filter(model.CompanyLoanLink.id == link.id)
         .first()
     )
@@ -37,11 +36,7 @@ def create_company_loan_link(
 
 def get_link(db: Session, link_id: int) -> Optional[model.CompanyLoanLink]:
     return (
-        db.query(model.CompanyLoanLink)
-        .options(
-            joinedload(model.CompanyLoanLink.organization),
-            joinedload(model.CompanyLoanLink.product),
-        )
+        load_profiles.apply(db.query(model.CompanyLoanLink), "CompanyLoanLinkOut")
         .filter(model.CompanyLoanLink.id == link_id)
         .first()
     )
@@ -49,16 +44,39 @@ def get_link(db: Session, link_id: int) -> Optional[model.CompanyLoanLink]:
 
 def get_link_by_token(db: Session, token: str) -> Optional[model.CompanyLoanLink]:
     return (
-        db.query(model.CompanyLoanLink)
-        .options(
-            joinedload(model.CompanyLoanLink.organization),
-            joinedload(model.CompanyLoanLink.product),
-        )
+        load_profiles.apply(db.query(model.CompanyLoanLink), "CompanyLoanLinkOut")
         .filter(model.CompanyLoanLink.token == token)
         .first()
     )
 
 
+def get_public_link(db: Session, token: str) -> Optional[LinkSnapshot]:
+    """
+    Cached snapshot for the public form (load + submit); unknown tokens are not cached.
+    """
+    snapshot = catalogue_cache.get_link(token)
+    if snapshot is not None:
+        return snapshot
+
+    generation = catalogue_cache.generation()
+    link = get_link_by_token(db, token)
+    if link is None:
+        return None
+    snapshot = LinkSnapshot(
+        id=link.id,
+        token=link.token,
+        organization_id=link.organization_id,
+        product_id=link.product_id,
+        is_active=bool(link.is_active),
+        expires_at=link.expires_at,
+        created_at=link.created_at,
+        organization_name=link.organization.name if link.organization else None,
+        loan_product_name=link.product.name if link.product else None,
+    )
+    catalogue_cache.put_link(snapshot, generation)
+    return snapshot
+
+
 def list_links(
     db: Session,
     *,
@@ -66,13 +84,10 @@ def list_links(
     product_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> List[model.CompanyLoanLink]:
     query = (
-        db.query(model.CompanyLoanLink)
-        .options(
-            joinedload(model.CompanyLoanLink.organization),
-            joinedload(model.CompanyLoanLink.product),
-        )
+        load_profiles.apply(db.query(model.CompanyLoanLink), "CompanyLoanLinkOut")
     )
 
     if organization_id is not None:
@@ -81,11 +96,13 @@ def list_links(
     if product_id is not None:
         query = query.filter(model.CompanyLoanLink.product_id == product_id)
 
-    return (
-        query.order_by(model.CompanyLoanLink.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    return paginate(
+        query,
+        model.CompanyLoanLink.created_at,
+        model.CompanyLoanLink.id,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
     )
 
 
@@ -97,14 +114,11 @@ def deactivate_link(
     link.is_active = False
     db.add(link)
     db.commit()
+    invalidate(db, "link", link.id)
     db.refresh(link)
 
     return (
-        db.query(model.CompanyLoanLink)
-        .options(
-            joinedload(model.CompanyLoanLink.organization),
-            joinedload(model.CompanyLoanLink.product),
-        )
+        load_profiles.apply(db.query(model.CompanyLoanLink), "CompanyLoanLinkOut")
         .filter(model.CompanyLoanLink.id == link.id)
         .first()
     )
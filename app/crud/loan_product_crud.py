@@ -5,6 +5,9 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from app import model, schema
+from app.utils.pagination import paginate
+from app.utils.catalogue_cache import ProductSnapshot, catalogue_cache, invalidate
+from app.crud import load_profiles
 
 
 def create_loan_product(db: Session, product_in: schema.LoanProductCreate) -> model.LoanProduct:
@@ -20,19 +23,49 @@ def list_loan_products(
     skip: int = 0,
     limit: int = 100,
     is_active: Optional[bool] = None,
+    cursor: Optional[str] = None,
 ) -> List[model.LoanProduct]:
-    query = db.query(model.LoanProduct)
+    query = load_profiles.apply(db.query(model.LoanProduct), "LoanProductOut")
 
     if is_active is not None:
         query = query.filter(model.LoanProduct.is_active == is_active)
 
-    return query.offset(skip).limit(limit).all()
+    return paginate(
+        query,
+        model.LoanProduct.created_at,
+        model.LoanProduct.id,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
 
 
 def get_loan_product(db: Session, product_id: int) -> Optional[model.LoanProduct]:
     return db.query(model.LoanProduct).filter(model.LoanProduct.id == product_id).first()
 
 
+def get_public_product(db: Session, product_id: int) -> Optional[ProductSnapshot]:
+    snapshot = catalogue_cache.get_product(product_id)
+    if snapshot is not None:
+        return snapshot
+
+    generation = catalogue_cache.generation()
+    product = get_loan_product(db, product_id)
+    if product is None:
+        return None
+    snapshot = ProductSnapshot(
+        id=product.id,
+        name=product.name,
+        is_active=bool(product.is_active),
+        interest_rate=product.interest_rate,
+        max_tenor_months=product.max_tenor_months,
+        min_amount=product.min_amount,
+        max_amount=product.max_amount,
+    )
+    catalogue_cache.put_product(snapshot, generation)
+    return snapshot
+
+
 def update_loan_product(
     db: Session,
     product: model.LoanProduct,
@@ -44,5 +77,6 @@ def update_loan_product(
         setattr(product, field, value)
 
     db.commit()
+    invalidate(db, "product", product.id)
     db.refresh(product)
     return product
@@ -6,6 +6,8 @@ from sqlalchemy.exc import IntegrityError
 
 from .. import model, schema
 from ..crud import remittance_crud
+from ..utils.catalogue_cache import invalidate
+from .data_version_crud import mark_organization_changed
 
 
 def create_organization(
@@ -88,6 +90,8 @@ def update_organization(
         setattr(org, field, value)
     db.add(org)
     db.commit()
+    mark_organization_changed(db, org.id)
+    invalidate(db, "org", org.id)
     db.refresh(org)
     return org
 
@@ -98,5 +102,6 @@ def set_organization_active(
     org.is_active = is_active
     db.add(org)
     db.commit()
+    invalidate(db, "org", org.id)
     db.refresh(org)
     return org
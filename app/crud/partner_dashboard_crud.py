@@ -2,12 +2,14 @@
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from .. import model
+from .admin_remittance_crud import inbound_transaction_columns
+from ..utils.fast_json import rows_to_dicts
 
 
 def _month_range(year: int, month: int) -> Tuple[datetime, datetime]:
@@ -45,27 +47,19 @@ def get_org_monthly_due(
     
     outstanding_expr = (model.Repayment.amount_due - model.Repayment.amount_paid)
 
-    total_outstanding = (
-        db.query(func.coalesce(func.sum(outstanding_expr), 0))
+    total_outstanding, repayments_count = (
+        db.query(
+            func.coalesce(func.sum(outstanding_expr), 0),
+            func.count(model.Repayment.id),
+        )
+        .select_from(model.Repayment)
         .join(model.Loan, model.Loan.id == model.Repayment.loan_id)
         .join(model.LoanApplication, model.LoanApplication.id == model.Loan.application_id)
         .join(model.Customer, model.Customer.id == model.LoanApplication.customer_id)
         .filter(model.Customer.organization_id == organization_id)
         .filter(model.Repayment.due_date >= start, model.Repayment.due_date < end)
         .filter(outstanding_expr > 0)
-        .scalar()
-    )
-
-    
-    repayments_count = (
-        db.query(func.count(model.Repayment.id))
-        .join(model.Loan, model.Loan.id == model.Repayment.loan_id)
-        .join(model.LoanApplication, model.LoanApplication.id == model.Loan.application_id)
-        .join(model.Customer, model.Customer.id == model.LoanApplication.customer_id)
-        .filter(model.Customer.organization_id == organization_id)
-        .filter(model.Repayment.due_date >= start, model.Repayment.due_date < end)
-        .filter(outstanding_expr > 0)
-        .scalar()
+        .one()
     )
 
     
@@ -79,3 +73,15 @@ def get_org_monthly_due(
         "amount_due": total_outstanding,
         "repayments_count": int(repayments_count or 0),
     }
+
+
+def list_org_transactions(db: Session, organization_id: int) -> List[Dict]:
+    """
+    The org's inbound transactions as projected rows (InboundTransactionOut shape).
+    """
+    return rows_to_dicts(
+        db.query(*inbound_transaction_columns())
+        .filter(model.InboundTransaction.organization_id == organization_id)
+        .order_by(model.InboundTransaction.paid_at.desc())
+        .all()
+    )
@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict
+from typing import Dict
 from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy import func, asc
@@ -11,66 +11,96 @@ def list_org_staff_with_loans(db: Session, organization_id: int) -> Dict:
     Read-only view for partner org:
     - list staff (customers) in org who have a loan
     - show loan totals + repayment summary
+    - one query: per-loan totals are grouped in SQL and the next unpaid
+      installment comes from ROW_NUMBER() OVER (PARTITION BY loan)
     """
 
-    
-    loans = (
-        db.query(model.Loan)
+    org_loan_ids = (
+        db.query(model.Loan.id)
         .join(model.LoanApplication, model.Loan.application_id == model.LoanApplication.id)
         .join(model.Customer, model.LoanApplication.customer_id == model.Customer.id)
         .filter(model.Customer.organization_id == organization_id)
-        .order_by(model.Loan.created_at.desc())
-        .all()
+        .scalar_subquery()
     )
 
-    rows = []
-    for loan in loans:
-        app = loan.application
-        cust = app.customer if app else None
-        if not cust:
-            continue
+    totals = (
+        db.query(
+            model.Repayment.loan_id.label("loan_id"),
+            func.coalesce(func.sum(model.Repayment.amount_due), 0).label("total_due"),
+            func.coalesce(func.sum(model.Repayment.amount_paid), 0).label("total_paid"),
+        )
+        .filter(model.Repayment.loan_id.in_(org_loan_ids))
+        .group_by(model.Repayment.loan_id)
+        .subquery()
+    )
 
-        
-        total_due = (
-            db.query(func.coalesce(func.sum(model.Repayment.amount_due), 0))
-            .filter(model.Repayment.loan_id == loan.id)
-            .scalar()
+    ranked = (
+        db.query(
+            model.Repayment.loan_id.label("loan_id"),
+            model.Repayment.due_date.label("due_date"),
+            model.Repayment.amount_due.label("amount_due"),
+            func.row_number()
+            .over(
+                partition_by=model.Repayment.loan_id,
+                order_by=(asc(model.Repayment.due_date), asc(model.Repayment.installment_number)),
+            )
+            .label("rn"),
         )
-        total_paid = (
-            db.query(func.coalesce(func.sum(model.Repayment.amount_paid), 0))
-            .filter(model.Repayment.loan_id == loan.id)
-            .scalar()
+        .filter(model.Repayment.loan_id.in_(org_loan_ids), model.Repayment.is_paid.is_(False))
+        .subquery()
+    )
+
+    result = (
+        db.query(
+            model.Customer.id,
+            model.Customer.staff_id,
+            model.Customer.full_name,
+            model.Customer.email,
+            model.Customer.phone,
+            model.Loan.id,
+            model.Loan.status,
+            model.Loan.principal_amount,
+            model.Loan.total_payable,
+            totals.c.total_due,
+            totals.c.total_paid,
+            ranked.c.due_date,
+            ranked.c.amount_due,
         )
+        .select_from(model.Loan)
+        .join(model.LoanApplication, model.Loan.application_id == model.LoanApplication.id)
+        .join(model.Customer, model.LoanApplication.customer_id == model.Customer.id)
+        .outerjoin(totals, totals.c.loan_id == model.Loan.id)
+        .outerjoin(ranked, (ranked.c.loan_id == model.Loan.id) & (ranked.c.rn == 1))
+        .filter(model.Customer.organization_id == organization_id)
+        .order_by(model.Loan.created_at.desc(), model.Loan.id.desc())
+        .all()
+    )
 
+    rows = []
+    for (
+        customer_id, staff_id, full_name, email, phone,
+        loan_id, loan_status, principal_amount, total_payable,
+        total_due, total_paid, next_due_date, next_amount_due,
+    ) in result:
         total_due = Decimal(str(total_due or "0"))
         total_paid = Decimal(str(total_paid or "0"))
-        outstanding = (total_due - total_paid)
-
-        
-        next_rep = (
-            db.query(model.Repayment)
-            .filter(model.Repayment.loan_id == loan.id)
-            .filter(model.Repayment.is_paid.is_(False))
-            .order_by(asc(model.Repayment.due_date), asc(model.Repayment.installment_number))
-            .first()
-        )
 
         rows.append(
             {
-                "customer_id": cust.id,
-                "staff_id": cust.staff_id,
-                "full_name": cust.full_name,
-                "email": cust.email,
-                "phone": cust.phone,
-                "loan_id": loan.id,
-                "loan_status": loan.status or "",
-                "principal_amount": loan.principal_amount,
-                "total_payable": loan.total_payable,
+                "customer_id": customer_id,
+                "staff_id": staff_id,
+                "full_name": full_name,
+                "email": email,
+                "phone": phone,
+                "loan_id": loan_id,
+                "loan_status": loan_status or "",
+                "principal_amount": principal_amount,
+                "total_payable": total_payable,
                 "total_due": total_due,
                 "total_paid": total_paid,
-                "outstanding": outstanding,
-                "next_due_date": next_rep.due_date if next_rep else None,
-                "next_amount_due": next_rep.amount_due if next_rep else None,
+                "outstanding": (total_due - total_paid),
+                "next_due_date": next_due_date,
+                "next_amount_due": next_amount_due,
             }
         )
 
@@ -1,13 +1,17 @@
 # app/crud/repayment_crud.py
 
-from typing import List, Optional
+import time
+from array import array
+from typing import List, Optional, Tuple, Sequence
 from datetime import timedelta, datetime
 from decimal import Decimal
 
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
+from sqlalchemy import asc, func, exists
 
 from .. import model, schema
+from ..metrics import ALLOCATIONS_MADE, ALLOCATION_DURATION, AMOUNT_APPLIED, org_size_bucket
+from .data_version_crud import mark_organization_changed
 
 
 
@@ -105,6 +109,172 @@ def _set_loan_status(db: Session, loan_id: int) -> None:
 
 
 
+def _record_allocation_event(
+    db: Session,
+    event_type: model.AllocationEventType,
+    repayment: model.Repayment,
+    amount: Decimal,
+    organization_id: int,
+    transaction_id: Optional[int] = None,
+    effective_at: Optional[datetime] = None,
+) -> None:
+    db.add(
+        model.AllocationEvent(
+            event_type=event_type,
+            organization_id=organization_id,
+            loan_id=repayment.loan_id,
+            repayment_id=repayment.id,
+            transaction_id=transaction_id,
+            amount=Decimal(str(amount)).quantize(Decimal("0.01")),
+            effective_at=effective_at,
+            occurred_at=datetime.utcnow(),
+        )
+    )
+
+
+def _org_id_for_loan(db: Session, loan_id: int) -> Optional[int]:
+    return (
+        db.query(model.Customer.organization_id)
+        .join(model.LoanApplication, model.LoanApplication.customer_id == model.Customer.id)
+        .join(model.Loan, model.Loan.application_id == model.LoanApplication.id)
+        .filter(model.Loan.id == loan_id)
+        .scalar()
+    )
+
+
+def _org_unpaid_installments_query(db: Session, organization_id: int, *columns):
+    """
+    Unpaid installments for an org in waterfall order (oldest due first).
+    Pass columns for a projected (read-only) query, or nothing for ORM rows.
+    """
+    query = db.query(*columns) if columns else db.query(model.Repayment)
+    return (
+        query.select_from(model.Repayment)
+        .join(model.Loan, model.Repayment.loan_id == model.Loan.id)
+        .join(model.LoanApplication, model.Loan.application_id == model.LoanApplication.id)
+        .join(model.Customer, model.LoanApplication.customer_id == model.Customer.id)
+        .filter(model.Customer.organization_id == organization_id)
+        .filter(model.Repayment.is_paid.is_(False))
+        .order_by(asc(model.Repayment.due_date), asc(model.Repayment.installment_number))
+    )
+
+
+def _to_cents(value) -> int:
+    return int((Decimal(str(value or 0)) * 100).quantize(Decimal("1")))
+
+
+def _cents_to_decimal(cents: int) -> Decimal:
+    return (Decimal(cents) / 100).quantize(Decimal("0.01"))
+
+
+def _plan_waterfall(outstanding_cents: Sequence[int], amount_cents: int) -> Tuple[List[Tuple[int, int]], int]:
+    """
+    Pure waterfall: walks installments in order and fills each one before moving on.
+    Returns ([(index, cents_applied), ...], cents_left_over).
+    """
+    plan: List[Tuple[int, int]] = []
+    remaining = amount_cents
+    for idx, outstanding in enumerate(outstanding_cents):
+        if remaining <= 0:
+            break
+        if outstanding <= 0:
+            continue
+        apply_amt = outstanding if outstanding < remaining else remaining
+        plan.append((idx, apply_amt))
+        remaining -= apply_amt
+    return plan, remaining
+
+
+def load_org_installment_snapshot(db: Session, organization_id: int) -> dict:
+    """
+    Read-only snapshot of an org's open installments, held as compact arrays
+    (no ORM objects, no identity map) so it is cheap to build and walk.
+    """
+    rows = _org_unpaid_installments_query(
+        db,
+        organization_id,
+        model.Repayment.id,
+        model.Repayment.loan_id,
+        model.Repayment.installment_number,
+        model.Repayment.due_date,
+        model.Repayment.amount_due,
+        model.Repayment.amount_paid,
+    ).all()
+
+    repayment_ids = array("q")
+    loan_ids = array("q")
+    installment_numbers = array("l")
+    outstanding_cents = array("q")
+    due_dates: List[datetime] = []
+
+    for rep_id, loan_id, inst_no, due_date, amount_due, amount_paid in rows:
+        repayment_ids.append(rep_id)
+        loan_ids.append(loan_id)
+        installment_numbers.append(inst_no)
+        outstanding_cents.append(_to_cents(amount_due) - _to_cents(amount_paid))
+        due_dates.append(due_date)
+
+    return {
+        "repayment_ids": repayment_ids,
+        "loan_ids": loan_ids,
+        "installment_numbers": installment_numbers,
+        "due_dates": due_dates,
+        "outstanding_cents": outstanding_cents,
+    }
+
+
+def simulate_org_allocation(db: Session, organization_id: int, amount: Decimal) -> dict:
+    """
+    Dry run of apply_inbound_transaction_to_org: same ordering, same waterfall,
+    nothing is written. Returns the per-installment allocation plan.
+    """
+    amount_cents = _to_cents(amount)
+    if amount_cents <= 0:
+        raise ValueError("Transaction amount must be > 0")
+
+    snap = load_org_installment_snapshot(db, organization_id)
+    outstanding = snap["outstanding_cents"]
+    plan, remaining = _plan_waterfall(outstanding, amount_cents)
+
+    allocations = []
+    for idx, applied in plan:
+        allocations.append(
+            {
+                "repayment_id": snap["repayment_ids"][idx],
+                "loan_id": snap["loan_ids"][idx],
+                "installment_number": snap["installment_numbers"][idx],
+                "due_date": snap["due_dates"][idx],
+                "outstanding_before": _cents_to_decimal(outstanding[idx]),
+                "amount_applied": _cents_to_decimal(applied),
+                "outstanding_after": _cents_to_decimal(outstanding[idx] - applied),
+            }
+        )
+
+    return {
+        "organization_id": organization_id,
+        "amount": _cents_to_decimal(amount_cents),
+        "open_installments": len(outstanding),
+        "allocations_made": len(allocations),
+        "total_applied": _cents_to_decimal(amount_cents - remaining),
+        "unallocated_amount": _cents_to_decimal(remaining),
+        "allocations": allocations,
+    }
+
+
+def _lock_org(db: Session, organization_id: int, skip_locked: bool = False) -> Optional[model.PartnerOrganization]:
+    """
+    Row-locks the organization so only one allocation pass runs per org at a time.
+    With skip_locked=True returns None instead of waiting when another pass holds it.
+    (No-op on SQLite, which has no row locks.)
+    """
+    return (
+        db.query(model.PartnerOrganization)
+        .filter(model.PartnerOrganization.id == organization_id)
+        .with_for_update(skip_locked=skip_locked)
+        .first()
+    )
+
+
 def apply_inbound_transaction_to_org(
     db: Session,
     tx: model.InboundTransaction,
@@ -127,16 +297,10 @@ def apply_inbound_transaction_to_org(
     if existing_alloc:
         raise ValueError("This transaction has already been allocated.")
 
-    unpaid_rows = (
-        db.query(model.Repayment)
-        .join(model.Loan, model.Repayment.loan_id == model.Loan.id)
-        .join(model.LoanApplication, model.Loan.application_id == model.LoanApplication.id)
-        .join(model.Customer, model.LoanApplication.customer_id == model.Customer.id)
-        .filter(model.Customer.organization_id == tx.organization_id)
-        .filter(model.Repayment.is_paid.is_(False))
-        .order_by(asc(model.Repayment.due_date), asc(model.Repayment.installment_number))
-        .all()
-    )
+    started = time.perf_counter()
+    _lock_org(db, tx.organization_id)
+
+    unpaid_rows = _org_unpaid_installments_query(db, tx.organization_id).all()
 
     allocations_made = 0
     loans_touched = set()
@@ -173,6 +337,15 @@ def apply_inbound_transaction_to_org(
             amount_applied=apply_amt,
         )
         db.add(alloc)
+        _record_allocation_event(
+            db,
+            model.AllocationEventType.APPLIED,
+            r,
+            apply_amt,
+            organization_id=tx.organization_id,
+            transaction_id=tx.id,
+            effective_at=tx.paid_at,
+        )
 
         allocations_made += 1
         loans_touched.add(r.loan_id)
@@ -191,6 +364,12 @@ def apply_inbound_transaction_to_org(
     )
     db.add(tx)
     db.commit()
+    ALLOCATION_DURATION.observe(
+        time.perf_counter() - started, path="inline", org_size=org_size_bucket(len(unpaid_rows))
+    )
+    ALLOCATIONS_MADE.inc(allocations_made, path="inline")
+    AMOUNT_APPLIED.inc(float(total_applied), path="inline")
+    mark_organization_changed(db, tx.organization_id)
     db.refresh(tx)
 
     return {
@@ -204,6 +383,216 @@ def apply_inbound_transaction_to_org(
 
 
 
+# DISPUTED money stays put until someone resolves the dispute
+SWEEPABLE_MATCH_STATUSES = (model.TransactionMatchStatus.MATCHED, model.TransactionMatchStatus.UNMATCHED)
+
+
+def _org_leftover_transactions(db: Session, organization_id: int) -> List[Tuple[model.InboundTransaction, Decimal]]:
+    """
+    Transactions of an org (MATCHED, or UNMATCHED with nothing applied yet) that
+    still have money not applied to any installment, oldest first.
+    Returns (tx, applied_so_far) pairs.
+    """
+    applied_sq = (
+        db.query(
+            model.TransactionAllocation.transaction_id.label("transaction_id"),
+            func.sum(model.TransactionAllocation.amount_applied).label("applied"),
+        )
+        .group_by(model.TransactionAllocation.transaction_id)
+        .subquery()
+    )
+    applied_expr = func.coalesce(applied_sq.c.applied, 0)
+
+    return (
+        db.query(model.InboundTransaction, applied_expr)
+        .outerjoin(applied_sq, applied_sq.c.transaction_id == model.InboundTransaction.id)
+        .filter(model.InboundTransaction.organization_id == organization_id)
+        .filter(model.InboundTransaction.match_status.in_(SWEEPABLE_MATCH_STATUSES))
+        .filter(model.InboundTransaction.amount > applied_expr)
+        .order_by(asc(model.InboundTransaction.paid_at), asc(model.InboundTransaction.id))
+        .all()
+    )
+
+
+def find_orgs_with_sweepable_balance(db: Session, now: datetime, limit: int) -> List[int]:
+    """
+    Orgs that have leftover remittance on a MATCHED or UNMATCHED transaction AND
+    at least one unpaid installment that is already due.
+    """
+    applied = (
+        db.query(func.coalesce(func.sum(model.TransactionAllocation.amount_applied), 0))
+        .filter(model.TransactionAllocation.transaction_id == model.InboundTransaction.id)
+        .correlate(model.InboundTransaction)
+        .scalar_subquery()
+    )
+
+    due_unpaid = (
+        exists()
+        .where(model.Repayment.loan_id == model.Loan.id)
+        .where(model.Loan.application_id == model.LoanApplication.id)
+        .where(model.LoanApplication.customer_id == model.Customer.id)
+        .where(model.Customer.organization_id == model.InboundTransaction.organization_id)
+        .where(model.Repayment.is_paid.is_(False))
+        .where(model.Repayment.due_date <= now)
+    )
+
+    rows = (
+        db.query(model.InboundTransaction.organization_id)
+        .filter(model.InboundTransaction.organization_id.isnot(None))
+        .filter(model.InboundTransaction.match_status.in_(SWEEPABLE_MATCH_STATUSES))
+        .filter(model.InboundTransaction.amount > applied)
+        .filter(due_unpaid)
+        .distinct()
+        .order_by(model.InboundTransaction.organization_id.asc())
+        .limit(limit)
+        .all()
+    )
+    return [r[0] for r in rows]
+
+
+def sweep_unallocated_for_org(
+    db: Session,
+    organization_id: int,
+    now: datetime,
+    max_allocations: int,
+) -> dict:
+    """
+    Applies leftover remittance of an org to installments that are due (due_date <= now).
+
+    - org row is locked (SKIP LOCKED): if another pass holds it, the org is skipped
+    - at most max_allocations allocations are written in this pass
+    - allocations are recorded against the ORIGINAL InboundTransaction (oldest first);
+      an UNMATCHED transaction becomes MATCHED once something is applied from it
+    - one commit per pass
+    """
+    result = {
+        "organization_id": organization_id,
+        "skipped": False,
+        "allocations_made": 0,
+        "total_applied": Decimal("0.00"),
+        "transactions_touched": 0,
+    }
+
+    started = time.perf_counter()
+    if _lock_org(db, organization_id, skip_locked=True) is None:
+        db.rollback()
+        result["skipped"] = True
+        return result
+
+    leftovers = _org_leftover_transactions(db, organization_id)
+    if not leftovers or max_allocations <= 0:
+        db.rollback()
+        return result
+
+    # the waterfall fills rows in order and every allocation lands on one row,
+    # so max_allocations allocations never reach past the first max_allocations rows
+    due_rows: List[model.Repayment] = (
+        _org_unpaid_installments_query(db, organization_id)
+        .filter(model.Repayment.due_date <= now)
+        .limit(max_allocations)
+        .all()
+    )
+    if not due_rows:
+        db.rollback()
+        return result
+
+    outstanding = [_to_cents(r.amount_due) - _to_cents(r.amount_paid) for r in due_rows]
+    loans_touched = set()
+    applied_total_cents = 0
+
+    for tx, applied_so_far in leftovers:
+        budget = max_allocations - result["allocations_made"]
+        if budget <= 0:
+            break
+        leftover_cents = _to_cents(tx.amount) - _to_cents(applied_so_far)
+        plan, _ = _plan_waterfall(outstanding, leftover_cents)
+        if not plan:
+            break
+        # one tx can split across several rows and one row take from several txs
+        plan = plan[:budget]
+        if tx.match_status != model.TransactionMatchStatus.MATCHED:
+            tx.match_status = model.TransactionMatchStatus.MATCHED
+            db.add(tx)
+
+        for idx, cents in plan:
+            r = due_rows[idx]
+            outstanding[idx] -= cents
+
+            r.amount_paid = _cents_to_decimal(_to_cents(r.amount_paid) + cents)
+            r.paid_at = tx.paid_at
+            r.is_paid = outstanding[idx] <= 0
+            db.add(r)
+
+            db.add(
+                model.TransactionAllocation(
+                    transaction_id=tx.id,
+                    repayment_id=r.id,
+                    amount_applied=_cents_to_decimal(cents),
+                )
+            )
+            _record_allocation_event(
+                db,
+                model.AllocationEventType.APPLIED,
+                r,
+                _cents_to_decimal(cents),
+                organization_id=organization_id,
+                transaction_id=tx.id,
+                effective_at=tx.paid_at,
+            )
+            loans_touched.add(r.loan_id)
+            applied_total_cents += cents
+            result["allocations_made"] += 1
+
+        result["transactions_touched"] += 1
+
+    db.commit()
+
+    for loan_id in loans_touched:
+        _set_loan_status(db, loan_id)
+
+    ALLOCATION_DURATION.observe(
+        time.perf_counter() - started, path="sweep", org_size=org_size_bucket(len(due_rows))
+    )
+    ALLOCATIONS_MADE.inc(result["allocations_made"], path="sweep")
+    AMOUNT_APPLIED.inc(applied_total_cents / 100, path="sweep")
+    mark_organization_changed(db, organization_id)
+    result["total_applied"] = _cents_to_decimal(applied_total_cents)
+    return result
+
+
+def run_unallocated_sweep(
+    db: Session,
+    max_orgs: int,
+    max_allocations: int,
+    now: Optional[datetime] = None,
+) -> dict:
+    """
+    One sweeper run. Work is bounded by max_orgs and by a shared max_allocations budget.
+    """
+    now = now or datetime.utcnow()
+    budget = max_allocations
+    orgs_swept = []
+
+    for org_id in find_orgs_with_sweepable_balance(db, now=now, limit=max_orgs):
+        if budget <= 0:
+            break
+        res = sweep_unallocated_for_org(db, org_id, now=now, max_allocations=budget)
+        budget -= res["allocations_made"]
+        orgs_swept.append(res)
+
+    total_applied = sum((r["total_applied"] for r in orgs_swept), Decimal("0.00"))
+    for r in orgs_swept:
+        r["total_applied"] = str(r["total_applied"])
+
+    return {
+        "run_at": now,
+        "organizations": orgs_swept,
+        "allocations_made": sum(r["allocations_made"] for r in orgs_swept),
+        "total_applied": str(total_applied),
+        "budget_remaining": max(budget, 0),
+    }
+
+
 def reverse_repayment_payment(
     db: Session,
     repayment: model.Repayment,
@@ -222,6 +611,16 @@ def reverse_repayment_payment(
             model.TransactionAllocation.repayment_id == repayment.id
         ).delete(synchronize_session=False)
 
+    org_id = _org_id_for_loan(db, repayment.loan_id)
+    if org_id is not None:
+        _record_allocation_event(
+            db,
+            model.AllocationEventType.REVERSED,
+            repayment,
+            -paid,
+            organization_id=org_id,
+        )
+
     repayment.amount_paid = Decimal("0.00")
     repayment.is_paid = False
     repayment.paid_at = None
@@ -231,6 +630,7 @@ def reverse_repayment_payment(
     db.refresh(repayment)
 
     _set_loan_status(db, repayment.loan_id)
+    mark_organization_changed(db, org_id)
     return repayment
 
 
@@ -264,6 +664,17 @@ def reverse_inbound_transaction(db: Session, tx: model.InboundTransaction, reaso
         if new_paid < 0:
             new_paid = Decimal("0.00")
 
+        if new_paid != paid:
+            _record_allocation_event(
+                db,
+                model.AllocationEventType.REVERSED,
+                r,
+                new_paid - paid,
+                organization_id=tx.organization_id,
+                transaction_id=tx.id,
+                effective_at=tx.paid_at,
+            )
+
         r.amount_paid = new_paid
         r.is_paid = new_paid >= Decimal(str(r.amount_due)).quantize(Decimal("0.01"))
         if not r.is_paid:
@@ -284,6 +695,7 @@ def reverse_inbound_transaction(db: Session, tx: model.InboundTransaction, reaso
     for loan_id in touched_loans:
         _set_loan_status(db, loan_id)
 
+    mark_organization_changed(db, tx.organization_id)
     db.refresh(tx)
     return {
         "transaction_id": tx.id,
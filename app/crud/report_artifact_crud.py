@@ -0,0 +1,97 @@
+# app/crud/report_artifact_crud.py
+
+import gzip
+import json
+from typing import Any, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import model
+from .data_version_crud import get_data_version
+from .report_crud import get_org_monthly_report_v2
+
+
+def _encode(report: Dict[str, Any]) -> bytes:
+    return gzip.compress(json.dumps(report, separators=(",", ":")).encode("utf-8"))
+
+
+def _decode(payload: bytes) -> Dict[str, Any]:
+    return json.loads(gzip.decompress(payload).decode("utf-8"))
+
+
+def get_current_artifact(
+    db: Session,
+    organization_id: int,
+    year: int,
+    month: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    Stored org-monthly-v2 report, or None if there is none for the org's
+    current data version.
+    """
+    version = get_data_version(db, organization_id)
+    payload = (
+        db.query(model.ReportArtifact.payload)
+        .filter(
+            model.ReportArtifact.organization_id == organization_id,
+            model.ReportArtifact.year == year,
+            model.ReportArtifact.month == month,
+            model.ReportArtifact.data_version == version,
+        )
+        .scalar()
+    )
+    return _decode(payload) if payload is not None else None
+
+
+def build_artifact(db: Session, organization_id: int, year: int, month: int) -> Dict[str, Any]:
+    """
+    Computes and stores the report for one org/period.
+
+    The version is read BEFORE computing: if a write lands mid-computation the
+    artifact is simply stored under an already-stale version and never served.
+    Older versions of the same period are deleted.
+    """
+    version = get_data_version(db, organization_id)
+    result = {"organization_id": organization_id, "data_version": version, "stored": False}
+
+    exists = (
+        db.query(model.ReportArtifact.id)
+        .filter(
+            model.ReportArtifact.organization_id == organization_id,
+            model.ReportArtifact.year == year,
+            model.ReportArtifact.month == month,
+            model.ReportArtifact.data_version == version,
+        )
+        .first()
+    )
+    if exists:
+        return result
+
+    report = get_org_monthly_report_v2(db, organization_id, year, month)
+
+    db.query(model.ReportArtifact).filter(
+        model.ReportArtifact.organization_id == organization_id,
+        model.ReportArtifact.year == year,
+        model.ReportArtifact.month == month,
+        model.ReportArtifact.data_version < version,
+    ).delete(synchronize_session=False)
+
+    db.add(
+        model.ReportArtifact(
+            organization_id=organization_id,
+            year=year,
+            month=month,
+            data_version=version,
+            payload=_encode(report),
+        )
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        # a concurrent run stored the same version
+        db.rollback()
+        return result
+
+    result["stored"] = True
+    return result
@@ -1,22 +1,19 @@
 # app/crud/report_crud.py
 
-from datetime import datetime, date
+import csv
+import io
+from datetime import datetime, date, time, timedelta
 from decimal import Decimal
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Optional
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case, and_, or_
 
 from .. import model
+from ..utils.report_cache import report_cache
+from .data_version_crud import get_data_version, get_global_data_version
 
-
-def _month_range_dates(year: int, month: int) -> Tuple[date, date]:
-    start = date(year, month, 1)
-    if month == 12:
-        next_month = date(year + 1, 1, 1)
-    else:
-        next_month = date(year, month + 1, 1)
-    return start, next_month
+AGING_THRESHOLDS = (1, 30, 60, 90)
 
 
 def _month_range_datetimes(year: int, month: int) -> Tuple[datetime, datetime]:
@@ -42,7 +39,6 @@ def get_org_monthly_report_v2(
     )
 
     period_label = datetime(year, month, 1).strftime("%B %Y")
-    start_date, next_month = _month_range_dates(year, month)
 
     if not org:
         return {
@@ -58,123 +54,93 @@ def get_org_monthly_report_v2(
             "items": [],
         }
 
-    loans: List[model.Loan] = (
-        db.query(model.Loan)
+    start_dt, end_dt = _month_range_datetimes(year, month)
+    R = model.Repayment
+
+    # projected rows only: installments due or paid in the month, with their loan columns
+    rows = (
+        db.query(
+            R.id,
+            R.loan_id,
+            R.installment_number,
+            R.due_date,
+            R.amount_due,
+            R.amount_paid,
+            R.is_paid,
+            R.paid_at,
+            model.Loan.principal_amount,
+            model.Loan.status,
+        )
+        .join(model.Loan, model.Loan.id == R.loan_id)
         .join(model.LoanApplication, model.Loan.application_id == model.LoanApplication.id)
         .join(model.Customer, model.LoanApplication.customer_id == model.Customer.id)
         .filter(model.Customer.organization_id == organization_id)
+        .filter(
+            or_(
+                and_(R.due_date >= start_dt, R.due_date < end_dt),
+                and_(R.paid_at >= start_dt, R.paid_at < end_dt),
+            )
+        )
+        .order_by(R.loan_id.asc(), R.due_date.asc(), R.id.asc())
         .all()
     )
 
-    if not loans:
-        return {
-            "organization": {"id": org.id, "name": org.name},
-            "period": {"year": year, "month": month, "label": period_label},
-            "summary": {
-                "loans_in_period": 0,
-                "total_principal": 0.0,
-                "total_expected_month": 0.0,
-                "total_paid_month": 0.0,
-                "total_outstanding_month": 0.0,
-            },
-            "items": [],
-        }
-
-    loan_ids = [loan.id for loan in loans]
-
-    repayments: List[model.Repayment] = (
-        db.query(model.Repayment)
-        .filter(model.Repayment.loan_id.in_(loan_ids))
-        .all()
-    )
-
-    def to_date(dt):
-        if not dt:
-            return None
-        if isinstance(dt, date) and not isinstance(dt, datetime):
-            return dt
-        return dt.date()
-
-    due_in_month: List[model.Repayment] = []
-    paid_in_month: List[model.Repayment] = []
-
-    for r in repayments:
-        d_due = to_date(r.due_date)
-        d_paid = to_date(r.paid_at)
-
-        if d_due and (start_date <= d_due < next_month):
-            due_in_month.append(r)
+    total_expected_month = Decimal(0)
+    total_paid_month = Decimal(0)
+    total_principal = Decimal(0)
+    items: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+
+    for r in rows:
+        if current is None or current["loan_id"] != r.loan_id:
+            status = r.status
+            current = {
+                "loan_id": r.loan_id,
+                "principal_amount": float(r.principal_amount or 0),
+                "status": "" if status is None else getattr(status, "name", str(status)),
+                "total_expected_for_month": Decimal(0),
+                "total_paid_for_month": Decimal(0),
+                "total_outstanding_for_month": 0.0,
+                "repayments": [],
+            }
+            items.append(current)
+            total_principal += Decimal(r.principal_amount or 0)
 
-        if d_paid and (start_date <= d_paid < next_month):
-            paid_in_month.append(r)
+        if r.due_date is not None and start_dt <= r.due_date < end_dt:
+            total_expected_month += Decimal(r.amount_due or 0)
+        if r.paid_at is not None and start_dt <= r.paid_at < end_dt:
+            total_paid_month += Decimal(r.amount_paid or 0)
 
-    loan_ids_in_period = sorted(
-        {r.loan_id for r in due_in_month} | {r.loan_id for r in paid_in_month}
-    )
-    loans_in_period = [loan for loan in loans if loan.id in loan_ids_in_period]
+        current["total_expected_for_month"] += Decimal(r.amount_due or 0)
+        current["total_paid_for_month"] += Decimal(r.amount_paid or 0)
+        current["repayments"].append(
+            {
+                "id": r.id,
+                "installment_number": r.installment_number,
+                "due_date": r.due_date.isoformat() if r.due_date else None,
+                "amount_due": float(r.amount_due or 0),
+                "amount_paid": float(r.amount_paid or 0),
+                "is_paid": bool(r.is_paid),
+                "paid_at": r.paid_at.isoformat() if r.paid_at else None,
+            }
+        )
 
-    total_principal = sum(Decimal(loan.principal_amount or 0) for loan in loans_in_period)
-    total_expected_month = sum(Decimal(r.amount_due or 0) for r in due_in_month)
-    total_paid_month = sum(Decimal(r.amount_paid or 0) for r in paid_in_month)
+    for item in items:
+        expected = item["total_expected_for_month"]
+        paid = item["total_paid_for_month"]
+        item["total_expected_for_month"] = float(expected)
+        item["total_paid_for_month"] = float(paid)
+        item["total_outstanding_for_month"] = float(max(expected - paid, Decimal(0)))
 
     total_outstanding_month = total_expected_month - total_paid_month
     if total_outstanding_month < 0:
         total_outstanding_month = Decimal(0)
 
-    reps_by_loan: Dict[int, List[model.Repayment]] = {}
-    for r in set(due_in_month + paid_in_month):
-        reps_by_loan.setdefault(r.loan_id, []).append(r)
-
-    items: List[Dict[str, Any]] = []
-
-    for loan in loans_in_period:
-        reps = sorted(
-            reps_by_loan.get(loan.id, []),
-            key=lambda r: to_date(r.due_date) or date.max,
-        )
-
-        expected_for_loan = sum(Decimal(r.amount_due or 0) for r in reps)
-        paid_for_loan = sum(Decimal(r.amount_paid or 0) for r in reps)
-        outstanding_for_loan = expected_for_loan - paid_for_loan
-        if outstanding_for_loan < 0:
-            outstanding_for_loan = Decimal(0)
-
-        
-        if loan.status is None:
-            status_str = ""
-        elif hasattr(loan.status, "name"):
-            status_str = loan.status.name
-        else:
-            status_str = str(loan.status)
-
-        items.append(
-            {
-                "loan_id": loan.id,
-                "principal_amount": float(loan.principal_amount or 0),
-                "status": status_str,
-                "total_expected_for_month": float(expected_for_loan),
-                "total_paid_for_month": float(paid_for_loan),
-                "total_outstanding_for_month": float(outstanding_for_loan),
-                "repayments": [
-                    {
-                        "id": r.id,
-                        "installment_number": getattr(r, "installment_number", None),
-                        "due_date": r.due_date.isoformat() if r.due_date else None,
-                        "amount_due": float(r.amount_due or 0),
-                        "amount_paid": float(r.amount_paid or 0),
-                        "is_paid": bool(r.is_paid),
-                        "paid_at": r.paid_at.isoformat() if r.paid_at else None,
-                    }
-                    for r in reps
-                ],
-            }
-        )
-
     return {
         "organization": {"id": org.id, "name": org.name},
         "period": {"year": year, "month": month, "label": period_label},
         "summary": {
-            "loans_in_period": len(loans_in_period),
+            "loans_in_period": len(items),
             "total_principal": float(total_principal),
             "total_expected_month": float(total_expected_month),
             "total_paid_month": float(total_paid_month),
@@ -248,3 +214,314 @@ def get_org_monthly_report_legacy(
         "collection_rate": collection_rate,
         "repayments": repayments,
     }
+
+
+
+def _data_version(db: Session, organization_id: Optional[int]):
+    """
+    Read BEFORE computing and put in the cache key: the version is shared by
+    all workers, so a write seen by another process (or one that lands while
+    this compute runs) moves readers to a new key instead of a stale entry.
+    """
+    if organization_id is None:
+        return get_global_data_version(db)
+    return get_data_version(db, organization_id)
+
+
+def _dpd_cutoff(as_of_date: date, days: int) -> datetime:
+    """
+    An installment is >= `days` days past due on as_of_date when due_date < cutoff.
+    """
+    return datetime.combine(as_of_date - timedelta(days=days - 1), time.min)
+
+
+def _ratio(part: Decimal, whole: Decimal) -> Optional[float]:
+    if whole <= 0:
+        return None
+    return float((part / whole) * Decimal("100"))
+
+
+def get_aging_report(
+    db: Session,
+    as_of_date: date,
+    organization_id: Optional[int] = None,
+    product_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Portfolio-at-risk aging per (organization, product), computed in ONE grouped
+    CASE aggregation over outstanding installments.
+
+    Buckets are exclusive (current, 1-29, 30-59, 60-89, 90+ days past due);
+    PAR1/30/60/90 are cumulative (outstanding at least N days past due).
+    Cached per (as_of_date, filters, data version).
+    """
+    cache_key = ("aging", as_of_date, organization_id, product_id, _data_version(db, organization_id))
+    cached = report_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    c1, c30, c60, c90 = (_dpd_cutoff(as_of_date, d) for d in AGING_THRESHOLDS)
+
+    outstanding = model.Repayment.amount_due - func.coalesce(model.Repayment.amount_paid, 0)
+    due = model.Repayment.due_date
+
+    def bucket(cond):
+        return func.coalesce(func.sum(case((cond, outstanding), else_=0)), 0)
+
+    query = (
+        db.query(
+            model.Customer.organization_id,
+            model.PartnerOrganization.name,
+            model.Loan.product_id,
+            model.LoanProduct.name,
+            func.count(func.distinct(model.Loan.id)),
+            func.coalesce(func.sum(outstanding), 0),
+            bucket(due >= c1),
+            bucket((due < c1) & (due >= c30)),
+            bucket((due < c30) & (due >= c60)),
+            bucket((due < c60) & (due >= c90)),
+            bucket(due < c90),
+            func.count(func.distinct(case((due < c1, model.Loan.id), else_=None))),
+        )
+        .select_from(model.Repayment)
+        .join(model.Loan, model.Loan.id == model.Repayment.loan_id)
+        .join(model.LoanApplication, model.LoanApplication.id == model.Loan.application_id)
+        .join(model.Customer, model.Customer.id == model.LoanApplication.customer_id)
+        .join(model.PartnerOrganization, model.PartnerOrganization.id == model.Customer.organization_id)
+        .join(model.LoanProduct, model.LoanProduct.id == model.Loan.product_id)
+        .filter(model.Repayment.is_paid.is_(False))
+        .filter(outstanding > 0)
+    )
+    if organization_id is not None:
+        query = query.filter(model.Customer.organization_id == organization_id)
+    if product_id is not None:
+        query = query.filter(model.Loan.product_id == product_id)
+
+    rows = query.group_by(
+        model.Customer.organization_id,
+        model.PartnerOrganization.name,
+        model.Loan.product_id,
+        model.LoanProduct.name,
+    ).order_by(model.Customer.organization_id.asc(), model.Loan.product_id.asc()).all()
+
+    def dec(x) -> Decimal:
+        return Decimal(str(x or "0")).quantize(Decimal("0.01"))
+
+    keys = ("current", "dpd_1_29", "dpd_30_59", "dpd_60_89", "dpd_90_plus")
+    totals = {k: Decimal("0.00") for k in ("total_outstanding",) + keys}
+    totals_loans = 0
+    totals_loans_at_risk = 0
+    items: List[Dict[str, Any]] = []
+
+    for org_id, org_name, prod_id, prod_name, loans, total, *buckets, loans_at_risk in rows:
+        amounts = dict(zip(keys, (dec(b) for b in buckets)))
+        total = dec(total)
+        items.append(_aging_row(total, amounts, loans, loans_at_risk, {
+            "organization_id": org_id,
+            "organization_name": org_name,
+            "product_id": prod_id,
+            "product_name": prod_name,
+        }))
+        totals["total_outstanding"] += total
+        for k in keys:
+            totals[k] += amounts[k]
+        totals_loans += int(loans or 0)
+        totals_loans_at_risk += int(loans_at_risk or 0)
+
+    result = {
+        "as_of_date": as_of_date,
+        "organization_id": organization_id,
+        "product_id": product_id,
+        "items": items,
+        "totals": _aging_row(
+            totals["total_outstanding"],
+            {k: totals[k] for k in keys},
+            totals_loans,
+            totals_loans_at_risk,
+            {"organization_id": organization_id, "organization_name": None, "product_id": product_id, "product_name": None},
+        ),
+    }
+    report_cache.set(cache_key, result, organization_id)
+    return result
+
+
+def _aging_row(
+    total: Decimal,
+    amounts: Dict[str, Decimal],
+    loans: int,
+    loans_at_risk: int,
+    labels: Dict[str, Any],
+) -> Dict[str, Any]:
+    par90 = amounts["dpd_90_plus"]
+    par60 = par90 + amounts["dpd_60_89"]
+    par30 = par60 + amounts["dpd_30_59"]
+    par1 = par30 + amounts["dpd_1_29"]
+
+    return {
+        **labels,
+        "loans_count": int(loans or 0),
+        "loans_at_risk": int(loans_at_risk or 0),
+        "total_outstanding": total,
+        **amounts,
+        "par1": par1,
+        "par30": par30,
+        "par60": par60,
+        "par90": par90,
+        "par1_ratio": _ratio(par1, total),
+        "par30_ratio": _ratio(par30, total),
+        "par60_ratio": _ratio(par60, total),
+        "par90_ratio": _ratio(par90, total),
+    }
+
+
+
+def month_bucket(db: Session, column):
+    """
+    First day of the month of `column`, as one SQL expression.
+    PostgreSQL: date_trunc('month', col); SQLite: strftime('%Y-%m-01', col).
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return func.strftime("%Y-%m-01", column)
+    return func.date_trunc("month", column)
+
+
+def month_bucket_value(db: Session, label: str):
+    """
+    The value month_bucket() produces for a 'YYYY-MM' label (for IN filters).
+    """
+    year, month = int(label[:4]), int(label[5:7])
+    if db.get_bind().dialect.name == "sqlite":
+        return f"{year:04d}-{month:02d}-01"
+    return datetime(year, month, 1)
+
+
+def _add_months(d: date, months: int) -> date:
+    idx = d.year * 12 + (d.month - 1) + months
+    return date(idx // 12, idx % 12 + 1, 1)
+
+
+def month_label(value) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m")
+    return str(value)[:7]
+
+
+def get_collections_forecast(
+    db: Session,
+    months: int,
+    start: date,
+    organization_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Projected inflows (outstanding on unpaid installments) per organization x month,
+    from ONE grouped query on the month bucket of due_date.
+
+    Installments due before the start month and still unpaid are not dropped:
+    they are reported per org as `overdue` (arrears), outside the monthly
+    columns and outside `total` / `grand_total`.
+    """
+    start = date(start.year, start.month, 1)
+    cache_key = ("collections-forecast", start, months, organization_id, _data_version(db, organization_id))
+    cached = report_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    end = _add_months(start, months)
+    month_labels = [_add_months(start, i).strftime("%Y-%m") for i in range(months)]
+
+    outstanding = model.Repayment.amount_due - func.coalesce(model.Repayment.amount_paid, 0)
+    bucket = month_bucket(db, model.Repayment.due_date)
+
+    query = (
+        db.query(
+            model.Customer.organization_id,
+            model.PartnerOrganization.name,
+            bucket,
+            func.coalesce(func.sum(outstanding), 0),
+        )
+        .select_from(model.Repayment)
+        .join(model.Loan, model.Loan.id == model.Repayment.loan_id)
+        .join(model.LoanApplication, model.LoanApplication.id == model.Loan.application_id)
+        .join(model.Customer, model.Customer.id == model.LoanApplication.customer_id)
+        .join(model.PartnerOrganization, model.PartnerOrganization.id == model.Customer.organization_id)
+        .filter(model.Repayment.is_paid.is_(False))
+        .filter(outstanding > 0)
+        .filter(model.Repayment.due_date < datetime.combine(end, time.min))
+    )
+    if organization_id is not None:
+        query = query.filter(model.Customer.organization_id == organization_id)
+
+    rows = query.group_by(
+        model.Customer.organization_id,
+        model.PartnerOrganization.name,
+        bucket,
+    ).all()
+
+    start_label = start.strftime("%Y-%m")
+    col = {label: i for i, label in enumerate(month_labels)}
+    by_org: Dict[int, Dict[str, Any]] = {}
+    for org_id, org_name, month_value, amount in rows:
+        label = month_label(month_value)
+        i = col.get(label)
+        if i is None and label >= start_label:
+            continue
+        row = by_org.setdefault(
+            org_id,
+            {
+                "organization_id": org_id,
+                "organization_name": org_name,
+                "overdue": Decimal("0.00"),
+                "amounts": [Decimal("0.00")] * months,
+            },
+        )
+        amount = Decimal(str(amount or "0")).quantize(Decimal("0.01"))
+        if i is None:
+            row["overdue"] += amount
+        else:
+            row["amounts"][i] += amount
+
+    items = []
+    totals = [Decimal("0.00")] * months
+    overdue_total = Decimal("0.00")
+    for org_id in sorted(by_org):
+        row = by_org[org_id]
+        row["total"] = sum(row["amounts"], Decimal("0.00"))
+        for i, amt in enumerate(row["amounts"]):
+            totals[i] += amt
+        overdue_total += row["overdue"]
+        items.append(row)
+
+    result = {
+        "start_month": month_labels[0] if month_labels else start_label,
+        "months": month_labels,
+        "rows": items,
+        "overdue_total": overdue_total,
+        "totals": totals,
+        "grand_total": sum(totals, Decimal("0.00")),
+    }
+    report_cache.set(cache_key, result, organization_id)
+    return result
+
+
+def iter_collections_forecast_csv(forecast: Dict[str, Any]):
+    """
+    Yields the forecast matrix as CSV lines (one org per line) for streaming.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def flush() -> str:
+        out = buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+        return out
+
+    writer.writerow(["organization_id", "organization_name", "overdue", *forecast["months"], "total"])
+    yield flush()
+
+    for row in forecast["rows"]:
+        writer.writerow([row["organization_id"], row["organization_name"], row["overdue"], *row["amounts"], row["total"]])
+        yield flush()
+
+    writer.writerow(["", "TOTAL", forecast["overdue_total"], *forecast["totals"], forecast["grand_total"]])
+    yield flush()
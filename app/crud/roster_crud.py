@@ -0,0 +1,295 @@
+# app/crud/roster_crud.py
+"""
+Staff roster import: CSV rows upserted into customers on (organization_id, staff_id).
+
+Per chunk of ROSTER_IMPORT_CHUNK_SIZE rows:
+- one SELECT of the org's customers matching the chunk's staff IDs or BVNs
+- rows are diffed in Python (inserted / updated / unchanged) and checked
+  against BVNs held by other staff
+- one executemany INSERT ... ON CONFLICT DO UPDATE for the new and changed
+  rows, then commit
+Rows that fail validation are reported, never written.
+"""
+
+import csv
+import io
+import re
+import time
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import model
+from ..config import settings
+from ..utils.upsert import dialect_insert
+from .data_version_crud import mark_organization_changed
+
+FIELDS = ("staff_id", "full_name", "bvn", "phone", "email", "net_monthly_salary")
+REQUIRED = ("staff_id", "full_name", "phone", "email", "net_monthly_salary")
+
+HEADER_ALIASES = {
+    "staff_id": "staff_id",
+    "staff_no": "staff_id",
+    "name": "full_name",
+    "full_name": "full_name",
+    "bvn": "bvn",
+    "phone": "phone",
+    "phone_number": "phone",
+    "email": "email",
+    "net_salary": "net_monthly_salary",
+    "net_monthly_salary": "net_monthly_salary",
+    "net_pay": "net_monthly_salary",
+}
+
+_LOCAL_PART = re.compile(r"^[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*$")
+_CENT = Decimal("0.01")
+
+
+class RosterRowError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=256)
+def _normalized_domain(domain: str) -> str:
+    from pydantic.networks import validate_email
+
+    return validate_email(f"x@{domain}")[1].split("@", 1)[1]
+
+
+def _email(value: str) -> str:
+    """
+    Same result as the EmailStr on CustomerOut, without running the full
+    validator per row: plain ASCII local parts are checked here and each
+    domain is validated once; anything else takes the full path.
+    """
+    local, at, domain = value.rpartition("@")
+    try:
+        if at and len(local) <= 64 and _LOCAL_PART.match(local):
+            return f"{local}@{_normalized_domain(domain)}"
+        from pydantic.networks import validate_email
+
+        return validate_email(value)[1]
+    except Exception:
+        raise RosterRowError(f"Invalid email: {value!r}.")
+
+
+def parse_row(raw: Dict[str, str]) -> dict:
+    values = {f: (raw.get(f) or "").strip() for f in FIELDS}
+    missing = [f for f in REQUIRED if not values[f]]
+    if missing:
+        raise RosterRowError(f"Missing {', '.join(missing)}.")
+    for field, limit in (("staff_id", 100), ("full_name", 255), ("phone", 50), ("email", 255)):
+        if len(values[field]) > limit:
+            raise RosterRowError(f"{field} is longer than {limit} characters.")
+    if values["bvn"] and not (len(values["bvn"]) == 11 and values["bvn"].isdigit()):
+        raise RosterRowError("BVN must be 11 digits.")
+    try:
+        salary = Decimal(values["net_monthly_salary"].replace(",", "")).quantize(_CENT)
+    except InvalidOperation:
+        raise RosterRowError(f"Invalid net salary: {values['net_monthly_salary']!r}.")
+    if salary <= 0:
+        raise RosterRowError("Net salary must be positive.")
+
+    values["net_monthly_salary"] = salary
+    values["email"] = _email(values["email"])
+    values["bvn"] = values["bvn"] or None
+    return values
+
+
+def _header_map(header: List[str]) -> Dict[int, str]:
+    mapping = {}
+    for i, name in enumerate(header):
+        key = re.sub(r"[\s-]+", "_", name.strip().lower())
+        field = HEADER_ALIASES.get(key)
+        if field and field not in mapping.values():
+            mapping[i] = field
+    missing = [f for f in REQUIRED if f not in mapping.values()]
+    if missing:
+        raise ValueError(f"Roster is missing columns: {', '.join(missing)}.")
+    return mapping
+
+
+def _same(existing, row: dict) -> bool:
+    return (
+        existing.full_name == row["full_name"]
+        and existing.email == row["email"]
+        and existing.phone == row["phone"]
+        and existing.bvn == row["bvn"]
+        and Decimal(str(existing.net_monthly_salary)).quantize(_CENT) == row["net_monthly_salary"]
+    )
+
+
+class _Import:
+    def __init__(self, db: Session, organization_id: int):
+        self.db = db
+        self.organization_id = organization_id
+        self.summary = {
+            "organization_id": organization_id,
+            "rows": 0,
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "rejected": 0,
+            "errors": [],
+        }
+
+    def reject(self, line: int, staff_id: Optional[str], reason: str) -> None:
+        self.summary["rejected"] += 1
+        if len(self.summary["errors"]) < settings.ROSTER_IMPORT_MAX_ERRORS:
+            self.summary["errors"].append({"line": line, "staff_id": staff_id, "reason": reason})
+
+    def apply_chunk(self, chunk: List[Tuple[int, dict]]) -> None:
+        """
+        Read-then-write, so a concurrent write (another import, a public
+        application) can still take a BVN between the two and trip
+        ux_customers_org_bvn. The chunk is then rolled back and planned again
+        against the new state; if it fails twice its rows are rejected.
+        """
+        for attempt in range(2):
+            counts, rejects, writes = self._plan(chunk)
+            try:
+                if writes:
+                    self._write(writes)
+                    self.db.commit()
+            except IntegrityError:
+                self.db.rollback()
+                continue
+            for key, n in counts.items():
+                self.summary[key] += n
+            for line, staff_id, reason in rejects:
+                self.reject(line, staff_id, reason)
+            return
+        for line, row in chunk:
+            self.reject(line, row["staff_id"], "Conflicting concurrent update of this BVN or staff ID; row not imported.")
+
+    def _plan(self, chunk: List[Tuple[int, dict]]):
+        customers = model.Customer.__table__
+        staff_ids = [row["staff_id"] for _, row in chunk]
+        bvns = [row["bvn"] for _, row in chunk if row["bvn"]]
+
+        existing_by_staff = {}
+        staff_by_bvn = {}
+        found = self.db.execute(
+            select(
+                customers.c.staff_id,
+                customers.c.full_name,
+                customers.c.email,
+                customers.c.phone,
+                customers.c.bvn,
+                customers.c.net_monthly_salary,
+            ).where(
+                customers.c.organization_id == self.organization_id,
+                or_(customers.c.staff_id.in_(staff_ids), customers.c.bvn.in_(bvns)),
+            )
+        )
+        for c in found:
+            existing_by_staff[c.staff_id] = c
+            if c.bvn:
+                staff_by_bvn[c.bvn] = c.staff_id
+
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        rejects = []
+        writes = []
+        for line, row in chunk:
+            existing = existing_by_staff.get(row["staff_id"])
+            bvn = row["bvn"]
+            if existing is not None and bvn is None:
+                # a blank BVN keeps the one on file
+                bvn = existing.bvn
+            owner = staff_by_bvn.get(bvn) if bvn else None
+            if owner is not None and owner != row["staff_id"]:
+                rejects.append((line, row["staff_id"], f"BVN is already registered to staff {owner}."))
+                continue
+            row = dict(row, bvn=bvn)
+            if existing is None:
+                counts["inserted"] += 1
+            elif _same(existing, row):
+                counts["unchanged"] += 1
+                continue
+            else:
+                counts["updated"] += 1
+            writes.append(dict(row, organization_id=self.organization_id))
+        return counts, rejects, writes
+
+    def _write(self, writes: List[dict]) -> None:
+        customers = model.Customer.__table__
+        stmt = dialect_insert(self.db, customers)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[customers.c.organization_id, customers.c.staff_id],
+            set_={
+                "full_name": stmt.excluded.full_name,
+                "email": stmt.excluded.email,
+                "phone": stmt.excluded.phone,
+                "bvn": stmt.excluded.bvn,
+                "net_monthly_salary": stmt.excluded.net_monthly_salary,
+            },
+        )
+        self.db.execute(stmt, writes)
+
+
+def import_roster(db: Session, organization_id: int, lines: Iterable[str]) -> dict:
+    """
+    Streams CSV lines (header first) into the org's customers and returns the
+    diff summary. Raises ValueError if the header lacks a required column.
+    """
+    started = time.perf_counter()
+    job = _Import(db, organization_id)
+    chunk_size = max(settings.ROSTER_IMPORT_CHUNK_SIZE, 1)
+
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        raise ValueError("Roster is empty.")
+    mapping = _header_map(header)
+
+    seen_staff: Dict[str, int] = {}
+    seen_bvn: Dict[str, int] = {}
+    chunk: List[Tuple[int, dict]] = []
+    for raw in reader:
+        line = reader.line_num
+        if not any(cell.strip() for cell in raw):
+            continue
+        job.summary["rows"] += 1
+        fields = {mapping[i]: cell for i, cell in enumerate(raw) if i in mapping}
+        try:
+            row = parse_row(fields)
+        except RosterRowError as e:
+            job.reject(line, (fields.get("staff_id") or "").strip() or None, str(e))
+            continue
+
+        first = seen_staff.setdefault(row["staff_id"], line)
+        if first != line:
+            job.reject(line, row["staff_id"], f"Duplicate staff_id (first on line {first}).")
+            continue
+        if row["bvn"]:
+            first = seen_bvn.setdefault(row["bvn"], line)
+            if first != line:
+                job.reject(line, row["staff_id"], f"Duplicate BVN (first on line {first}).")
+                continue
+
+        chunk.append((line, row))
+        if len(chunk) >= chunk_size:
+            job.apply_chunk(chunk)
+            chunk = []
+    if chunk:
+        job.apply_chunk(chunk)
+
+    if job.summary["inserted"] or job.summary["updated"]:
+        mark_organization_changed(db, organization_id)
+    job.summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return job.summary
+
+
+def import_roster_file(db: Session, organization_id: int, fileobj: BinaryIO) -> dict:
+    """
+    Uploaded file (UTF-8, optional BOM) -> import_roster, read line by line.
+    """
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        return import_roster(db, organization_id, text)
+    finally:
+        text.detach()
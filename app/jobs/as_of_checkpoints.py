@@ -0,0 +1,24 @@
+# app/jobs/as_of_checkpoints.py
+
+from datetime import datetime
+from typing import Optional
+
+from ..db import SessionLocal
+from ..crud import as_of_crud
+
+
+def checkpoint_time(now: Optional[datetime] = None) -> datetime:
+    """
+    Checkpoints are taken at UTC midnight so late-committing events from the
+    current day never fall behind an already-written checkpoint.
+    """
+    now = now or datetime.utcnow()
+    return datetime(now.year, now.month, now.day)
+
+
+def run_once() -> int:
+    db = SessionLocal()
+    try:
+        return as_of_crud.create_checkpoints(db, checkpoint_time())
+    finally:
+        db.close()
@@ -0,0 +1,70 @@
+# app/jobs/catalogue_listener.py
+
+import logging
+import select
+import threading
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+
+from ..utils.catalogue_cache import CatalogueCache
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogueListener:
+    """
+    LISTENs on the catalogue cache channel (PostgreSQL + psycopg2) on a daemon
+    thread and applies other workers' invalidations to this process's cache.
+
+    The cache is cleared whenever the listening connection is (re)established,
+    since messages sent while it was down are lost.
+    """
+
+    def __init__(self, engine: Engine, channel: str, cache: CatalogueCache, reconnect_seconds: float = 5.0):
+        self.engine = engine
+        self.channel = channel
+        self.cache = cache
+        self.reconnect_seconds = reconnect_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="job-catalogue-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Catalogue listener lost its connection")
+            self._stop.wait(self.reconnect_seconds)
+
+    def _listen(self) -> None:
+        pooled = self.engine.raw_connection()
+        # a LISTEN connection is held for the worker's lifetime; keep it out of the pool
+        pooled.detach()
+        conn = pooled.driver_connection
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f'LISTEN "{self.channel}"')
+            self.cache.clear()
+
+            while not self._stop.is_set():
+                if not select.select([conn], [], [], 1.0)[0]:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self.cache.apply(conn.notifies.pop(0).payload)
+        finally:
+            pooled.close()
@@ -0,0 +1,12 @@
+# app/jobs/cohort_refresh.py
+
+from ..db import SessionLocal
+from ..crud import cohort_crud
+
+
+def run_once() -> dict:
+    db = SessionLocal()
+    try:
+        return cohort_crud.refresh_cohorts(db)
+    finally:
+        db.close()
@@ -0,0 +1,76 @@
+# app/jobs/month_close.py
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional, Tuple
+
+from ..config import settings
+from ..db import SessionLocal
+from .. import model
+from ..crud import report_artifact_crud
+
+logger = logging.getLogger(__name__)
+
+
+def previous_month(now: Optional[datetime] = None) -> Tuple[int, int]:
+    now = now or datetime.utcnow()
+    if now.month == 1:
+        return now.year - 1, 12
+    return now.year, now.month - 1
+
+
+def _build_one(organization_id: int, year: int, month: int) -> dict:
+    db = SessionLocal()
+    try:
+        return report_artifact_crud.build_artifact(db, organization_id, year, month)
+    finally:
+        db.close()
+
+
+def run_month_close(year: int, month: int, max_workers: Optional[int] = None) -> dict:
+    """
+    Builds org-monthly-v2 artifacts for every active organization, one org per
+    task across a process pool. Orgs whose artifact is already current are skipped.
+    """
+    db = SessionLocal()
+    try:
+        org_ids = [
+            org_id
+            for (org_id,) in db.query(model.PartnerOrganization.id)
+            .filter(model.PartnerOrganization.is_active.is_(True))
+            .order_by(model.PartnerOrganization.id.asc())
+            .all()
+        ]
+    finally:
+        db.close()
+
+    summary = {"year": year, "month": month, "organizations": len(org_ids), "stored": 0, "failed": []}
+    if not org_ids:
+        return summary
+
+    workers = max(1, min(max_workers or settings.MONTH_CLOSE_WORKERS, len(org_ids)))
+    # spawn, not fork: this runs inside a threaded server (request threadpool or
+    # the PeriodicJob thread), and a forked child can inherit locks held by other
+    # threads (logging, the pool, metrics). Spawned workers import app.db fresh.
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+        futures = {
+            org_id: pool.submit(_build_one, org_id, year, month)
+            for org_id in org_ids
+        }
+        for org_id, fut in futures.items():
+            try:
+                if fut.result()["stored"]:
+                    summary["stored"] += 1
+            except Exception:
+                logger.exception("Month close failed for organization %s (%s-%02d)", org_id, year, month)
+                summary["failed"].append(org_id)
+
+    return summary
+
+
+def run_once() -> dict:
+    year, month = previous_month()
+    return run_month_close(year, month)
@@ -0,0 +1,85 @@
+# app/jobs/scheduler.py
+
+import logging
+import threading
+import zlib
+from typing import Callable, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+def advisory_lock_key(name: str) -> int:
+    """
+    Stable 32-bit key for pg advisory locks (the same in every process).
+    """
+    return zlib.crc32(f"job:{name}".encode())
+
+
+def run_exclusively(engine, name: str, func: Callable[[], object]) -> bool:
+    """
+    Runs func unless another process is running the job of the same name.
+
+    Every gunicorn worker starts the same jobs; on PostgreSQL each run first
+    takes pg_try_advisory_lock on its own connection and the workers that do
+    not get it skip the tick. The lock is session-level, so it is held for the
+    whole run without an open transaction and goes away if the process dies.
+    Other dialects (SQLite, single process) just run. Returns whether func ran.
+    """
+    if engine.dialect.name != "postgresql":
+        func()
+        return True
+
+    key = advisory_lock_key(name)
+    with engine.connect() as conn:
+        acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar()
+        conn.commit()
+        if not acquired:
+            logger.debug("Periodic job %s is running elsewhere; skipping this tick", name)
+            return False
+        try:
+            func()
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+            conn.commit()
+    return True
+
+
+class PeriodicJob:
+    """
+    Runs func every interval_seconds on a daemon thread.
+    Errors are logged and the job keeps running on the next tick.
+    With an engine, a run only happens in the one process holding the job's
+    advisory lock (see run_exclusively).
+    """
+
+    def __init__(self, name: str, interval_seconds: int, func: Callable[[], object], engine=None):
+        self.name = name
+        self.interval_seconds = max(int(interval_seconds), 1)
+        self.func = func
+        self.engine = engine
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=f"job-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                if self.engine is None:
+                    self.func()
+                else:
+                    run_exclusively(self.engine, self.name, self.func)
+            except Exception:
+                logger.exception("Periodic job %s failed", self.name)
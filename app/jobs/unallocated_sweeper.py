@@ -0,0 +1,32 @@
+# app/jobs/unallocated_sweeper.py
+
+import logging
+
+from ..config import settings
+from ..db import SessionLocal
+from ..crud import repayment_crud
+
+logger = logging.getLogger(__name__)
+
+
+def run_once() -> dict:
+    """
+    One bounded sweeper pass with its own session (used by the background job).
+    """
+    db = SessionLocal()
+    try:
+        result = repayment_crud.run_unallocated_sweep(
+            db,
+            max_orgs=settings.UNALLOCATED_SWEEP_MAX_ORGS,
+            max_allocations=settings.UNALLOCATED_SWEEP_MAX_ALLOCATIONS,
+        )
+    finally:
+        db.close()
+
+    if result["allocations_made"]:
+        logger.info(
+            "Unallocated sweep applied %s across %s allocation(s)",
+            result["total_applied"],
+            result["allocations_made"],
+        )
+    return result
@@ -1,70 +1,182 @@
 # app/main.py
+#
+# Schema changes go through Alembic (alembic upgrade head); nothing here
+# touches the database at import or startup.
+#
+#   uvicorn app.main:app
+#   uvicorn --factory app.main:create_app
+
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.db import Base, engine
-
-from app.routers import auth as auth_router_module
-from app.routers import user as user_router_module
-
-from app.routers import (
-    organization_router,
-    loan_product_router,
-    loan_link_router,
-    customer_router,
-    loan_application_router,
-    loan_router,
-    repayment_router,
-    disbursement,
-    report_router,
-    remittance_accounts,
-    remittance,
-    partner_auth,
-    partner_dashboard,
-    dashboard,
-    partner,
-    admin_remittance,
-)
-
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="NUN MFB Salary-Based Loan API",
-    version="1.0.0",
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins_list(),
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-app.include_router(auth_router_module.router)
-app.include_router(user_router_module.router)
-app.include_router(admin_remittance.router)
-app.include_router(partner_auth.router)
-app.include_router(partner_dashboard.router)
-app.include_router(partner.router)
-app.include_router(remittance_accounts.router)
-app.include_router(remittance.router)
-app.include_router(organization_router)
-app.include_router(loan_product_router)
-app.include_router(loan_link_router)
-app.include_router(customer_router)
-app.include_router(loan_application_router)
-app.include_router(loan_router)
-app.include_router(repayment_router)
-app.include_router(disbursement.router)
-app.include_router(report_router.router)
-app.include_router(dashboard.router)
-
-
-
-@app.get("/")
-def root():
-    return {"status": "ok", "service": "NUN MFB Salary-Based Loan API"}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.db import engine
+    from app.jobs.scheduler import PeriodicJob
+    from app.jobs import unallocated_sweeper, as_of_checkpoints, cohort_refresh, month_close
+
+    # every worker starts these; the job's advisory lock lets one of them run each tick
+    jobs = []
+    if settings.UNALLOCATED_SWEEP_ENABLED:
+        jobs.append(
+            PeriodicJob(
+                "unallocated-sweep",
+                settings.UNALLOCATED_SWEEP_INTERVAL_SECONDS,
+                unallocated_sweeper.run_once,
+                engine=engine,
+            )
+        )
+    if settings.AS_OF_CHECKPOINT_ENABLED:
+        jobs.append(
+            PeriodicJob(
+                "as-of-checkpoints",
+                settings.AS_OF_CHECKPOINT_INTERVAL_SECONDS,
+                as_of_checkpoints.run_once,
+                engine=engine,
+            )
+        )
+    if settings.COHORT_REFRESH_ENABLED:
+        jobs.append(
+            PeriodicJob(
+                "cohort-refresh",
+                settings.COHORT_REFRESH_INTERVAL_SECONDS,
+                cohort_refresh.run_once,
+                engine=engine,
+            )
+        )
+    if settings.MONTH_CLOSE_ENABLED:
+        jobs.append(
+            PeriodicJob(
+                "month-close",
+                settings.MONTH_CLOSE_INTERVAL_SECONDS,
+                month_close.run_once,
+                engine=engine,
+            )
+        )
+
+    if settings.CATALOGUE_CACHE_NOTIFY_ENABLED:
+        if engine.dialect.name == "postgresql":
+            from app.jobs.catalogue_listener import CatalogueListener
+            from app.utils.catalogue_cache import catalogue_cache
+
+            jobs.append(CatalogueListener(engine, settings.CATALOGUE_CACHE_NOTIFY_CHANNEL, catalogue_cache))
+
+    for job in jobs:
+        job.start()
+    yield
+    for job in jobs:
+        job.stop()
+
+
+def _include_routers(app: FastAPI) -> None:
+    from app.routers import auth as auth_router_module
+    from app.routers import user as user_router_module
+
+    from app.routers import (
+        organization_router,
+        loan_product_router,
+        loan_link_router,
+        customer_router,
+        loan_application_router,
+        loan_router,
+        repayment_router,
+        disbursement,
+        report_router,
+        remittance_accounts,
+        remittance,
+        partner_auth,
+        partner_dashboard,
+        dashboard,
+        partner,
+        admin_remittance,
+    )
+
+    app.include_router(auth_router_module.router)
+    app.include_router(user_router_module.router)
+    app.include_router(admin_remittance.router)
+    app.include_router(partner_auth.router)
+    app.include_router(partner_dashboard.router)
+    app.include_router(partner.router)
+    app.include_router(remittance_accounts.router)
+    app.include_router(remittance.router)
+    app.include_router(organization_router)
+    app.include_router(loan_product_router)
+    app.include_router(loan_link_router)
+    app.include_router(customer_router)
+    app.include_router(loan_application_router)
+    app.include_router(loan_router)
+    app.include_router(repayment_router)
+    app.include_router(disbursement.router)
+    app.include_router(report_router.router)
+    app.include_router(dashboard.router)
+
+
+def create_app() -> FastAPI:
+    """
+    Builds the application: middleware, routers and the health/metrics routes.
+    Router modules (and everything they pull in) are imported here, not at
+    module import, so tooling that only needs settings stays cheap.
+    """
+    from app.db import engine
+    from app.utils.admission import AdmissionControlMiddleware
+    from app.utils import sql_instrumentation
+    from app.utils.request_metrics import RequestMetricsMiddleware
+    from app.metrics import registry, register_pool_metrics
+
+    app = FastAPI(
+        title="NUN MFB Salary-Based Loan API",
+        version="1.0.0",
+        lifespan=lifespan,
+    )
+
+    if settings.SQL_INSTRUMENTATION_ENABLED:
+        sql_instrumentation.install(engine)
+        app.add_middleware(sql_instrumentation.SQLInstrumentationMiddleware)
+
+    # added before CORS so CORS stays outermost and 429/503 responses still carry CORS headers
+    if settings.ADMISSION_CONTROL_ENABLED:
+        app.add_middleware(AdmissionControlMiddleware)
+
+    # outside admission control so queueing time shows up in the latency histogram
+    if settings.METRICS_ENABLED:
+        register_pool_metrics(engine)
+        app.add_middleware(RequestMetricsMiddleware)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins_list(),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["ETag", "X-Next-Cursor", "Server-Timing"],
+    )
+
+    _include_routers(app)
+
+    @app.get("/")
+    def root():
+        return {"status": "ok", "service": "NUN MFB Salary-Based Loan API"}
+
+    if settings.METRICS_ENABLED:
+
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics():
+            # async: scrapes run on the event loop and never wait for a threadpool slot
+            return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+    return app
+
+
+def __getattr__(name: str):
+    # `app.main:app` keeps working: the module-level app is built on first access
+    if name == "app":
+        app = create_app()
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,335 @@
+# app/metrics.py
+
+import itertools
+import threading
+import weakref
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelKey = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _ShardHolder:
+    __slots__ = ("values", "__weakref__")
+
+    def __init__(self):
+        self.values: dict = {}
+
+
+class _Sharded:
+    """
+    Per-thread value maps: each thread only ever writes its own dict, so the
+    hot path takes no lock. Readers merge a snapshot of all shards.
+
+    When a thread exits (anyio retires idle workers), its shard is folded into
+    a base map, so the shard count tracks live threads, not threads ever seen.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: Dict[int, dict] = {}
+        self._base: dict = {}
+        self._shards_lock = threading.Lock()
+        self._next_token = itertools.count()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.holder.values
+        except AttributeError:
+            holder = _ShardHolder()
+            token = next(self._next_token)
+            with self._shards_lock:
+                self._shards[token] = holder.values
+            # the thread-local (and so the holder) is dropped when the thread ends
+            weakref.finalize(holder, self._retire, token, holder.values)
+            self._local.holder = holder
+            return holder.values
+
+    def _retire(self, token: int, values: dict) -> None:
+        with self._shards_lock:
+            self._shards.pop(token, None)
+            for k, v in list(values.items()):
+                old = self._base.get(k)
+                # new objects rather than in-place updates: readers may hold the old ones
+                self._base[k] = v if old is None else self._combine(old, v)
+
+    def _combine(self, a, b):
+        raise NotImplementedError
+
+    def _snapshot(self) -> List[List[tuple]]:
+        with self._shards_lock:
+            shards = list(self._shards.values())
+            base = list(self._base.items())
+        # list(dict.items()) runs in C, so it cannot see a half-inserted key
+        return [base] + [list(s.items()) for s in shards]
+
+    def shard_count(self) -> int:
+        with self._shards_lock:
+            return len(self._shards)
+
+
+def _key(labelnames: Tuple[str, ...], labels: dict) -> LabelKey:
+    return tuple(str(labels.get(n, "")) for n in labelnames)
+
+
+class Counter(_Sharded):
+    """
+    Monotonic counter with optional labels (label values are passed as kwargs).
+    """
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        super().__init__()
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        shard = self._shard()
+        key = _key(self.labelnames, labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def _combine(self, a: float, b: float) -> float:
+        return a + b
+
+    def _merged(self) -> Dict[LabelKey, float]:
+        merged: Dict[LabelKey, float] = {}
+        for items in self._snapshot():
+            for k, v in items:
+                merged[k] = merged.get(k, 0) + v
+        return merged
+
+    def value(self, **labels) -> float:
+        return self._merged().get(_key(self.labelnames, labels), 0)
+
+    def samples(self) -> List[Tuple[Dict[str, str], float]]:
+        return [(dict(zip(self.labelnames, k)), v) for k, v in self._merged().items()]
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_labels(labels)} {_num(v)}" for labels, v in self.samples()]
+
+
+class Histogram(_Sharded):
+    """
+    Cumulative-bucket histogram (Prometheus semantics). Per shard and label set
+    the state is [count per bucket..., +Inf count, sum].
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__()
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        shard = self._shard()
+        key = _key(self.labelnames, labels)
+        state = shard.get(key)
+        if state is None:
+            state = [0] * (len(self.buckets) + 1) + [0.0]
+            shard[key] = state
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def _combine(self, a: list, b: list) -> list:
+        return [x + y for x, y in zip(a, b)]
+
+    def _merged(self) -> Dict[LabelKey, list]:
+        merged: Dict[LabelKey, list] = {}
+        for items in self._snapshot():
+            for k, state in items:
+                acc = merged.setdefault(k, [0] * (len(self.buckets) + 1) + [0.0])
+                for i, v in enumerate(list(state)):
+                    acc[i] += v
+        return merged
+
+    def count(self, **labels) -> int:
+        state = self._merged().get(_key(self.labelnames, labels))
+        return sum(state[:-1]) if state else 0
+
+    def render(self) -> List[str]:
+        lines = []
+        for k, state in self._merged().items():
+            labels = dict(zip(self.labelnames, k))
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else _num(bound)
+                lines.append(f"{self.name}_bucket{_labels({**labels, 'le': le})} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {_num(state[-1])}")
+            lines.append(f"{self.name}_count{_labels(labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """
+    Gauge read at scrape time: fn returns a number, or a list of (labels, value).
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, fn: Callable, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+
+    def samples(self) -> List[Tuple[Dict[str, str], float]]:
+        value = self.fn()
+        if value is None:
+            return []
+        if isinstance(value, (int, float)):
+            return [({}, value)]
+        return list(value)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_labels(labels)} {_num(v)}" for labels, v in self.samples()]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _num(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+
+    def _get_or_create(self, name: str, factory: Callable):
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is None:
+                existing = factory()
+                self._metrics[name] = existing
+            return existing
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(name, help_text, labelnames, buckets))
+
+    def gauge(self, name: str, help_text: str, fn: Callable, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get_or_create(name, lambda: Gauge(name, help_text, fn, labelnames))
+
+    def collect(self) -> List[object]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        lines: List[str] = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {_escape(metric.help_text)}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+SINGLE_FLIGHT_REQUESTS = registry.counter(
+    "single_flight_requests_total",
+    "Coalesced report requests by outcome (hit = recent result, coalesced = joined an in-flight call, computed = ran the query).",
+    ("endpoint", "outcome"),
+)
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template, including admission queueing.",
+    ("method", "route", "status"),
+)
+
+REMITTANCES_INGESTED = registry.counter(
+    "remittances_ingested_total",
+    "Inbound remittance transactions recorded (source = bank ingest or partner remit).",
+    ("source",),
+)
+
+ALLOCATIONS_MADE = registry.counter(
+    "allocations_made_total",
+    "Installment allocations written (path = inline on ingest or unallocated sweep).",
+    ("path",),
+)
+
+AMOUNT_APPLIED = registry.counter(
+    "remittance_amount_applied_total",
+    "Naira applied to installments.",
+    ("path",),
+)
+
+DISBURSEMENTS = registry.counter(
+    "disbursements_total",
+    "Loan disbursements completed.",
+)
+
+DISBURSED_AMOUNT = registry.counter(
+    "disbursed_amount_total",
+    "Naira disbursed.",
+)
+
+ALLOCATION_DURATION = registry.histogram(
+    "allocation_duration_seconds",
+    "Time to allocate one remittance or sweep pass, by open installments considered.",
+    ("path", "org_size"),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+def org_size_bucket(open_installments: int) -> str:
+    if open_installments < 100:
+        return "lt100"
+    if open_installments < 1000:
+        return "lt1k"
+    if open_installments < 10000:
+        return "lt10k"
+    return "10k+"
+
+
+def register_pool_metrics(engine) -> None:
+    """
+    DB pool gauges, read from engine.pool at scrape time (pools without
+    QueuePool counters, e.g. SQLite in-memory, report nothing).
+    """
+    def reader(attr: str) -> Callable[[], Optional[float]]:
+        def read():
+            fn = getattr(engine.pool, attr, None)
+            return fn() if callable(fn) else None
+        return read
+
+    registry.gauge("db_pool_size", "Configured pool size.", reader("size"))
+    registry.gauge("db_pool_checked_out", "Connections currently checked out.", reader("checkedout"))
+    registry.gauge("db_pool_checked_in", "Idle connections in the pool.", reader("checkedin"))
+    registry.gauge("db_pool_overflow", "Connections open beyond pool size (negative = unused overflow).", reader("overflow"))
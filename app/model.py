@@ -14,6 +14,8 @@ from sqlalchemy import (
     Numeric,
     Text,
     Float,
+    Index,
+    LargeBinary,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy import Enum as SqlEnum
@@ -82,7 +84,12 @@ class CompanyLoanLink(Base):
 
     is_active = Column(Boolean, default=True)
     expires_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_company_loan_links_created_id", "created_at", "id"),
+        Index("ix_company_loan_links_org_created_id", "organization_id", "created_at", "id"),
+    )
 
     organization = relationship("PartnerOrganization", back_populates="loan_links")
     product = relationship("LoanProduct", back_populates="company_links")
@@ -122,11 +129,18 @@ class Customer(Base):
     bvn = Column(String(11), nullable=True)
 
     net_monthly_salary = Column(Numeric(12, 2), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     nun_account_number = Column(String(20), nullable=True, unique=True, index=True)
     account_balance = Column(Numeric(12, 2), nullable=False, default=0)
 
+    __table_args__ = (
+        Index("ix_customers_created_id", "created_at", "id"),
+        # public applications and roster imports upsert on (organization_id, staff_id)
+        Index("ux_customers_org_staff", "organization_id", "staff_id", unique=True),
+        Index("ux_customers_org_bvn", "organization_id", "bvn", unique=True),
+    )
+
     organization = relationship("PartnerOrganization", back_populates="customers")
     applications = relationship("LoanApplication", back_populates="customer")
     disbursements = relationship("Disbursement", back_populates="customer")
@@ -153,6 +167,10 @@ class LoanProduct(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index("ix_loan_products_created_id", "created_at", "id"),
+    )
+
     applications = relationship("LoanApplication", back_populates="product", cascade="all, delete-orphan")
     loans = relationship("Loan", back_populates="product", cascade="all, delete-orphan")
     company_links = relationship("CompanyLoanLink", back_populates="product")
@@ -178,9 +196,23 @@ class LoanApplication(Base):
 
     officer_comment = Column(Text, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # work queue: lower priority is served first, then oldest; a claim is a
+    # lease that lapses at claim_expires_at
+    priority = Column(Integer, nullable=False, default=100, server_default="100")
+    claimed_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    claim_expires_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_loan_applications_created_id", "created_at", "id"),
+        Index("ix_loan_applications_status_created_id", "status", "created_at", "id"),
+        Index("ix_loan_applications_customer_status", "customer_id", "status"),
+        Index("ix_loan_applications_queue", "status", "priority", "created_at", "id"),
+        Index("ix_loan_applications_claimed_by", "claimed_by_id"),
+    )
+
     customer = relationship("Customer", back_populates="applications")
     product = relationship("LoanProduct", back_populates="applications")
     link = relationship("CompanyLoanLink", back_populates="applications")
@@ -212,7 +244,12 @@ class Loan(Base):
     disbursed_at = Column(DateTime, nullable=True)
     disbursement_reference = Column(String(50), nullable=True, unique=True, index=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_loans_created_id", "created_at", "id"),
+        Index("ix_loans_status_created_id", "status", "created_at", "id"),
+    )
 
     application = relationship("LoanApplication", back_populates="loan")
     product = relationship("LoanProduct", back_populates="loans")
@@ -236,7 +273,7 @@ class Repayment(Base):
     is_paid = Column(Boolean, default=False)
     paid_at = Column(DateTime, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     loan = relationship("Loan", back_populates="repayments")
 
@@ -388,3 +425,193 @@ class TransactionAllocation(Base):
 
     transaction = relationship("InboundTransaction", back_populates="allocations")
     repayment = relationship("Repayment", back_populates="allocations")
+
+
+
+class JournalEntryType(str, enum.Enum):
+    DISBURSEMENT_CREDIT = "DISBURSEMENT_CREDIT"
+    REPAYMENT_DEBIT = "REPAYMENT_DEBIT"
+    REVERSAL = "REVERSAL"
+    OPENING = "OPENING"
+
+
+class JournalEntry(Base):
+    """
+    Append-only double-entry journal for customer accounts.
+    - every entry has postings that sum to zero
+    - rows are never updated/deleted; corrections are REVERSAL entries
+    """
+    __tablename__ = "journal_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    entry_type = Column(SqlEnum(JournalEntryType), nullable=False)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False, index=True)
+    disbursement_id = Column(Integer, ForeignKey("disbursements.id"), nullable=True, index=True)
+    reverses_entry_id = Column(Integer, ForeignKey("journal_entries.id"), nullable=True, unique=True)
+
+    reference = Column(String(60), nullable=True, unique=True, index=True)
+    narration = Column(String(255), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    postings = relationship("JournalPosting", back_populates="entry", cascade="all, delete-orphan")
+
+
+class JournalPosting(Base):
+    """
+    One leg of a JournalEntry. amount is signed (+ credit / - debit).
+    Customer-account legs carry balance_after: the running balance snapshot that
+    makes point-in-time balances a single index seek.
+    """
+    __tablename__ = "journal_postings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entry_id = Column(Integer, ForeignKey("journal_entries.id"), nullable=False, index=True)
+
+    account = Column(String(50), nullable=False)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True)
+
+    amount = Column(Numeric(14, 2), nullable=False)
+    balance_after = Column(Numeric(14, 2), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    entry = relationship("JournalEntry", back_populates="postings")
+
+    __table_args__ = (
+        Index("ix_journal_postings_customer_created", "customer_id", "created_at", "id"),
+    )
+
+
+
+class AllocationEventType(str, enum.Enum):
+    APPLIED = "APPLIED"
+    REVERSED = "REVERSED"
+
+
+class AllocationEvent(Base):
+    """
+    Immutable history of money applied to (+) or taken off (-) an installment.
+    Unlike TransactionAllocation / Repayment.amount_paid, rows here are never
+    updated or deleted, so balances can be rebuilt for any past moment.
+    """
+    __tablename__ = "allocation_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    event_type = Column(SqlEnum(AllocationEventType), nullable=False)
+
+    organization_id = Column(Integer, ForeignKey("partner_organizations.id"), nullable=False)
+    loan_id = Column(Integer, ForeignKey("loans.id"), nullable=False)
+    repayment_id = Column(Integer, ForeignKey("repayments.id"), nullable=False, index=True)
+    transaction_id = Column(Integer, ForeignKey("inbound_transactions.id"), nullable=True, index=True)
+
+    amount = Column(Numeric(14, 2), nullable=False)
+    effective_at = Column(DateTime, nullable=True)
+    occurred_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_allocation_events_org_occurred", "organization_id", "occurred_at", "id"),
+        Index("ix_allocation_events_loan_occurred", "loan_id", "occurred_at", "id"),
+    )
+
+
+class OutstandingCheckpoint(Base):
+    """
+    Periodic per-org totals so as-of queries only replay events after the checkpoint.
+    """
+    __tablename__ = "outstanding_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    organization_id = Column(Integer, ForeignKey("partner_organizations.id"), nullable=False)
+
+    as_of = Column(DateTime, nullable=False)
+    total_scheduled = Column(Numeric(16, 2), nullable=False)
+    total_paid = Column(Numeric(16, 2), nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ux_outstanding_checkpoints_org_as_of", "organization_id", "as_of", unique=True),
+    )
+
+
+
+class CohortPerformance(Base):
+    """
+    Precomputed vintage curve: one row per (disbursement month, months on book).
+    Rebuilt per cohort by cohort_crud.refresh_cohorts.
+    """
+    __tablename__ = "cohort_performance"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    cohort_month = Column(String(7), nullable=False)
+    months_on_book = Column(Integer, nullable=False)
+
+    loans_count = Column(Integer, nullable=False, default=0)
+    disbursed_principal = Column(Numeric(16, 2), nullable=False, default=0)
+
+    expected_amount = Column(Numeric(16, 2), nullable=False, default=0)
+    collected_amount = Column(Numeric(16, 2), nullable=False, default=0)
+    cumulative_expected = Column(Numeric(16, 2), nullable=False, default=0)
+    cumulative_collected = Column(Numeric(16, 2), nullable=False, default=0)
+
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ux_cohort_performance_cohort_mob", "cohort_month", "months_on_book", unique=True),
+    )
+
+
+class CohortRefreshState(Base):
+    """
+    High-water marks of the last cohort refresh (single row).
+    """
+    __tablename__ = "cohort_refresh_state"
+
+    id = Column(Integer, primary_key=True)
+    last_loan_id = Column(Integer, nullable=False, default=0)
+    last_event_id = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime, nullable=True)
+
+
+class OrganizationDataVersion(Base):
+    """
+    Monotonic per-org counter, bumped after every write that changes the org's
+    report data. Stored artifacts are only served while their version is current.
+    """
+    __tablename__ = "organization_data_versions"
+
+    organization_id = Column(Integer, ForeignKey("partner_organizations.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ReportArtifact(Base):
+    """
+    Precomputed org-monthly-v2 report (gzip JSON) written by the month-close job.
+    """
+    __tablename__ = "report_artifacts"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    organization_id = Column(Integer, ForeignKey("partner_organizations.id"), nullable=False)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    data_version = Column(Integer, nullable=False)
+
+    payload = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ux_report_artifacts_org_period_version",
+            "organization_id",
+            "year",
+            "month",
+            "data_version",
+            unique=True,
+        ),
+    )
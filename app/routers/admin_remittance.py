@@ -2,13 +2,17 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 from ..db import get_db
 from .. import model, schema
 from ..security import require_roles
-from ..crud import admin_remittance_crud, repayment_crud
+from ..config import settings
+from ..crud import admin_remittance_crud, repayment_crud, data_version_crud
+from ..utils.etag import make_etag, conditional_response
+from ..utils.fast_json import FastJSONResponse
+from ..utils.sql_instrumentation import query_budget
 
 router = APIRouter(prefix="/admin/remittances", tags=["Admin Remittances"])
 
@@ -16,6 +20,8 @@ router = APIRouter(prefix="/admin/remittances", tags=["Admin Remittances"])
 @router.get("/summary", response_model=schema.AdminRemittanceSummaryOut)
 def org_remittance_summary(
     organization_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user=Depends(
         require_roles(
@@ -31,10 +37,18 @@ def org_remittance_summary(
     if not org:
         raise HTTPException(status_code=404, detail="Partner organization not found.")
 
+    etag = make_etag(
+        "admin-remittance-summary", organization_id, data_version_crud.get_data_version(db, organization_id)
+    )
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
     return admin_remittance_crud.get_org_remittance_summary(db, organization_id)
 
 
 @router.get("/transactions", response_model=schema.AdminRemittanceTransactionsOut)
+@query_budget(5)
 def org_transactions(
     organization_id: int,
     db: Session = Depends(get_db),
@@ -52,7 +66,35 @@ def org_transactions(
     if not org:
         raise HTTPException(status_code=404, detail="Partner organization not found.")
 
-    return admin_remittance_crud.list_org_transactions_with_allocation(db, organization_id)
+    return FastJSONResponse(admin_remittance_crud.list_org_transactions_with_allocation(db, organization_id))
+
+
+@router.post("/simulate", response_model=schema.RemittanceSimulationOut)
+def simulate_remittance(
+    payload: schema.RemittanceSimulateRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(
+        require_roles(
+            [schema.UserRoleEnum.ADMIN, schema.UserRoleEnum.MANAGER, schema.UserRoleEnum.CASHIER]
+        )
+    ),
+):
+    """
+    Dry run: shows how an amount would be spread across the org's open installments.
+    Nothing is written.
+    """
+    org = (
+        db.query(model.PartnerOrganization)
+        .filter(model.PartnerOrganization.id == payload.organization_id)
+        .first()
+    )
+    if not org:
+        raise HTTPException(status_code=404, detail="Partner organization not found.")
+
+    try:
+        return repayment_crud.simulate_org_allocation(db, payload.organization_id, payload.amount)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get(
@@ -132,3 +174,19 @@ def reverse_transaction(
         return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/sweep", status_code=status.HTTP_200_OK)
+def sweep_unallocated(
+    db: Session = Depends(get_db),
+    current_user=Depends(require_roles([schema.UserRoleEnum.ADMIN, schema.UserRoleEnum.MANAGER])),
+):
+    """
+    Runs one unallocated-balance sweep now (same budget as the background sweeper).
+    """
+    result = repayment_crud.run_unallocated_sweep(
+        db,
+        max_orgs=settings.UNALLOCATED_SWEEP_MAX_ORGS,
+        max_allocations=settings.UNALLOCATED_SWEEP_MAX_ALLOCATIONS,
+    )
+    return {"message": "Unallocated sweep completed.", "result": result}
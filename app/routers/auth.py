@@ -1,21 +1,16 @@
-import os
-from pathlib import Path
 from datetime import timedelta
 from typing import Optional
 
-from dotenv import load_dotenv
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
+from ..config import settings
 from ..db import get_db
 from .. import model, schema
 from ..security import verify_password, create_access_token, get_password_hash
 
 
-ENV_PATH = Path(__file__).resolve().parents[2] / ".env"
-load_dotenv(dotenv_path=ENV_PATH, override=True)
-
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
@@ -70,8 +65,7 @@ def bootstrap_admin(
     After you create the admin once, set BOOTSTRAP_ADMIN_ENABLED=false (or remove it).
     """
 
-    enabled = os.getenv("BOOTSTRAP_ADMIN_ENABLED", "false").lower() == "true"
-    if not enabled:
+    if not settings.BOOTSTRAP_ADMIN_ENABLED:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Bootstrap admin is disabled. Enable BOOTSTRAP_ADMIN_ENABLED=true to use this route.",
@@ -1,15 +1,18 @@
 # app/routers/customer.py
 
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
 from sqlalchemy.orm import Session
 
-from .. import schema, model
+from .. import schema
 from ..db import get_db
 from ..crud import customer_crud, organization_crud
 from ..security import require_roles
-from ..crud import loan_application_crud
+from ..utils.pagination import set_next_cursor
+from ..crud import loan_application_crud, ledger_crud, roster_crud
+from ..utils.sql_instrumentation import query_budget
 
 
 router = APIRouter(
@@ -39,15 +42,57 @@ def create_customer(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organization not found.",
         )
-    return customer_crud.create_customer(db, customer_in)
+    if customer_crud.get_customer_by_staff_and_org(db, customer_in.staff_id, customer_in.organization_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=customer_crud.STAFF_ID_TAKEN,
+        )
+    try:
+        return customer_crud.create_customer(db, customer_in)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post(
+    "/roster",
+    response_model=schema.RosterImportOut,
+)
+def import_roster(
+    organization_id: int = Query(...),
+    file: UploadFile = File(..., description="CSV: staff_id, full_name, bvn, phone, email, net_salary"),
+    db: Session = Depends(get_db),
+    current_user=Depends(
+        require_roles([
+            schema.UserRoleEnum.ADMIN,
+            schema.UserRoleEnum.MANAGER,
+            schema.UserRoleEnum.LOAN_OFFICER,
+        ])
+    ),
+):
+    """
+    Upserts an organization's staff roster on staff_id; returns what changed.
+    """
+    if not organization_crud.get_organization(db, organization_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Organization not found.",
+        )
+    try:
+        return roster_crud.import_roster_file(db, organization_id, file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
 @router.get(
     "/",
     response_model=List[schema.CustomerOut],
 )
+@query_budget(4)
 def list_customers(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user=Depends(
         require_roles([
@@ -57,7 +102,13 @@ def list_customers(
         ])
     ),
 ):
-    return customer_crud.list_customers(db, skip=skip, limit=limit)
+    try:
+        customers = customer_crud.list_customers(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    set_next_cursor(response, customers, limit)
+    return customers
 
 
 @router.get(
@@ -87,6 +138,7 @@ def get_customer(
     "/{customer_id}/loans",
     response_model=List[schema.LoanOut],
 )
+@query_budget(4)
 def get_customer_loans(
     customer_id: int,
     db: Session = Depends(get_db),
@@ -102,12 +154,7 @@ def get_customer_loans(
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
 
-    return (
-        db.query(model.Loan)
-        .join(model.LoanApplication)
-        .filter(model.LoanApplication.customer_id == customer_id)
-        .all()
-    )
+    return customer_crud.list_customer_loans(db, customer_id)
 
 
 @router.get(
@@ -160,3 +207,93 @@ def get_customer_loan_history(
         )
 
     return customer_crud.get_customer_loan_history(db, customer_id)
+
+
+@router.get(
+    "/{customer_id}/balance",
+    response_model=schema.CustomerBalanceOut,
+)
+def get_customer_balance(
+    customer_id: int,
+    as_of: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(
+        require_roles([
+            schema.UserRoleEnum.ADMIN,
+            schema.UserRoleEnum.MANAGER,
+            schema.UserRoleEnum.CASHIER,
+        ])
+    ),
+):
+    customer = customer_crud.get_customer(db, customer_id)
+    if not customer:
+        raise HTTPException(status_code=404, detail="Customer not found.")
+
+    return {
+        "customer_id": customer_id,
+        "as_of": as_of,
+        "balance": ledger_crud.get_customer_balance(db, customer_id, as_of=as_of),
+    }
+
+
+@router.get(
+    "/{customer_id}/ledger",
+    response_model=List[schema.JournalPostingOut],
+)
+def get_customer_ledger(
+    customer_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user=Depends(
+        require_roles([
+            schema.UserRoleEnum.ADMIN,
+            schema.UserRoleEnum.MANAGER,
+            schema.UserRoleEnum.CASHIER,
+        ])
+    ),
+):
+    customer = customer_crud.get_customer(db, customer_id)
+    if not customer:
+        raise HTTPException(status_code=404, detail="Customer not found.")
+
+    return ledger_crud.list_customer_postings(db, customer_id, skip=skip, limit=limit)
+
+
+@router.post("/ledger/opening-entries", status_code=status.HTTP_200_OK)
+def backfill_opening_ledger_entries(
+    db: Session = Depends(get_db),
+    current_user=Depends(require_roles([schema.UserRoleEnum.ADMIN])),
+):
+    """
+    One-off: posts an OPENING entry for every customer whose balance predates
+    the journal, so as-of balances and postings add up to account_balance.
+    """
+    written = ledger_crud.backfill_opening_entries(db)
+    return {"message": "Opening entries posted.", "entries_written": written}
+
+
+@router.post(
+    "/{customer_id}/ledger/{entry_id}/reverse",
+    response_model=schema.JournalEntryOut,
+    status_code=status.HTTP_201_CREATED,
+)
+def reverse_customer_ledger_entry(
+    customer_id: int,
+    entry_id: int,
+    reverse_in: schema.JournalReverseRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_roles([schema.UserRoleEnum.ADMIN, schema.UserRoleEnum.MANAGER])),
+):
+    entry = ledger_crud.get_journal_entry(db, entry_id)
+    if not entry or entry.customer_id != customer_id:
+        raise HTTPException(status_code=404, detail="Journal entry not found.")
+
+    try:
+        reversal = ledger_crud.reverse_entry(db, entry, narration=reverse_in.narration)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    db.commit()
+    db.refresh(reversal)
+    return reversal
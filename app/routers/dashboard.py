@@ -1,12 +1,16 @@
 # app/routers/dashboard.py
 
-from fastapi import APIRouter, Depends
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
 from ..db import get_db
 from .. import schema
 from ..security import require_roles
-from ..crud import dashboard_crud
+from ..crud import dashboard_crud, data_version_crud
+from ..utils.etag import make_etag, conditional_response
+from ..utils.single_flight import single_flight
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -15,6 +19,8 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 def dashboard_summary(
     year: int,
     month: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user=Depends(
         require_roles(
@@ -28,5 +34,21 @@ def dashboard_summary(
         )
     ),
 ):
-    data = dashboard_crud.get_dashboard_summary(db=db, year=year, month=month)
-    return data
+    # overdue figures move with the calendar, so the day is part of the tag
+    etag = make_etag(
+        "dashboard-summary",
+        year,
+        month,
+        datetime.utcnow().date(),
+        data_version_crud.get_global_data_version(db),
+    )
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    # the tag already covers params + data version, so it doubles as the coalescing key
+    return single_flight.do(
+        "dashboard-summary",
+        etag,
+        lambda: dashboard_crud.get_dashboard_summary(db=db, year=year, month=month),
+    )
@@ -3,13 +3,15 @@
 from typing import List, Optional
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from .. import schema
 from ..db import get_db
 from ..crud import loan_crud, loan_application_crud, repayment_crud
 from ..security import require_roles
+from ..utils.pagination import set_next_cursor
+from ..utils.sql_instrumentation import query_budget
 
 router = APIRouter(
     prefix="/loans",
@@ -73,11 +75,14 @@ def create_loan(
     "/",
     response_model=List[schema.LoanOut],
 )
+@query_budget(4)
 def list_loans(
+    response: Response,
     status_filter: Optional[str] = None,
     organization_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user=Depends(
         require_roles([
@@ -89,13 +94,20 @@ def list_loans(
         ])
     ),
 ):
-    return loan_crud.list_loans(
-        db,
-        skip=skip,
-        limit=limit,
-        status=status_filter,
-        organization_id=organization_id,
-    )
+    try:
+        loans = loan_crud.list_loans(
+            db,
+            skip=skip,
+            limit=limit,
+            status=status_filter,
+            organization_id=organization_id,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    set_next_cursor(response, loans, limit)
+    return loans
 
 
 @router.get(
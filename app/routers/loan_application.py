@@ -4,7 +4,7 @@ from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session, joinedload
 
 from .. import schema, model
@@ -15,7 +15,10 @@ from ..crud import (
     loan_product_crud,
     loan_link_crud,
 )
+from ..config import settings
 from ..security import require_roles
+from ..utils.pagination import set_next_cursor
+from ..utils.sql_instrumentation import query_budget
 
 router = APIRouter(
     prefix="/loan-applications",
@@ -64,20 +67,109 @@ def create_loan_application(
     "/",
     response_model=List[schema.LoanApplicationOut],
 )
+@query_budget(4)
 def list_loan_applications(
+    response: Response,
     status_filter: Optional[str] = None,
     organization_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
-    return loan_application_crud.list_loan_applications(
-        db,
-        skip=skip,
-        limit=limit,
-        status=status_filter,
-        organization_id=organization_id,
-    )
+    try:
+        applications = loan_application_crud.list_loan_applications(
+            db,
+            skip=skip,
+            limit=limit,
+            status=status_filter,
+            organization_id=organization_id,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    set_next_cursor(response, applications, limit)
+    return applications
+
+
+_QUEUE_ROLES = [
+    schema.UserRoleEnum.ADMIN,
+    schema.UserRoleEnum.LOAN_OFFICER,
+    schema.UserRoleEnum.MANAGER,
+    schema.UserRoleEnum.AUTHORIZER,
+]
+
+
+@router.post(
+    "/queue/claim",
+    response_model=schema.LoanApplicationClaimOut,
+)
+def claim_loan_applications(
+    limit: int = Query(10, ge=1),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_roles(_QUEUE_ROLES)),
+):
+    """
+    Claims the caller's next PENDING applications from the work queue.
+    """
+    limit = min(limit, settings.QUEUE_CLAIM_MAX_BATCH)
+    applications, expires_at = loan_application_crud.claim_applications(db, current_user.id, limit)
+    return {"claim_expires_at": expires_at, "applications": applications}
+
+
+@router.get(
+    "/queue/mine",
+    response_model=List[schema.LoanApplicationOut],
+)
+def my_claimed_loan_applications(
+    db: Session = Depends(get_db),
+    current_user=Depends(require_roles(_QUEUE_ROLES)),
+):
+    return loan_application_crud.list_claimed_applications(db, current_user.id)
+
+
+@router.post("/queue/{application_id}/renew")
+def renew_loan_application_claim(
+    application_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_roles(_QUEUE_ROLES)),
+):
+    try:
+        expires_at = loan_application_crud.renew_claim(db, application_id, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"application_id": application_id, "claim_expires_at": expires_at}
+
+
+@router.post("/queue/{application_id}/release", status_code=status.HTTP_204_NO_CONTENT)
+def release_loan_application_claim(
+    application_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_roles(_QUEUE_ROLES)),
+):
+    try:
+        loan_application_crud.release_claim(db, application_id, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.patch(
+    "/{application_id}/priority",
+    response_model=schema.LoanApplicationOut,
+)
+def set_loan_application_priority(
+    application_id: int,
+    priority_in: schema.LoanApplicationPriorityUpdate,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_roles([schema.UserRoleEnum.ADMIN, schema.UserRoleEnum.MANAGER])),
+):
+    application = db.get(model.LoanApplication, application_id)
+    if not application:
+        raise HTTPException(status_code=404, detail="Loan application not found.")
+    loan_application_crud.set_priority(db, application, priority_in.priority)
+    return loan_application_crud.get_loan_application(db, application_id)
 
 
 @router.get(
@@ -88,20 +180,41 @@ def get_loan_application(
     application_id: int,
     db: Session = Depends(get_db),
 ):
-    application = (
-        db.query(model.LoanApplication)
-        .options(
-            joinedload(model.LoanApplication.customer).joinedload(model.Customer.organization),
-            joinedload(model.LoanApplication.product),
-        )
-        .filter(model.LoanApplication.id == application_id)
-        .first()
-    )
+    application = loan_application_crud.get_loan_application(db, application_id)
     if not application:
         raise HTTPException(status_code=404, detail="Loan application not found.")
     return application
 
 
+@router.post(
+    "/bulk-status",
+    response_model=schema.LoanApplicationBulkStatusOut,
+)
+def bulk_update_loan_application_status(
+    bulk_in: schema.LoanApplicationBulkStatusRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(
+        require_roles(
+            [
+                schema.UserRoleEnum.ADMIN,
+                schema.UserRoleEnum.LOAN_OFFICER,
+                schema.UserRoleEnum.MANAGER,
+                schema.UserRoleEnum.AUTHORIZER,
+            ]
+        )
+    ),
+):
+    """
+    Applies many status decisions; each gets its own result (ok / detail).
+    Applications another officer has claimed fail with the same detail the
+    single endpoint returns as 409.
+    """
+    try:
+        return loan_application_crud.bulk_update_application_status(db, bulk_in.decisions, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.patch(
     "/{application_id}/status",
     response_model=schema.LoanApplicationOut,
@@ -130,32 +243,14 @@ def update_loan_application_status(
     if not application:
         raise HTTPException(status_code=404, detail="Loan application not found.")
 
-    if status_in.status is None:
-        raise HTTPException(status_code=400, detail="Status is required.")
+    error = loan_application_crud.decision_error(status_in)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    error = loan_application_crud.claim_error(application.claimed_by_id, application.claim_expires_at, current_user.id)
+    if error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error)
 
-    
-    if status_in.status == "DISBURSED":
-        raise HTTPException(
-            status_code=400,
-            detail="DISBURSED cannot be set here. Use the disbursement endpoint instead.",
-        )
-
-    allowed = ["PENDING", "UNDER_REVIEW", "APPROVED", "REJECTED"]
-    if status_in.status not in allowed:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid status. Allowed: {allowed}",
-        )
-
-    
     if status_in.status == "APPROVED":
-        if status_in.approved_amount is None:
-            raise HTTPException(
-                status_code=400,
-                detail="approved_amount is required when approving an application.",
-            )
-
-        
         if not application.customer:
             raise HTTPException(status_code=400, detail="Application customer not loaded.")
         customer_crud.ensure_customer_account(db, application.customer, prefix="248")
@@ -184,86 +279,15 @@ def submit_public_loan_application(
     app_in: schema.PublicLoanApplicationCreate,
     db: Session = Depends(get_db),
 ):
-    link = loan_link_crud.get_link_by_token(db, token)
+    link = loan_link_crud.get_public_link(db, token)
     if not link or not link.is_active:
         raise HTTPException(status_code=404, detail="Application link not found or inactive.")
 
     if link.expires_at and link.expires_at < datetime.utcnow():
         raise HTTPException(status_code=400, detail="Application link has expired.")
 
-    customer = None
-
-    if app_in.bvn:
-        customer = (
-            db.query(model.Customer)
-            .filter(
-                model.Customer.bvn == app_in.bvn,
-                model.Customer.organization_id == link.organization_id,
-            )
-            .first()
-        )
-
-    if not customer:
-        customer = (
-            db.query(model.Customer)
-            .filter(
-                model.Customer.staff_id == app_in.staff_id,
-                model.Customer.organization_id == link.organization_id,
-            )
-            .first()
-        )
-
-    if customer:
-        customer.full_name = app_in.full_name
-        customer.email = app_in.email
-        customer.phone = app_in.phone
-        customer.net_monthly_salary = app_in.net_pay
-        customer.bvn = app_in.bvn
-        customer.staff_id = app_in.staff_id
-    else:
-        customer = model.Customer(
-            full_name=app_in.full_name,
-            email=app_in.email,
-            phone=app_in.phone,
-            staff_id=app_in.staff_id,
-            organization_id=link.organization_id,
-            net_monthly_salary=app_in.net_pay,
-            bvn=app_in.bvn,
-        )
-        db.add(customer)
-
-    db.flush()
-
-    existing_active_loan = (
-        db.query(model.Loan)
-        .join(model.LoanApplication)
-        .filter(
-            model.LoanApplication.customer_id == customer.id,
-            model.Loan.status == "ACTIVE",
-        )
-        .first()
-    )
-    if existing_active_loan:
-        raise HTTPException(
-            status_code=400,
-            detail="You already have an active loan. Please complete repayment before applying for a new one.",
-        )
-
-    existing_pending_app = (
-        db.query(model.LoanApplication)
-        .filter(
-            model.LoanApplication.customer_id == customer.id,
-            model.LoanApplication.status.in_(["PENDING", "UNDER_REVIEW"]),
-        )
-        .first()
-    )
-    if existing_pending_app:
-        raise HTTPException(
-            status_code=400,
-            detail="You already have a loan application under review. Please wait for a decision.",
-        )
-
-    product = loan_product_crud.get_loan_product(db, link.product_id)
+    # request-only checks first, so a bad submit never touches the database
+    product = loan_product_crud.get_public_product(db, link.product_id)
     if not product or not product.is_active:
         raise HTTPException(status_code=400, detail="Loan product not available.")
 
@@ -280,18 +304,14 @@ def submit_public_loan_application(
     if app_in.tenor_months <= 0:
         raise HTTPException(status_code=400, detail="Tenor must be at least 1 month.")
 
-    max_by_salary = app_in.net_pay * Decimal(app_in.tenor_months) * Decimal("0.75")
+    max_by_salary = app_in.net_pay * Decimal(app_in.tenor_months) * Decimal(str(settings.MAX_REPAYMENT_TO_SALARY_RATIO))
     if app_in.requested_amount > max_by_salary:
         raise HTTPException(
             status_code=400,
             detail="Requested amount is too high for your salary and tenor. Please reduce amount or increase tenor.",
         )
 
-    application = loan_application_crud.create_loan_application_from_public(
-        db=db,
-        customer=customer,
-        product=product,
-        link=link,
-        app_in=app_in,
-    )
-    return application
+    try:
+        return loan_application_crud.submit_public_application(db, link=link, product=product, app_in=app_in)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -2,13 +2,15 @@
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from .. import schema
 from ..db import get_db
 from ..crud import loan_link_crud, organization_crud, loan_product_crud
 from ..security import require_roles
+from ..utils.pagination import set_next_cursor
+from ..utils.sql_instrumentation import query_budget
 
 router = APIRouter(
     prefix="/loan-links",
@@ -67,11 +69,14 @@ def create_company_loan_link(
     "/",
     response_model=List[schema.CompanyLoanLinkOut],
 )
+@query_budget(4)
 def list_company_loan_links(
+    response: Response,
     organization_id: Optional[int] = None,
     product_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_admin=Depends(
         require_roles([
@@ -83,14 +88,22 @@ def list_company_loan_links(
 ):
     """
     List company loan links, optionally filtered by organization or product.
+    Newest first; pass the X-Next-Cursor header value as `cursor` for the next page.
     """
-    return loan_link_crud.list_links(
-        db,
-        organization_id=organization_id,
-        product_id=product_id,
-        skip=skip,
-        limit=limit,
-    )
+    try:
+        links = loan_link_crud.list_links(
+            db,
+            organization_id=organization_id,
+            product_id=product_id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    set_next_cursor(response, links, limit)
+    return links
 
 
 @router.get(
@@ -143,7 +156,7 @@ def get_public_company_loan_link_by_token(
     token: str,
     db: Session = Depends(get_db),
 ):
-    link = loan_link_crud.get_link_by_token(db, token)
+    link = loan_link_crud.get_public_link(db, token)
     if not link:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -164,6 +177,6 @@ def get_public_company_loan_link_by_token(
         "is_active": link.is_active,
         "expires_at": link.expires_at,
         "created_at": link.created_at,
-        "organization_name": link.organization.name if link.organization else None,
-        "loan_product_name": link.product.name if link.product else None,
+        "organization_name": link.organization_name,
+        "loan_product_name": link.loan_product_name,
     }
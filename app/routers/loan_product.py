@@ -2,13 +2,15 @@
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from .. import schema
 from ..db import get_db
 from ..crud import loan_product_crud
 from ..security import require_roles
+from ..utils.pagination import set_next_cursor
+from ..utils.sql_instrumentation import query_budget
 
 router = APIRouter(
     prefix="/loan-products",
@@ -33,10 +35,13 @@ def create_loan_product(
     "/",
     response_model=List[schema.LoanProductOut],
 )
+@query_budget(4)
 def list_loan_products(
+    response: Response,
     is_active: Optional[bool] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user=Depends(
         require_roles([
@@ -46,9 +51,15 @@ def list_loan_products(
         ])
     ),
 ):
-    return loan_product_crud.list_loan_products(
-        db, skip=skip, limit=limit, is_active=is_active
-    )
+    try:
+        products = loan_product_crud.list_loan_products(
+            db, skip=skip, limit=limit, is_active=is_active, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    set_next_cursor(response, products, limit)
+    return products
 
 
 @router.get(
@@ -1,15 +1,19 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ..db import get_db
 from .. import schema, model
-from ..security import get_current_partner_user
+from ..security import get_current_partner_user, require_partner_roles
 from ..crud import remittance_crud, partner_dashboard_crud
-from ..crud import partner_staff_crud
+from ..crud import partner_staff_crud, data_version_crud, roster_crud, prequalification_crud
+from ..utils.etag import make_etag, conditional_response
+from ..utils.fast_json import FastJSONResponse
+from ..metrics import REMITTANCES_INGESTED
 
 router = APIRouter(prefix="/partner/dashboard", tags=["Partner Dashboard"])
 
@@ -95,6 +99,8 @@ def partner_remit_money(
 
     db.add(tx)
     db.commit()
+    REMITTANCES_INGESTED.inc(source="partner")
+    data_version_crud.mark_organization_changed(db, tx.organization_id)
     db.refresh(tx)
 
     return {
@@ -110,11 +116,8 @@ def my_transactions(
     db: Session = Depends(get_db),
     current_partner=Depends(get_current_partner_user),
 ):
-    return (
-        db.query(model.InboundTransaction)
-        .filter(model.InboundTransaction.organization_id == current_partner.organization_id)
-        .order_by(model.InboundTransaction.paid_at.desc())
-        .all()
+    return FastJSONResponse(
+        partner_dashboard_crud.list_org_transactions(db, current_partner.organization_id)
     )
 
 
@@ -122,9 +125,19 @@ def my_transactions(
 def my_monthly_due(
     year: int,
     month: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_partner=Depends(get_current_partner_user),
 ):
+    org_id = current_partner.organization_id
+    etag = make_etag(
+        "partner-monthly-due", org_id, year, month, data_version_crud.get_data_version(db, org_id)
+    )
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
     return partner_dashboard_crud.get_org_monthly_due(
         db=db,
         organization_id=current_partner.organization_id,
@@ -135,10 +148,51 @@ def my_monthly_due(
 
 @router.get("/staff-loans", response_model=schema.PartnerStaffLoansOut)
 def my_staff_loans(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_partner=Depends(get_current_partner_user),
 ):
+    org_id = current_partner.organization_id
+    etag = make_etag("partner-staff-loans", org_id, data_version_crud.get_data_version(db, org_id))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
     return partner_staff_crud.list_org_staff_with_loans(
         db=db,
         organization_id=current_partner.organization_id,
     )
+
+
+@router.post("/roster", response_model=schema.RosterImportOut)
+def import_my_roster(
+    file: UploadFile = File(..., description="CSV: staff_id, full_name, bvn, phone, email, net_salary"),
+    db: Session = Depends(get_db),
+    current_partner=Depends(require_partner_roles([schema.PartnerUserRoleEnum.PARTNER_ADMIN])),
+):
+    """
+    Upserts the organization's staff roster on staff_id; returns what changed.
+    """
+    try:
+        return roster_crud.import_roster_file(db, current_partner.organization_id, file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/prequalification.csv")
+def my_prequalification_csv(
+    product_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_partner=Depends(require_partner_roles([schema.PartnerUserRoleEnum.PARTNER_ADMIN])),
+):
+    """
+    Largest eligible amount per staff member x active product x tenor, as CSV.
+    """
+    org_id = current_partner.organization_id
+    prequalification = prequalification_crud.load_prequalification(db, org_id, product_id=product_id)
+    return StreamingResponse(
+        prequalification_crud.iter_prequalification_csv(prequalification),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="prequalification-{org_id}.csv"'},
+    )
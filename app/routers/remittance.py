@@ -8,6 +8,7 @@ from ..db import get_db
 from .. import model, schema
 from ..crud import repayment_crud
 from ..security import require_roles
+from ..metrics import REMITTANCES_INGESTED
 
 router = APIRouter(prefix="/remittance", tags=["Remittance"])
 
@@ -42,6 +43,7 @@ def ingest_remittance(
 
     db.add(tx)
     db.commit()
+    REMITTANCES_INGESTED.inc(source="bank")
     db.refresh(tx)
 
     result = repayment_crud.apply_inbound_transaction_to_org(db, tx)
@@ -1,12 +1,21 @@
 # app/routers/report_router.py
 
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime, date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ..db import get_db
-from ..crud import report_crud
+from ..crud import report_crud, as_of_crud, cohort_crud, report_artifact_crud, data_version_crud
+from ..crud import organization_crud, prequalification_crud
+from ..jobs.as_of_checkpoints import checkpoint_time
+from ..jobs import month_close
 from .. import schema
 from ..security import require_roles
+from ..utils.single_flight import single_flight
+from ..utils.fast_json import FastJSONResponse
 
 router = APIRouter(
     prefix="/reports",
@@ -60,4 +69,208 @@ def org_monthly_report_v2(
         )
     ),
 ):
-    return report_crud.get_org_monthly_report_v2(db, organization_id, year, month)
+    def compute():
+        artifact = report_artifact_crud.get_current_artifact(db, organization_id, year, month)
+        if artifact is not None:
+            return artifact
+        return report_crud.get_org_monthly_report_v2(db, organization_id, year, month)
+
+    version = data_version_crud.get_data_version(db, organization_id)
+    report = single_flight.do("org-monthly-v2", ("staff", organization_id, year, month, version), compute)
+    return FastJSONResponse(report)
+
+
+@router.post("/org-monthly-v2/close", status_code=status.HTTP_200_OK)
+def close_org_monthly_reports(
+    year: Optional[int] = Query(None, ge=2000, le=2100),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    current_user=Depends(require_roles([schema.UserRoleEnum.ADMIN])),
+):
+    """
+    Builds month-close artifacts for all active orgs (defaults to the previous month).
+    """
+    if (year is None) != (month is None):
+        raise HTTPException(status_code=400, detail="Provide both year and month, or neither.")
+    if year is None:
+        year, month = month_close.previous_month()
+    result = month_close.run_month_close(year, month)
+    return {"message": "Month close completed.", "result": result}
+
+
+
+@router.get(
+    "/aging",
+    response_model=schema.AgingReportOut,
+)
+def aging_report(
+    as_of_date: Optional[date] = Query(None, description="Defaults to today (UTC)"),
+    organization_id: Optional[int] = Query(None),
+    product_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user=Depends(
+        require_roles(
+            [
+                schema.UserRoleEnum.ADMIN,
+                schema.UserRoleEnum.MANAGER,
+                schema.UserRoleEnum.LOAN_OFFICER,
+                schema.UserRoleEnum.AUTHORIZER,
+            ]
+        )
+    ),
+):
+    return report_crud.get_aging_report(
+        db,
+        as_of_date=as_of_date or datetime.utcnow().date(),
+        organization_id=organization_id,
+        product_id=product_id,
+    )
+
+
+_FORECAST_ROLES = [
+    schema.UserRoleEnum.ADMIN,
+    schema.UserRoleEnum.MANAGER,
+    schema.UserRoleEnum.AUTHORIZER,
+    schema.UserRoleEnum.CASHIER,
+]
+
+
+@router.get(
+    "/collections-forecast",
+    response_model=schema.CollectionsForecastOut,
+)
+def collections_forecast(
+    months: int = Query(12, ge=1, le=36),
+    organization_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_roles(_FORECAST_ROLES)),
+):
+    return report_crud.get_collections_forecast(
+        db,
+        months=months,
+        start=datetime.utcnow().date(),
+        organization_id=organization_id,
+    )
+
+
+@router.get("/collections-forecast.csv")
+def collections_forecast_csv(
+    months: int = Query(12, ge=1, le=36),
+    organization_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_roles(_FORECAST_ROLES)),
+):
+    forecast = report_crud.get_collections_forecast(
+        db,
+        months=months,
+        start=datetime.utcnow().date(),
+        organization_id=organization_id,
+    )
+    return StreamingResponse(
+        report_crud.iter_collections_forecast_csv(forecast),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="collections-forecast-{forecast["start_month"]}.csv"'},
+    )
+
+
+@router.get("/prequalification.csv")
+def prequalification_csv(
+    organization_id: int = Query(..., description="ID of the partner organization"),
+    product_id: Optional[int] = Query(None, description="Only this product (default: every active product)"),
+    db: Session = Depends(get_db),
+    current_user=Depends(
+        require_roles(
+            [
+                schema.UserRoleEnum.ADMIN,
+                schema.UserRoleEnum.MANAGER,
+                schema.UserRoleEnum.LOAN_OFFICER,
+            ]
+        )
+    ),
+):
+    """
+    Largest eligible amount per staff member x active product x tenor, as CSV.
+    """
+    if not organization_crud.get_organization(db, organization_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found.")
+
+    prequalification = prequalification_crud.load_prequalification(db, organization_id, product_id=product_id)
+    return StreamingResponse(
+        prequalification_crud.iter_prequalification_csv(prequalification),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="prequalification-{organization_id}.csv"'},
+    )
+
+
+@router.get(
+    "/cohorts",
+    response_model=schema.CohortReportOut,
+)
+def cohort_report(
+    from_month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="YYYY-MM"),
+    to_month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="YYYY-MM"),
+    db: Session = Depends(get_db),
+    current_user=Depends(
+        require_roles(
+            [
+                schema.UserRoleEnum.ADMIN,
+                schema.UserRoleEnum.MANAGER,
+                schema.UserRoleEnum.AUTHORIZER,
+            ]
+        )
+    ),
+):
+    """
+    Vintage curves from the precomputed cohort table (see POST /reports/cohorts/refresh).
+    """
+    return cohort_crud.get_cohort_report(db, from_month=from_month, to_month=to_month)
+
+
+@router.post("/cohorts/refresh", status_code=status.HTTP_200_OK)
+def refresh_cohort_report(
+    full: bool = False,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_roles([schema.UserRoleEnum.ADMIN, schema.UserRoleEnum.MANAGER])),
+):
+    result = cohort_crud.refresh_cohorts(db, full=full)
+    return {"message": "Cohorts refreshed.", "result": result}
+
+
+@router.get(
+    "/as-of",
+    response_model=schema.AsOfBalanceOut,
+)
+def outstanding_as_of(
+    as_of: datetime = Query(..., alias="date", description="Point in time (ISO date or datetime)"),
+    organization_id: Optional[int] = Query(None),
+    loan_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user=Depends(
+        require_roles(
+            [
+                schema.UserRoleEnum.ADMIN,
+                schema.UserRoleEnum.MANAGER,
+                schema.UserRoleEnum.AUTHORIZER,
+            ]
+        )
+    ),
+):
+    if loan_id is not None:
+        return as_of_crud.get_loan_outstanding_as_of(db, loan_id, as_of)
+    if organization_id is not None:
+        return as_of_crud.get_org_outstanding_as_of(db, organization_id, as_of)
+    raise HTTPException(status_code=400, detail="Provide organization_id or loan_id.")
+
+
+@router.post("/as-of/checkpoints", status_code=status.HTTP_200_OK)
+def create_as_of_checkpoints(
+    backfill: bool = False,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_roles([schema.UserRoleEnum.ADMIN])),
+):
+    """
+    Writes today's (UTC midnight) checkpoints now.
+    backfill=true first seeds events from allocations made before event history existed.
+    """
+    backfilled = as_of_crud.backfill_allocation_events(db) if backfill else 0
+    created = as_of_crud.create_checkpoints(db, checkpoint_time())
+    return {"message": "Checkpoints created.", "events_backfilled": backfilled, "checkpoints_created": created}
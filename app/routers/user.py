@@ -1,12 +1,12 @@
 # app/routers/user.py
 
-import os
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from .. import schema, model
+from ..config import settings
 from ..db import get_db
 from ..crud import user_crud
 from ..security import (
@@ -23,11 +23,9 @@ from ..utils.reset_tokens import (
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
-FRONTEND_RESET_URL = os.environ.get(
-    "FRONTEND_RESET_URL", "http://localhost:5173/reset-password"
-)
+FRONTEND_RESET_URL = settings.FRONTEND_RESET_URL
 
-MIN_PASSWORD_LEN = int(os.environ.get("MIN_PASSWORD_LEN", "6"))
+MIN_PASSWORD_LEN = settings.MIN_PASSWORD_LEN
 
 
 def _password_strength_check(pw: str):
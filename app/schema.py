@@ -1,6 +1,6 @@
 # app/schema.py
 
-from datetime import datetime
+from datetime import datetime, date
 from decimal import Decimal
 from typing import Optional, List
 from enum import Enum
@@ -108,6 +108,57 @@ class CustomerOut(CustomerBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RosterImportError(BaseModel):
+    line: int
+    staff_id: Optional[str] = None
+    reason: str
+
+
+class RosterImportOut(BaseModel):
+    organization_id: int
+    rows: int
+    inserted: int
+    updated: int
+    unchanged: int
+    rejected: int
+    errors: List[RosterImportError] = []
+    elapsed_ms: float
+
+
+class JournalEntryOut(BaseModel):
+    id: int
+    entry_type: str
+    reference: Optional[str] = None
+    narration: Optional[str] = None
+    reverses_entry_id: Optional[int] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class JournalPostingOut(BaseModel):
+    id: int
+    entry_id: int
+    account: str
+    amount: Decimal
+    balance_after: Optional[Decimal] = None
+    created_at: datetime
+
+    entry: Optional[JournalEntryOut] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CustomerBalanceOut(BaseModel):
+    customer_id: int
+    as_of: Optional[datetime] = None
+    balance: Decimal
+
+
+class JournalReverseRequest(BaseModel):
+    narration: Optional[str] = None
+
+
 
 
 class LoanProductBase(BaseModel):
@@ -165,6 +216,28 @@ class LoanApplicationUpdateStatus(BaseModel):
     officer_comment: Optional[str] = None
 
 
+class LoanApplicationBulkStatusItem(LoanApplicationUpdateStatus):
+    application_id: int
+
+
+class LoanApplicationBulkStatusRequest(BaseModel):
+    decisions: List[LoanApplicationBulkStatusItem] = Field(..., min_length=1)
+
+
+class LoanApplicationBulkStatusResult(BaseModel):
+    application_id: int
+    ok: bool
+    status: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class LoanApplicationBulkStatusOut(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[LoanApplicationBulkStatusResult]
+
+
 class LoanApplicationUpdate(BaseModel):
     requested_amount: Optional[Decimal] = None
     tenor_months: Optional[int] = None
@@ -197,6 +270,15 @@ class LoanApplicationOut(BaseModel):
         orm_mode = True
 
 
+class LoanApplicationClaimOut(BaseModel):
+    claim_expires_at: datetime
+    applications: List[LoanApplicationOut]
+
+
+class LoanApplicationPriorityUpdate(BaseModel):
+    priority: int = Field(..., ge=0, le=1000, description="Queue priority; lower is served first (default 100)")
+
+
 
 
 class PublicLoanApplicationBase(BaseModel):
@@ -433,6 +515,89 @@ class OrgMonthlyReportOut(BaseModel):
     repayments: List[OrgMonthlyRepaymentRow]
 
 
+class AsOfBalanceOut(BaseModel):
+    as_of: datetime
+    organization_id: Optional[int] = None
+    loan_id: Optional[int] = None
+    total_scheduled: Decimal
+    total_paid: Decimal
+    outstanding: Decimal
+    checkpoint_as_of: Optional[datetime] = None
+
+
+class AgingReportRow(BaseModel):
+    organization_id: Optional[int] = None
+    organization_name: Optional[str] = None
+    product_id: Optional[int] = None
+    product_name: Optional[str] = None
+
+    loans_count: int
+    loans_at_risk: int
+    total_outstanding: Decimal
+
+    current: Decimal
+    dpd_1_29: Decimal
+    dpd_30_59: Decimal
+    dpd_60_89: Decimal
+    dpd_90_plus: Decimal
+
+    par1: Decimal
+    par30: Decimal
+    par60: Decimal
+    par90: Decimal
+    par1_ratio: Optional[float] = None
+    par30_ratio: Optional[float] = None
+    par60_ratio: Optional[float] = None
+    par90_ratio: Optional[float] = None
+
+
+class AgingReportOut(BaseModel):
+    as_of_date: date
+    organization_id: Optional[int] = None
+    product_id: Optional[int] = None
+    items: List[AgingReportRow] = []
+    totals: AgingReportRow
+
+
+class CollectionsForecastRow(BaseModel):
+    organization_id: int
+    organization_name: Optional[str] = None
+    # unpaid installments due before start_month (not in amounts / total)
+    overdue: Decimal = Decimal("0.00")
+    amounts: List[Decimal]
+    total: Decimal
+
+
+class CollectionsForecastOut(BaseModel):
+    start_month: str
+    months: List[str]
+    rows: List[CollectionsForecastRow] = []
+    overdue_total: Decimal = Decimal("0.00")
+    totals: List[Decimal]
+    grand_total: Decimal
+
+
+class CohortCurvePoint(BaseModel):
+    months_on_book: int
+    expected_amount: Decimal
+    collected_amount: Decimal
+    cumulative_expected: Decimal
+    cumulative_collected: Decimal
+    collection_rate: Optional[float] = None
+
+
+class CohortOut(BaseModel):
+    cohort_month: str
+    loans_count: int
+    disbursed_principal: Decimal
+    curve: List[CohortCurvePoint] = []
+
+
+class CohortReportOut(BaseModel):
+    refreshed_at: Optional[datetime] = None
+    cohorts: List[CohortOut] = []
+
+
 class OrgMonthlyReportV2Organization(BaseModel):
     id: int
     name: str
@@ -657,6 +822,31 @@ class AdminRemittanceTransactionsOut(BaseModel):
     rows: List[AdminRemittanceTransactionRow]
 
 
+class RemittanceSimulateRequest(BaseModel):
+    organization_id: int
+    amount: Decimal = Field(..., gt=0)
+
+
+class SimulatedAllocationRow(BaseModel):
+    repayment_id: int
+    loan_id: int
+    installment_number: int
+    due_date: datetime
+    outstanding_before: Decimal
+    amount_applied: Decimal
+    outstanding_after: Decimal
+
+
+class RemittanceSimulationOut(BaseModel):
+    organization_id: int
+    amount: Decimal
+    open_installments: int
+    allocations_made: int
+    total_applied: Decimal
+    unallocated_amount: Decimal
+    allocations: List[SimulatedAllocationRow] = []
+
+
 
 class PartnerStaffLoanRow(BaseModel):
     customer_id: int
@@ -2,32 +2,33 @@
 
 import hashlib
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional, List, Callable
 
-from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from .db import get_db
 from . import model, schema
 from .config import settings
 
-
-if settings.ENV != "production":
-    load_dotenv()
-
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=12,
-)
+
+@lru_cache(maxsize=1)
+def _pwd_context():
+    # passlib and jose are imported on first use, not at worker boot
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=12,
+    )
+
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 partner_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/partner/auth/login")
@@ -48,12 +49,12 @@ def _normalize_secret(value: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     # bcrypt will NEVER crash now
-    return pwd_context.verify(_normalize_secret(plain_password), hashed_password)
+    return _pwd_context().verify(_normalize_secret(plain_password), hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     # bcrypt will NEVER crash now
-    return pwd_context.hash(_normalize_secret(password))
+    return _pwd_context().hash(_normalize_secret(password))
 
 
 def create_access_token(
@@ -79,6 +80,8 @@ def create_access_token(
     )
     to_encode.update({"exp": expire})
 
+    from jose import jwt
+
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -100,6 +103,8 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
@@ -150,6 +155,8 @@ def get_current_partner_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
@@ -173,3 +180,17 @@ def get_current_partner_user(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive partner user.")
 
     return user
+
+
+def require_partner_roles(allowed_roles: List[schema.PartnerUserRoleEnum]) -> Callable:
+    allowed = [_role_value(r) for r in allowed_roles]
+
+    def role_checker(current_partner: model.PartnerUser = Depends(get_current_partner_user)):
+        if _role_value(getattr(current_partner, "role", None)) not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have permission to perform this action.",
+            )
+        return current_partner
+
+    return role_checker
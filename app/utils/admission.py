@@ -0,0 +1,151 @@
+# app/utils/admission.py
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from ..config import settings
+
+REPORTS = "reports"
+TRANSACTIONAL = "transactional"
+AUTH = "auth"
+
+# first match wins; anything unmatched is TRANSACTIONAL
+ROUTE_CLASSES: Tuple[Tuple[str, str], ...] = (
+    ("/reports", REPORTS),
+    ("/dashboard", REPORTS),
+    ("/partner/dashboard/staff-loans", REPORTS),
+    ("/partner/dashboard/monthly-due", REPORTS),
+    ("/admin/remittances/summary", REPORTS),
+    ("/admin/remittances/transactions", REPORTS),
+    ("/customers/roster", REPORTS),
+    ("/partner/dashboard/roster", REPORTS),
+    ("/partner/dashboard/prequalification.csv", REPORTS),
+    ("/auth", AUTH),
+    ("/partner/auth", AUTH),
+    ("/partner/invite", AUTH),
+)
+
+EXEMPT_PATHS = ("/", "/docs", "/redoc", "/openapi.json", "/metrics")
+
+
+def classify(path: str, routes: Sequence[Tuple[str, str]] = ROUTE_CLASSES) -> str:
+    for prefix, route_class in routes:
+        if path == prefix or path.startswith(prefix + "/"):
+            return route_class
+    return TRANSACTIONAL
+
+
+class Overloaded(Exception):
+    def __init__(self, status_code: int, detail: str):
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class Bulkhead:
+    """
+    At most max_concurrent requests run; up to max_queue more wait for a slot.
+    - queue full: rejected at once (429)
+    - no slot within queue_timeout_seconds: rejected (503)
+    """
+
+    name: str
+    max_concurrent: int
+    max_queue: int
+    queue_timeout_seconds: float
+
+    def __post_init__(self):
+        self._sem = asyncio.Semaphore(max(self.max_concurrent, 1))
+        self._waiting = 0
+
+    async def acquire(self) -> None:
+        if not self._sem.locked():
+            await self._sem.acquire()
+            return
+        if self._waiting >= self.max_queue:
+            raise Overloaded(429, f"Too many concurrent {self.name} requests. Retry shortly.")
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), timeout=self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            raise Overloaded(503, f"Server busy ({self.name}). Retry shortly.")
+        finally:
+            self._waiting -= 1
+
+    def release(self) -> None:
+        self._sem.release()
+
+
+def bulkheads_from_settings() -> Dict[str, Bulkhead]:
+    return {
+        REPORTS: Bulkhead(
+            REPORTS,
+            settings.ADMISSION_REPORTS_MAX_CONCURRENT,
+            settings.ADMISSION_REPORTS_MAX_QUEUE,
+            settings.ADMISSION_REPORTS_QUEUE_TIMEOUT_SECONDS,
+        ),
+        TRANSACTIONAL: Bulkhead(
+            TRANSACTIONAL,
+            settings.ADMISSION_TRANSACTIONAL_MAX_CONCURRENT,
+            settings.ADMISSION_TRANSACTIONAL_MAX_QUEUE,
+            settings.ADMISSION_TRANSACTIONAL_QUEUE_TIMEOUT_SECONDS,
+        ),
+        AUTH: Bulkhead(
+            AUTH,
+            settings.ADMISSION_AUTH_MAX_CONCURRENT,
+            settings.ADMISSION_AUTH_MAX_QUEUE,
+            settings.ADMISSION_AUTH_QUEUE_TIMEOUT_SECONDS,
+        ),
+    }
+
+
+class AdmissionControlMiddleware:
+    """
+    Pure ASGI middleware: one bulkhead per route class, so saturated report
+    endpoints cannot take the threadpool / DB pool away from disbursement,
+    ingest or login.
+    """
+
+    def __init__(self, app, bulkheads: Optional[Dict[str, Bulkhead]] = None):
+        self.app = app
+        self.bulkheads = bulkheads if bulkheads is not None else bulkheads_from_settings()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        bulkhead = self.bulkheads.get(classify(scope["path"]))
+        if bulkhead is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await bulkhead.acquire()
+        except Overloaded as e:
+            await _reject(send, e.status_code, e.detail, bulkhead.queue_timeout_seconds)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            bulkhead.release()
+
+
+async def _reject(send, status_code: int, detail: str, retry_after: float) -> None:
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"retry-after", str(max(int(retry_after), 1)).encode("ascii")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
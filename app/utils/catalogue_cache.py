@@ -0,0 +1,158 @@
+# app/utils/catalogue_cache.py
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Hashable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LinkSnapshot:
+    id: int
+    token: str
+    organization_id: int
+    product_id: int
+    is_active: bool
+    expires_at: Optional[datetime]
+    created_at: Optional[datetime]
+    organization_name: Optional[str]
+    loan_product_name: Optional[str]
+
+
+@dataclass(frozen=True)
+class ProductSnapshot:
+    id: int
+    name: str
+    is_active: bool
+    interest_rate: float
+    max_tenor_months: int
+    min_amount: Optional[float]
+    max_amount: Optional[float]
+
+
+class CatalogueCache:
+    """
+    Process-local TTL cache of loan-link (by token) and loan-product (by id)
+    snapshots for the public application path.
+
+    Invalidation messages ("link:<id>", "product:<id>", "org:<id>", "all"):
+    - a product also drops the links that show its name
+    - an org drops its links
+    A fill is skipped if any invalidation ran since its read started, so a
+    lookup racing a deactivation cannot re-cache the old row.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def generation(self) -> int:
+        return self._generation
+
+    def _get(self, key: Hashable) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def _put(self, key: Hashable, value: Any, generation: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get_link(self, token: str) -> Optional[LinkSnapshot]:
+        return self._get(("link", token))
+
+    def put_link(self, snapshot: LinkSnapshot, generation: int) -> None:
+        self._put(("link", snapshot.token), snapshot, generation)
+
+    def get_product(self, product_id: int) -> Optional[ProductSnapshot]:
+        return self._get(("product", product_id))
+
+    def put_product(self, snapshot: ProductSnapshot, generation: int) -> None:
+        self._put(("product", snapshot.id), snapshot, generation)
+
+    def apply(self, message: str) -> None:
+        kind, _, ident = message.partition(":")
+        if kind == "all" or not ident.isdigit():
+            self.clear()
+            return
+        ident = int(ident)
+
+        def stale(key, value) -> bool:
+            if kind == "link":
+                return key[0] == "link" and value.id == ident
+            if kind == "product":
+                return value.id == ident if key[0] == "product" else value.product_id == ident
+            if kind == "org":
+                return key[0] == "link" and value.organization_id == ident
+            return True
+
+        with self._lock:
+            self._generation += 1
+            for key in [k for k, (_, v) in self._data.items() if stale(k, v)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+catalogue_cache = CatalogueCache(
+    ttl_seconds=settings.CATALOGUE_CACHE_TTL_SECONDS,
+    max_entries=settings.CATALOGUE_CACHE_MAX_ENTRIES,
+)
+
+
+def invalidate(db: Session, kind: str, ident: int) -> None:
+    """
+    Call AFTER the change is committed:
+    - drops the entries from this process
+    - with CATALOGUE_CACHE_NOTIFY_ENABLED on PostgreSQL, NOTIFYs the other
+      workers (see jobs/catalogue_listener.py); otherwise they catch up
+      within CATALOGUE_CACHE_TTL_SECONDS
+    """
+    message = f"{kind}:{ident}"
+    catalogue_cache.apply(message)
+
+    if not settings.CATALOGUE_CACHE_NOTIFY_ENABLED or db.get_bind().dialect.name != "postgresql":
+        return
+    try:
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": settings.CATALOGUE_CACHE_NOTIFY_CHANNEL, "payload": message},
+        )
+        db.commit()
+    except Exception:
+        # the change itself is already committed; other workers fall back to the TTL
+        db.rollback()
+        logger.warning("catalogue cache NOTIFY failed for %s", message, exc_info=True)
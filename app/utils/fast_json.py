@@ -0,0 +1,37 @@
+# app/utils/fast_json.py
+
+from decimal import Decimal
+from typing import Any, Iterable, List, Dict
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    # same wire format pydantic uses for Decimal fields
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson-rendered response for large payloads built from trusted DB rows.
+    Returning it skips response_model validation, so the content must already
+    have the schema's shape (response_model is still declared for the docs).
+    Decimals are rendered as strings, datetimes as ISO 8601, enums by value.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def rows_to_dicts(rows: Iterable) -> List[Dict[str, Any]]:
+    """
+    Column-projected Row objects -> plain dicts keyed by column label.
+    """
+    return [dict(r._mapping) for r in rows]
@@ -0,0 +1,69 @@
+# app/utils/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from fastapi import Response
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    # created_at is NOT NULL on every paginated table, so the sort key is always set
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor.")
+
+
+def paginate(
+    query,
+    created_col,
+    id_col,
+    *,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    descending: bool = True,
+):
+    """
+    Deterministic (created_at, id) ordering for list endpoints.
+
+    - cursor given: keyset seek past the cursor row (constant cost at any depth)
+    - no cursor: OFFSET skip, kept for existing clients
+
+    Needs a composite index on (created_at, id), or (filter column, created_at, id).
+    """
+    if descending:
+        query = query.order_by(created_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(created_col.asc(), id_col.asc())
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if descending:
+            seek = or_(created_col < created_at, and_(created_col == created_at, id_col < row_id))
+        else:
+            seek = or_(created_col > created_at, and_(created_col == created_at, id_col > row_id))
+        return query.filter(seek).limit(limit).all()
+
+    return query.offset(skip).limit(limit).all()
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int) -> None:
+    """
+    A full page means there may be more; the cursor points past its last row.
+    """
+    if items and len(items) >= limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
@@ -0,0 +1,33 @@
+# app/utils/query_counter.py
+
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import event
+
+
+class QueryLog:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(engine) -> Iterator[QueryLog]:
+    """
+    Counts every statement the engine executes inside the block (any thread).
+    Meant for harness scripts, not for request-time use.
+    """
+    log = QueryLog()
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        log.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        yield log
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
@@ -0,0 +1,62 @@
+# app/utils/report_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from ..config import settings
+
+_MISS = object()
+
+
+class ReportCache:
+    """
+    Process-local TTL cache for report results.
+
+    Each entry is tagged with the organization it was computed for (None = all orgs),
+    so a write for one org only drops that org's entries plus the cross-org ones.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[float, Optional[int], Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISS)
+            if item is _MISS:
+                return default
+            expires_at, _, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, organization_id: Optional[int]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, organization_id, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def invalidate_organization(self, organization_id: Optional[int]) -> None:
+        with self._lock:
+            stale = [
+                k for k, (_, org_id, _) in self._data.items()
+                if org_id is None or organization_id is None or org_id == organization_id
+            ]
+            for k in stale:
+                del self._data[k]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+report_cache = ReportCache(ttl_seconds=settings.REPORT_CACHE_TTL_SECONDS)
@@ -0,0 +1,40 @@
+# app/utils/request_metrics.py
+
+import time
+
+from ..metrics import HTTP_REQUEST_DURATION
+
+
+class RequestMetricsMiddleware:
+    """
+    Observes request latency per route template (e.g. /loans/{loan_id}), so
+    path parameters do not explode the label set. Unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                method=scope.get("method", ""),
+                route=route,
+                status=status_code,
+            )
@@ -1,20 +1,21 @@
 # app/utils/reset_tokens.py
-import os
 from datetime import datetime, timedelta, timezone
-from jose import jwt, JWTError
 
-SECRET_KEY = os.environ.get("SECRET_KEY", "CHANGE_ME_IN_ENV")
-ALGORITHM = os.environ.get("ALGORITHM", "HS256")
-RESET_TOKEN_EXPIRE_MINUTES = int(os.environ.get("RESET_TOKEN_EXPIRE_MINUTES", "30"))
+from ..config import settings
+
 
 def create_password_reset_token(email: str) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(minutes=RESET_TOKEN_EXPIRE_MINUTES)
+    from jose import jwt
+
+    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.RESET_TOKEN_EXPIRE_MINUTES)
     payload = {"sub": email, "type": "password_reset", "exp": expire}
-    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 def verify_password_reset_token(token: str):
+    from jose import jwt, JWTError
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         if payload.get("type") != "password_reset":
             return None
         return payload.get("sub")
@@ -0,0 +1,84 @@
+# app/utils/single_flight.py
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ..config import settings
+from ..metrics import SINGLE_FLIGHT_REQUESTS
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one computation:
+    - the first caller runs fn, the others block until it finishes and get
+      the same result (or the same exception)
+    - a successful result is kept for result_ttl_seconds, so a burst arriving
+      just after completion does not recompute
+
+    Keys must include everything the result depends on (params, caller scope,
+    data version). Results are shared, so callers must not mutate them.
+    """
+
+    def __init__(self, result_ttl_seconds: float, max_results: int = 512):
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_results = max_results
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def do(self, endpoint: str, key: Hashable, fn: Callable[[], Any]) -> Any:
+        key = (endpoint, key)
+        with self._lock:
+            done = self._results.get(key)
+            if done is not None and done[0] > time.monotonic():
+                SINGLE_FLIGHT_REQUESTS.inc(endpoint=endpoint, outcome="hit")
+                return done[1]
+
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            SINGLE_FLIGHT_REQUESTS.inc(endpoint=endpoint, outcome="coalesced")
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        SINGLE_FLIGHT_REQUESTS.inc(endpoint=endpoint, outcome="computed")
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                if call.error is None and self.result_ttl_seconds > 0:
+                    self._store(key, call.result)
+            call.event.set()
+
+    def _store(self, key: Hashable, result: Any) -> None:
+        now = time.monotonic()
+        if len(self._results) >= self.max_results:
+            for k in [k for k, (exp, _) in self._results.items() if exp <= now]:
+                del self._results[k]
+            while len(self._results) >= self.max_results:
+                self._results.pop(next(iter(self._results)))
+        self._results[key] = (now + self.result_ttl_seconds, result)
+
+
+single_flight = SingleFlight(result_ttl_seconds=settings.SINGLE_FLIGHT_RESULT_TTL_SECONDS)
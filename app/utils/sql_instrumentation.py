@@ -0,0 +1,182 @@
+# app/utils/sql_instrumentation.py
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from sqlalchemy import event
+
+from ..config import settings
+
+logger = logging.getLogger("app.sql")
+
+_current: ContextVar[Optional["RequestSQLStats"]] = ContextVar("request_sql_stats", default=None)
+
+_PARAM = r"(?:\?|%\(\w+\)s|%s|\$\d+|:\w+|__\[POSTCOMPILE_\w+\])"
+_PARAM_LIST = re.compile(r"\(\s*" + _PARAM + r"(?:\s*,\s*" + _PARAM + r")*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_SPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalized statement: whitespace collapsed, IN-lists and numeric literals
+    folded, so the same query issued per row maps to one shape.
+    """
+    shape = _SPACE.sub(" ", statement).strip()
+    shape = _PARAM_LIST.sub("(?)", shape)
+    return _NUMBER.sub("N", shape)
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Declares how many statements an endpoint may issue per request
+    (dependencies such as auth included). Enforced in strict mode, logged otherwise.
+    """
+    def decorator(fn: Callable) -> Callable:
+        fn.__query_budget__ = max_queries
+        return fn
+
+    return decorator
+
+
+class RequestSQLStats:
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.count = 0
+        self.total_seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    @property
+    def budget(self) -> Optional[int]:
+        # the router fills scope["endpoint"] in place once the route matches
+        budget = getattr(self.scope.get("endpoint"), "__query_budget__", None)
+        if budget is None and settings.SQL_DEFAULT_QUERY_BUDGET > 0:
+            budget = settings.SQL_DEFAULT_QUERY_BUDGET
+        return budget
+
+    def max_repeats(self) -> int:
+        return max(self.shapes.values()) if self.shapes else 0
+
+    def problems(self):
+        out = []
+        budget = self.budget
+        if budget is not None and self.count > budget:
+            out.append(f"{self.count} statements exceed the budget of {budget}")
+        limit = settings.SQL_MAX_DUPLICATE_STATEMENTS
+        for shape, n in self.shapes.items():
+            if n > limit:
+                out.append(f"statement repeated {n} times (limit {limit}): {shape[:200]}")
+        return out
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        shape = statement_shape(statement)
+        self.shapes[shape] += 1
+
+        if not settings.SQL_STRICT_MODE:
+            return
+        budget = self.budget
+        if budget is not None and self.count > budget:
+            raise QueryBudgetExceeded(
+                f"{self.scope.get('path')}: {self.count} statements exceed the budget of {budget}"
+            )
+        if self.shapes[shape] > settings.SQL_MAX_DUPLICATE_STATEMENTS:
+            raise QueryBudgetExceeded(
+                f"{self.scope.get('path')}: statement repeated {self.shapes[shape]} times "
+                f"(limit {settings.SQL_MAX_DUPLICATE_STATEMENTS}), likely N+1: {shape[:200]}"
+            )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("_query_start")
+    elapsed = time.perf_counter() - starts.pop() if starts else 0.0
+    stats.record(statement, elapsed)
+
+
+def install(engine) -> None:
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SQLInstrumentationMiddleware:
+    """
+    Per-request statement count, DB time and repeated statement shapes:
+    - Server-Timing header (db;dur=..;desc="N queries", app;dur=..)
+    - one structured log line per request (WARNING when over budget / N+1-looking)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSQLStats(scope)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                app_ms = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries", '
+                    f"app;dur={app_ms:.1f}"
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"server-timing", timing.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            _log(scope, stats, status_code, (time.perf_counter() - started) * 1000)
+
+
+def _log(scope: dict, stats: RequestSQLStats, status_code: int, duration_ms: float) -> None:
+    problems = stats.problems()
+    level = logging.WARNING if problems else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+    route = getattr(scope.get("route"), "path", None) or scope.get("path")
+    logger.log(
+        level,
+        json.dumps(
+            {
+                "event": "request_sql",
+                "method": scope.get("method"),
+                "route": route,
+                "status": status_code,
+                "duration_ms": round(duration_ms, 1),
+                "queries": stats.count,
+                "db_ms": round(stats.total_seconds * 1000, 1),
+                "max_repeats": stats.max_repeats(),
+                "problems": problems,
+            }
+        ),
+    )
@@ -0,0 +1,18 @@
+# app/utils/upsert.py
+
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session, table):
+    """
+    insert() for the session's dialect, so callers get on_conflict_do_update /
+    on_conflict_do_nothing and RETURNING. PostgreSQL and SQLite are supported.
+    """
+    name = db.get_bind().dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {name}.")
+    return insert(table)
@@ -0,0 +1,113 @@
+"""
+Admission-control benchmark: transactional latency while reports are saturated.
+
+    python benchmarks/bench_admission.py
+
+Runs a stand-in app (slow sync /reports endpoint, fast sync transactional
+endpoint, same 40-thread pool FastAPI uses) with and without
+AdmissionControlMiddleware. --report-users clients loop on /reports for
+--duration seconds while a transactional call is issued every --tx-interval;
+prints p50/p99 of the transactional calls.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DB_URL", "sqlite://")
+
+import httpx
+from fastapi import FastAPI
+
+from app.utils.admission import AdmissionControlMiddleware, bulkheads_from_settings
+
+
+def build_app(report_seconds: float, tx_seconds: float, admission: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/reports/heavy")
+    def heavy():
+        time.sleep(report_seconds)
+        return {"ok": True}
+
+    @app.post("/disbursements/fast")
+    def fast():
+        time.sleep(tx_seconds)
+        return {"ok": True}
+
+    if admission:
+        app.add_middleware(AdmissionControlMiddleware, bulkheads=bulkheads_from_settings())
+    return app
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def run(app: FastAPI, report_users: int, duration: float, tx_interval: float) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    report_codes = []
+    tx_results = []
+    stop = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        async def report_user():
+            while not stop.is_set():
+                r = await client.get("/reports/heavy")
+                report_codes.append(r.status_code)
+                if r.status_code != 200:
+                    await asyncio.sleep(0.05)
+
+        async def tx():
+            t0 = time.perf_counter()
+            r = await client.post("/disbursements/fast")
+            tx_results.append((r.status_code, time.perf_counter() - t0))
+
+        users = [asyncio.create_task(report_user()) for _ in range(report_users)]
+        await asyncio.sleep(0.1)
+
+        tx_tasks = []
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            tx_tasks.append(asyncio.create_task(tx()))
+            await asyncio.sleep(tx_interval)
+
+        stop.set()
+        await asyncio.gather(*tx_tasks, *users)
+
+    lat = [t for code, t in tx_results if code == 200]
+    return {
+        "tx_ok": len(lat),
+        "tx_failed": len(tx_results) - len(lat),
+        "tx_p50_ms": round(statistics.median(lat) * 1000, 1) if lat else None,
+        "tx_p99_ms": round(pct(lat, 99) * 1000, 1) if lat else None,
+        "reports_200": report_codes.count(200),
+        "reports_429": report_codes.count(429),
+        "reports_503": report_codes.count(503),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--report-users", type=int, default=80, help="Concurrent clients looping on /reports")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--tx-interval", type=float, default=0.02)
+    parser.add_argument("--report-seconds", type=float, default=0.5)
+    parser.add_argument("--tx-seconds", type=float, default=0.005)
+    args = parser.parse_args()
+
+    for admission in (False, True):
+        app = build_app(args.report_seconds, args.tx_seconds, admission)
+        result = asyncio.run(run(app, args.report_users, args.duration, args.tx_interval))
+        print(f"admission={'on ' if admission else 'off'} {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Bulk decisioning benchmark: PATCH /loan-applications/{id}/status one by one
+vs POST /loan-applications/bulk-status.
+
+    python benchmarks/bench_bulk_status.py --reset
+    python benchmarks/bench_bulk_status.py --decisions 2000 --db-url postgresql+psycopg2://... --reset
+
+Builds a synthetic book (synthetic_data.py) in an empty database (--reset
+drops and recreates the tables first), takes 2 x --decisions of its
+PENDING applications and decides half of them with single PATCH calls and
+the other half with one bulk call (same mix: --approve-ratio approved, the
+rest rejected). Reports wall time, decisions/s and SQL statements for both
+(from Server-Timing), and exits 1 if the bulk call does not report every
+decision as applied or the database disagrees with either path.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def statements(response) -> int:
+    timing = response.headers.get("server-timing", "")
+    return int(timing.split('desc="')[1].split()[0]) if 'desc="' in timing else 0
+
+
+def decisions_for(ids, approve_ratio: float, seed: int):
+    rng = random.Random(seed)
+    out = []
+    for application_id in ids:
+        if rng.random() < approve_ratio:
+            out.append({"application_id": application_id, "status": "APPROVED", "approved_amount": "100000"})
+        else:
+            out.append({"application_id": application_id, "status": "REJECTED", "officer_comment": "bench"})
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--decisions", type=int, default=1000)
+    parser.add_argument("--approve-ratio", type=float, default=0.6)
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--db-url", default="sqlite:///bench_bulk_status.db")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    os.environ["DB_URL"] = args.db_url
+    os.environ.setdefault("SECRET_KEY", "bench-bulk-status")
+    from app import model
+    from app.config import settings
+    from app.db import SessionLocal, engine
+    from fastapi.testclient import TestClient
+    from synthetic_data import generate, prepare_database
+
+    settings.BULK_STATUS_MAX_ITEMS = max(settings.BULK_STATUS_MAX_ITEMS, args.decisions)
+    prepare_database(engine, args.reset)
+    # the generator leaves roughly one PENDING application per ten loans
+    manifest = generate(engine, loans=args.decisions * 24, orgs=20, progress=False)
+
+    with SessionLocal() as db:
+        pending = [
+            row.id
+            for row in db.query(model.LoanApplication.id)
+            .filter(model.LoanApplication.status == "PENDING")
+            .order_by(model.LoanApplication.id)
+            .limit(args.decisions * 2)
+        ]
+    if len(pending) < args.decisions * 2:
+        print(f"only {len(pending)} pending applications; lower --decisions", file=sys.stderr)
+        return 1
+    single = decisions_for(pending[0::2], args.approve_ratio, args.seed)
+    bulk = decisions_for(pending[1::2], args.approve_ratio, args.seed)
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        creds = manifest["admin"]
+        token = client.post("/auth/login", data={"username": creds["email"], "password": creds["password"]}).json()
+        headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+        single_statements, errors = 0, 0
+        t0 = time.perf_counter()
+        for d in single:
+            body = {k: v for k, v in d.items() if k != "application_id"}
+            r = client.patch(f"/loan-applications/{d['application_id']}/status", json=body, headers=headers)
+            errors += r.status_code != 200
+            single_statements += statements(r)
+        single_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        r = client.post("/loan-applications/bulk-status", json={"decisions": bulk}, headers=headers)
+        bulk_s = time.perf_counter() - t0
+        summary = r.json() if r.status_code == 200 else {}
+        bulk_statements = statements(r)
+
+    with SessionLocal() as db:
+        expected = {d["application_id"]: d["status"] for d in single + bulk}
+        stored = dict(
+            db.query(model.LoanApplication.id, model.LoanApplication.status)
+            .filter(model.LoanApplication.id.in_(list(expected)))
+        )
+        wrong = sum(1 for application_id, status in expected.items() if stored.get(application_id) != status)
+        missing_accounts = (
+            db.query(model.LoanApplication.id)
+            .join(model.Customer)
+            .filter(
+                model.LoanApplication.id.in_(list(expected)),
+                model.LoanApplication.status == "APPROVED",
+                model.Customer.nun_account_number.is_(None),
+            )
+            .count()
+        )
+
+    result = {
+        "decisions": args.decisions,
+        "single": {
+            "ms": round(single_s * 1000, 1),
+            "per_s": round(args.decisions / single_s),
+            "statements": single_statements,
+            "errors": errors,
+        },
+        "bulk": {
+            "ms": round(bulk_s * 1000, 1),
+            "per_s": round(args.decisions / bulk_s),
+            "statements": bulk_statements,
+            "succeeded": summary.get("succeeded"),
+        },
+        "speedup": round(single_s / bulk_s, 1),
+        "wrong_status": wrong,
+        "approved_without_account": missing_accounts,
+    }
+    print(json.dumps(result, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2) + "\n")
+    failed = errors or wrong or missing_accounts or summary.get("succeeded") != args.decisions
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Cohort refresh benchmark on a synthetic book.
+
+    python benchmarks/bench_cohorts.py --loans 500000 --db-url sqlite:///bench_cohorts.db --reset
+    python benchmarks/bench_cohorts.py --db-url sqlite:///bench_cohorts.db --reuse
+
+Seeds N loans spread over --months disbursement months (6 installments each),
+then times a full cohort rebuild and an incremental refresh after one cohort
+is touched. Seeding needs an empty database: --reset drops and recreates the
+tables first, --reuse keeps an already seeded book and skips seeding.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+BATCH = 50_000
+TENOR = 6
+
+
+def _seed(engine, model, loans: int, months: int, seed: int) -> None:
+    from sqlalchemy import insert
+
+    rng = random.Random(seed)
+    start = datetime(2022, 1, 1)
+
+    with engine.begin() as conn:
+        conn.execute(insert(model.PartnerOrganization), [{"id": 1, "name": "Bench Org", "is_active": True}])
+        conn.execute(
+            insert(model.LoanProduct),
+            [{
+                "id": 1, "name": "Bench", "interest_rate": 6.0, "max_tenor_months": TENOR,
+                "is_active": True, "created_at": start, "updated_at": start,
+            }],
+        )
+
+    for lo in range(1, loans + 1, BATCH):
+        hi = min(lo + BATCH, loans + 1)
+        customers, apps, loan_rows, reps = [], [], [], []
+        for i in range(lo, hi):
+            created = start + timedelta(days=rng.randrange(months * 30))
+            principal = Decimal(rng.randrange(50, 500) * 1000)
+            monthly = (principal * Decimal("1.03") / TENOR).quantize(Decimal("0.01"))
+            customers.append({
+                "id": i, "full_name": f"Staff {i}", "email": f"s{i}@bench.local", "phone": "0",
+                "staff_id": f"S{i}", "organization_id": 1, "net_monthly_salary": Decimal("150000"),
+                "account_balance": Decimal("0"), "created_at": created,
+            })
+            apps.append({
+                "id": i, "customer_id": i, "product_id": 1, "requested_amount": principal,
+                "approved_amount": principal, "tenor_months": TENOR, "status": "DISBURSED",
+                "created_at": created, "updated_at": created,
+            })
+            loan_rows.append({
+                "id": i, "application_id": i, "product_id": 1, "principal_amount": principal,
+                "interest_rate": Decimal("6"), "total_payable": monthly * TENOR, "status": "ACTIVE",
+                "start_date": created, "created_at": created,
+            })
+            paid_upto = rng.randrange(TENOR + 1)
+            for n in range(1, TENOR + 1):
+                paid = monthly if n <= paid_upto else Decimal("0")
+                reps.append({
+                    "loan_id": i, "installment_number": n, "due_date": created + timedelta(days=30 * n),
+                    "amount_due": monthly, "amount_paid": paid, "is_paid": n <= paid_upto, "created_at": created,
+                })
+        with engine.begin() as conn:
+            conn.execute(insert(model.Customer), customers)
+            conn.execute(insert(model.LoanApplication), apps)
+            conn.execute(insert(model.Loan), loan_rows)
+            conn.execute(insert(model.Repayment), reps)
+        print(f"  seeded {hi - 1:,} loans", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=500_000)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-url", default="sqlite:///bench_cohorts.db")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--reuse", action="store_true", help="Skip seeding if the DB already has loans")
+    args = parser.parse_args()
+
+    os.environ["DB_URL"] = args.db_url
+
+    from app.db import Base, engine, SessionLocal
+    from app import model
+    from app.crud import cohort_crud
+    from synthetic_data import prepare_database
+
+    if args.reuse and not args.reset:
+        Base.metadata.create_all(bind=engine)
+    else:
+        prepare_database(engine, args.reset)
+
+    db = SessionLocal()
+    try:
+        if not db.query(model.Loan.id).first():
+            t0 = time.perf_counter()
+            _seed(engine, model, args.loans, args.months, args.seed)
+            print(f"seed: {time.perf_counter() - t0:.1f}s")
+
+        t0 = time.perf_counter()
+        full = cohort_crud.refresh_cohorts(db, full=True)
+        print(f"full refresh: {time.perf_counter() - t0:.2f}s ({len(full['cohorts_refreshed'])} cohorts, {full['rows_written']} rows)")
+
+        t0 = time.perf_counter()
+        cohort_crud.refresh_cohorts(db)
+        print(f"incremental refresh, nothing touched: {time.perf_counter() - t0:.3f}s")
+
+        rep = db.query(model.Repayment).filter(model.Repayment.is_paid.is_(False)).first()
+        db.add(model.AllocationEvent(
+            event_type=model.AllocationEventType.APPLIED, organization_id=1, loan_id=rep.loan_id,
+            repayment_id=rep.id, amount=Decimal("1.00"), occurred_at=datetime.utcnow(),
+        ))
+        db.commit()
+
+        t0 = time.perf_counter()
+        inc = cohort_crud.refresh_cohorts(db)
+        print(f"incremental refresh, 1 cohort touched: {time.perf_counter() - t0:.3f}s ({inc['cohorts_refreshed']})")
+
+        t0 = time.perf_counter()
+        cohort_crud.get_cohort_report(db)
+        print(f"read report: {time.perf_counter() - t0:.3f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
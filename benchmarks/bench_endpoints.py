@@ -0,0 +1,349 @@
+"""
+Endpoint benchmark suite with stored baselines.
+
+    python benchmarks/bench_endpoints.py --reset --save-baseline benchmarks/baselines/sqlite.json
+    python benchmarks/bench_endpoints.py --reset --compare benchmarks/baselines/sqlite.json
+
+Boots app.main in-process (TestClient, no network) against a book generated
+by synthetic_data.py (SQLite by default, or a local PostgreSQL via --db-url;
+the database must be empty, --reset drops and recreates the tables first,
+--reuse skips generation and reads --manifest) and drives the key flows: login, public apply, approve, disburse,
+remit + allocate, org monthly report v2, dashboard summary and partner
+staff-loans.
+
+Per scenario it records throughput and p50/p95/p99 latency. --compare fails
+(exit 1) when a --gate metric regresses by more than --threshold (latency
+also by at least --min-delta-ms) or a scenario starts erroring. The default
+gate is p50/p95; p99 and throughput are stored but only worth gating with a
+few hundred requests per scenario on a quiet machine.
+
+The single-flight result TTL is set to 0 so every read request computes;
+--as-of is pinned so runs compare like with like.
+
+benchmarks/baselines/sqlite.json is a reference run at the defaults (its
+meta records the book and the Python version). Latency depends on the
+machine, so gate against a baseline saved on the machine doing the check.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_AS_OF = "2026-06-30"
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+class Scenario:
+    def __init__(self, name: str, run: Callable[[object, int], None], prepare: Optional[Callable[[int], None]] = None):
+        self.name = name
+        self.run = run
+        self.prepare = prepare
+
+
+class Bench:
+    """
+    Scenario state shared by worker threads: tokens, the manifest and pools
+    of application ids handed from one flow to the next.
+    """
+
+    def __init__(self, app, manifest: dict):
+        from fastapi.testclient import TestClient
+
+        self.app = app
+        self.manifest = manifest
+        self.lock = threading.Lock()
+        self.serial = 0
+        self.pending_ids: List[int] = []
+        self.approved_ids: List[int] = []
+
+        client = TestClient(app)
+        self.admin_headers = self._token(client, "/auth/login", manifest["admin"])
+        self.partner_headers = self._token(client, "/partner/auth/login", manifest["partner"])
+
+        as_of = date.fromisoformat(manifest["as_of"])
+        self.year, self.month = (as_of.year, as_of.month - 1) if as_of.month > 1 else (as_of.year - 1, 12)
+        self.org_id = manifest["largest_organization_id"]
+
+    @staticmethod
+    def _token(client, path: str, creds: dict) -> dict:
+        r = client.post(path, data={"username": creds["email"], "password": creds["password"]})
+        r.raise_for_status()
+        return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    def _next_serial(self) -> int:
+        with self.lock:
+            self.serial += 1
+            return self.serial
+
+    def _pop(self, pool: List[int]) -> int:
+        with self.lock:
+            return pool.pop()
+
+    @staticmethod
+    def _check(r, *codes) -> None:
+        if r.status_code not in codes:
+            raise RuntimeError(f"{r.request.method} {r.request.url.path} -> {r.status_code}: {r.text[:200]}")
+
+    # scenarios
+
+    def login(self, client, i: int) -> None:
+        creds = self.manifest["admin"]
+        self._check(client.post("/auth/login", data={"username": creds["email"], "password": creds["password"]}), 200)
+
+    def public_apply(self, client, i: int) -> None:
+        n = self._next_serial()
+        r = client.post(
+            f"/loan-applications/public/{self.manifest['link_token']}",
+            json={
+                "full_name": f"Bench Applicant {n}",
+                "email": f"bench{n}@applicant.example.com",
+                "phone": f"070{n:08d}",
+                "staff_id": f"BENCH-{n:07d}",
+                "net_pay": "150000",
+                "bvn": f"{70000000000 + n}",
+                "requested_amount": "100000",
+                "tenor_months": 6,
+            },
+        )
+        self._check(r, 201)
+        with self.lock:
+            self.pending_ids.append(r.json()["id"])
+
+    def approve(self, client, i: int) -> None:
+        app_id = self._pop(self.pending_ids)
+        r = client.patch(
+            f"/loan-applications/{app_id}/status",
+            json={"status": "APPROVED", "approved_amount": "100000"},
+            headers=self.admin_headers,
+        )
+        self._check(r, 200)
+        with self.lock:
+            self.approved_ids.append(app_id)
+
+    def disburse(self, client, i: int) -> None:
+        app_id = self._pop(self.approved_ids)
+        self._check(client.post(f"/disbursements/application/{app_id}", json={}, headers=self.admin_headers), 201)
+
+    def remit_and_allocate(self, client, i: int) -> None:
+        r = client.post(
+            "/partner/dashboard/remit",
+            json={"organization_id": self.org_id, "amount": "50000", "narration": "bench"},
+            headers=self.partner_headers,
+        )
+        self._check(r, 201)
+        tx_id = r.json()["transaction_id"]
+        self._check(client.post(f"/admin/remittances/transactions/{tx_id}/apply", headers=self.admin_headers), 200)
+
+    def report_v2(self, client, i: int) -> None:
+        r = client.get(
+            "/reports/org-monthly-v2",
+            params={"organization_id": self.org_id, "year": self.year, "month": self.month},
+            headers=self.admin_headers,
+        )
+        self._check(r, 200)
+
+    def dashboard_summary(self, client, i: int) -> None:
+        r = client.get("/dashboard/summary", params={"year": self.year, "month": self.month}, headers=self.admin_headers)
+        self._check(r, 200)
+
+    def partner_staff_loans(self, client, i: int) -> None:
+        self._check(client.get("/partner/dashboard/staff-loans", headers=self.partner_headers), 200)
+
+    # inputs for the chained flows when they run without their predecessor
+
+    def _fill(self, pool: List[int], n: int, step: Callable) -> None:
+        from fastapi.testclient import TestClient
+
+        client = TestClient(self.app)
+        while len(pool) < n:
+            step(client)
+
+    def prepare_approve(self, n: int) -> None:
+        self._fill(self.pending_ids, n, lambda c: self.public_apply(c, 0))
+
+    def prepare_disburse(self, n: int) -> None:
+        def step(client):
+            if not self.pending_ids:
+                self.public_apply(client, 0)
+            self.approve(client, 0)
+
+        self._fill(self.approved_ids, n, step)
+
+    def scenarios(self) -> List[Scenario]:
+        return [
+            Scenario("login", self.login),
+            Scenario("public_apply", self.public_apply),
+            Scenario("approve", self.approve, self.prepare_approve),
+            Scenario("disburse", self.disburse, self.prepare_disburse),
+            Scenario("remit_and_allocate", self.remit_and_allocate),
+            Scenario("report_v2", self.report_v2),
+            Scenario("dashboard_summary", self.dashboard_summary),
+            Scenario("partner_staff_loans", self.partner_staff_loans),
+        ]
+
+
+def run_scenario(app, scenario: Scenario, requests: int, warmup: int, concurrency: int) -> dict:
+    from fastapi.testclient import TestClient
+
+    if scenario.prepare is not None:
+        scenario.prepare(requests + warmup)
+
+    client = TestClient(app)
+    for i in range(warmup):
+        scenario.run(client, i)
+
+    local = threading.local()
+    errors: List[str] = []
+
+    def one(i: int) -> Optional[float]:
+        if not hasattr(local, "client"):
+            local.client = TestClient(app)
+        started = time.perf_counter()
+        try:
+            scenario.run(local.client, i)
+        except Exception as exc:
+            errors.append(str(exc))
+            return None
+        return time.perf_counter() - started
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        timings = list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - wall_start
+
+    ok = [t * 1000 for t in timings if t is not None]
+    if not ok:
+        raise RuntimeError(f"{scenario.name}: every request failed, first error: {errors[0]}")
+    return {
+        "requests": requests,
+        "errors": len(errors),
+        "throughput_rps": round(len(ok) / wall, 2),
+        "p50_ms": round(pct(ok, 50), 2),
+        "p95_ms": round(pct(ok, 95), 2),
+        "p99_ms": round(pct(ok, 99), 2),
+        "max_ms": round(max(ok), 2),
+    }
+
+
+def compare(current: dict, baseline: dict, gate: List[str], threshold: float, min_delta_ms: float) -> List[str]:
+    regressions = []
+    for name, cur in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for key in gate:
+            if key == "throughput_rps":
+                regressed = cur[key] < base[key] * (1 - threshold)
+            else:
+                regressed = cur[key] > base[key] * (1 + threshold) and cur[key] - base[key] >= min_delta_ms
+            if regressed:
+                regressions.append(f"{name}: {key} {base[key]} -> {cur[key]}")
+        if cur["errors"] > base.get("errors", 0):
+            regressions.append(f"{name}: errors {base.get('errors', 0)} -> {cur['errors']}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default="sqlite:///bench_endpoints.db")
+    parser.add_argument("--loans", type=int, default=20_000)
+    parser.add_argument("--orgs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.fromisoformat(DEFAULT_AS_OF))
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--reuse", action="store_true", help="skip generation, read --manifest")
+    parser.add_argument("--manifest", default="bench_endpoints.manifest.json")
+    parser.add_argument("--requests", type=int, default=100, help="timed requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=20, help="login is bcrypt-bound, so fewer")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--only", default=None, help="comma-separated scenario names")
+    parser.add_argument("--output", default=None, help="write this run's results here")
+    parser.add_argument("--save-baseline", default=None)
+    parser.add_argument("--compare", default=None, help="baseline JSON to gate against")
+    parser.add_argument("--gate", default="p50_ms,p95_ms", help="metrics checked by --compare")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore latency changes smaller than this")
+    args = parser.parse_args()
+
+    os.environ["DB_URL"] = args.db_url
+    os.environ.setdefault("SECRET_KEY", "endpoint-bench")
+    os.environ["SINGLE_FLIGHT_RESULT_TTL_SECONDS"] = "0"
+
+    from app.db import engine
+    from app.main import app
+    from synthetic_data import generate, prepare_database
+
+    if args.reuse:
+        manifest = json.loads(Path(args.manifest).read_text())
+    else:
+        prepare_database(engine, args.reset)
+        print(f"generating {args.loans:,} loans ...", flush=True)
+        manifest = generate(engine, loans=args.loans, orgs=args.orgs, seed=args.seed, as_of=args.as_of, progress=False)
+        Path(args.manifest).write_text(json.dumps(manifest, indent=2))
+        print(f"  done in {manifest['elapsed_seconds']}s", flush=True)
+
+    bench = Bench(app, manifest)
+    selected = set(args.only.split(",")) if args.only else None
+
+    results = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "dialect": engine.dialect.name,
+            "loans": manifest["counts"].get("loans"),
+            "repayments": manifest["counts"].get("repayments"),
+            "as_of": manifest["as_of"],
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+        },
+        "scenarios": {},
+    }
+
+    print(f"{'scenario':22s} {'rps':>8s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'errors':>7s}")
+    for scenario in bench.scenarios():
+        if selected and scenario.name not in selected:
+            continue
+        n = args.login_requests if scenario.name == "login" else args.requests
+        r = run_scenario(app, scenario, n, args.warmup, args.concurrency)
+        results["scenarios"][scenario.name] = r
+        print(
+            f"{scenario.name:22s} {r['throughput_rps']:8.1f} {r['p50_ms']:8.1f} "
+            f"{r['p95_ms']:8.1f} {r['p99_ms']:8.1f} {r['errors']:7d}",
+            flush=True,
+        )
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(results, baseline, args.gate.split(","), args.threshold, args.min_delta_ms)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nno regressions against", args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Roster pre-qualification benchmark: NumPy grid vs the per-applicant rule.
+
+    python benchmarks/bench_prequalification.py
+    python benchmarks/bench_prequalification.py --staff 100000 --products 6
+
+Builds an in-memory roster (no database) with a share of staff on active
+loans, open applications and existing installments, then times:
+- scalar: the public form's Decimal check, one staff x product x tenor at a time
+- grid: prequalification_crud.eligibility_grid for every product
+- csv: iter_prequalification_csv end to end (grid + formatting)
+The scalar pass runs on --scalar-staff staff (default 5000) and is scaled up;
+its amounts must match the grid's to the kobo, or the script exits 1.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from decimal import ROUND_FLOOR, Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def make_roster(staff: int, seed: int):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    salary = np.round(rng.lognormal(mean=11.9, sigma=0.45, size=staff), 2)
+    obligation = np.where(rng.random(staff) < 0.2, np.round(salary * rng.uniform(0.05, 0.5, staff), 2), 0.0)
+    return {
+        "customer_id": np.arange(1, staff + 1, dtype=np.int64),
+        "staff_id": np.array([f"BP{i:07d}" for i in range(staff)], dtype=object),
+        "full_name": np.array([f"Bench Staff {i}" for i in range(staff)], dtype=object),
+        "net_salary": salary,
+        "monthly_obligation": obligation,
+        "outstanding": obligation * 4,
+        "has_active_loan": rng.random(staff) < 0.1,
+        "has_open_application": rng.random(staff) < 0.03,
+    }
+
+
+def make_products(count: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        SimpleNamespace(
+            id=i + 1,
+            name=f"Product {i + 1}",
+            max_tenor_months=rng.choice((6, 12, 18, 24)),
+            min_amount=rng.choice((None, 10_000.0, 50_000.0)),
+            max_amount=rng.choice((None, 500_000.0, 2_000_000.0)),
+        )
+        for i in range(count)
+    ]
+
+
+def scalar_amount(net_salary, obligation, blocked, product, tenor, ratio):
+    """
+    What the public form would accept at most, via the same Decimal arithmetic.
+    """
+    if blocked:
+        return Decimal("0")
+    capacity = max(Decimal(str(net_salary)) * ratio - Decimal(str(obligation)), Decimal("0"))
+    amount = capacity * Decimal(tenor)
+    if product.max_amount is not None:
+        amount = min(amount, Decimal(str(product.max_amount)))
+    amount = amount.quantize(Decimal("0.01"), rounding=ROUND_FLOOR)
+    if amount <= 0 or (product.min_amount is not None and amount < Decimal(str(product.min_amount))):
+        return Decimal("0")
+    return amount
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--staff", type=int, default=50_000)
+    parser.add_argument("--products", type=int, default=4)
+    parser.add_argument("--scalar-staff", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    # no queries run; app.db only needs a URL to import
+    os.environ.setdefault("DB_URL", "sqlite://")
+    os.environ.setdefault("SECRET_KEY", "bench-prequalification")
+    import numpy as np
+    from app.config import settings
+    from app.crud import prequalification_crud
+
+    roster = make_roster(args.staff, args.seed)
+    products = make_products(args.products, args.seed)
+    cells = args.staff * sum(p.max_tenor_months for p in products)
+
+    t0 = time.perf_counter()
+    grids = [prequalification_crud.eligibility_grid(roster, p) for p in products]
+    grid_s = time.perf_counter() - t0
+
+    ratio = Decimal(str(settings.MAX_REPAYMENT_TO_SALARY_RATIO))
+    blocked = roster["has_active_loan"] | roster["has_open_application"]
+    sample = min(args.scalar_staff, args.staff)
+    mismatches = 0
+    t0 = time.perf_counter()
+    for p, grid in zip(products, grids):
+        for i in range(sample):
+            for t in range(1, p.max_tenor_months + 1):
+                expected = scalar_amount(
+                    roster["net_salary"][i], roster["monthly_obligation"][i], blocked[i], p, t, ratio
+                )
+                if Decimal(f"{grid[i, t - 1]:.2f}") != expected:
+                    mismatches += 1
+    scalar_s = (time.perf_counter() - t0) * args.staff / sample
+
+    t0 = time.perf_counter()
+    size = sum(len(chunk) for chunk in prequalification_crud.iter_prequalification_csv(
+        {"organization_id": 0, "roster": roster, "products": products}
+    ))
+    csv_s = time.perf_counter() - t0
+
+    result = {
+        "staff": args.staff,
+        "products": args.products,
+        "cells": cells,
+        "numpy": np.__version__,
+        "scalar_ms_est": round(scalar_s * 1000, 1),
+        "grid_ms": round(grid_s * 1000, 1),
+        "speedup": round(scalar_s / grid_s, 1) if grid_s else None,
+        "csv_ms": round(csv_s * 1000, 1),
+        "csv_mb": round(size / 1e6, 2),
+        "mismatches": mismatches,
+    }
+    print(json.dumps(result, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2) + "\n")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Work-queue benchmark: officers draining the PENDING queue concurrently.
+
+    python benchmarks/bench_queue_claim.py --reset
+    python benchmarks/bench_queue_claim.py --db-url postgresql+psycopg2://... --officers 1,4,16,32 --reset
+
+Builds a small synthetic book in an empty database (--reset drops and
+recreates the tables first). For each officer count, --applications PENDING
+applications (random priorities) are queued and that many threads each loop:
+claim --batch via loan_application_crud.claim_applications, hold them for
+--work-ms (the officer reading the file), decide them, until the queue is
+empty. Reports
+decisions/s per officer count and fails (exit 1) if any application was
+handed to two officers or left undecided.
+
+On PostgreSQL the claim is FOR UPDATE SKIP LOCKED, so throughput should grow
+with officers; on SQLite writes serialize, so the run mostly checks that
+claims never overlap.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def queue_applications(db, model, count: int, seed: int) -> None:
+    rng = random.Random(seed)
+    customer_ids = [row.id for row in db.query(model.Customer.id).limit(5000)]
+    product_id = db.query(model.LoanProduct.id).first().id
+    now = datetime.utcnow()
+    db.execute(
+        model.LoanApplication.__table__.insert(),
+        [
+            {
+                "customer_id": customer_ids[i % len(customer_ids)],
+                "product_id": product_id,
+                "requested_amount": 100000,
+                "tenor_months": 6,
+                "status": "PENDING",
+                "priority": rng.choice((10, 100, 100, 100, 500)),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(count)
+        ],
+    )
+    db.commit()
+
+
+def drain(officers, args, SessionLocal, model, crud) -> dict:
+    claims = Counter()
+    lock = threading.Lock()
+    errors = []
+
+    def officer(user_id: int) -> None:
+        db = SessionLocal()
+        try:
+            while True:
+                applications, _ = crud.claim_applications(db, user_id, args.batch)
+                if not applications:
+                    return
+                ids = [a.id for a in applications]
+                with lock:
+                    claims.update(ids)
+                time.sleep(args.work_ms / 1000)
+                db.query(model.LoanApplication).filter(model.LoanApplication.id.in_(ids)).update(
+                    {"status": "REJECTED", "officer_comment": "bench"}, synchronize_session=False
+                )
+                db.commit()
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}"[:200])
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=officer, args=(user_id,)) for user_id in officers]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    with SessionLocal() as db:
+        left = db.query(model.LoanApplication).filter(model.LoanApplication.status == "PENDING").count()
+    return {
+        "officers": len(officers),
+        "decided": sum(claims.values()),
+        "ms": round(wall * 1000, 1),
+        "per_s": round(sum(claims.values()) / wall),
+        "double_claimed": sum(1 for n in claims.values() if n > 1),
+        "left_pending": left,
+        "errors": errors[:5],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applications", type=int, default=2000)
+    parser.add_argument("--officers", default="1,2,4,8", help="comma-separated officer counts")
+    parser.add_argument("--batch", type=int, default=10)
+    parser.add_argument("--work-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=9)
+    parser.add_argument("--db-url", default="sqlite:///bench_queue_claim.db")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    os.environ["DB_URL"] = args.db_url
+    os.environ.setdefault("SECRET_KEY", "bench-queue-claim")
+    from app import model
+    from app.crud import loan_application_crud
+    from app.db import SessionLocal, engine
+    from synthetic_data import generate, prepare_database
+
+    prepare_database(engine, args.reset)
+    generate(engine, loans=500, orgs=10, progress=False)
+    counts = [int(n) for n in args.officers.split(",")]
+
+    with SessionLocal() as db:
+        # the generated book has its own PENDING applications; take them out of the way
+        db.query(model.LoanApplication).filter(model.LoanApplication.status == "PENDING").update(
+            {"status": "REJECTED"}, synchronize_session=False
+        )
+        users = [
+            model.User(full_name=f"Officer {i}", email=f"officer{i}@bench.example.com", hashed_password="x")
+            for i in range(max(counts))
+        ]
+        db.add_all(users)
+        db.commit()
+        officer_ids = [u.id for u in users]
+
+    runs = []
+    for n in counts:
+        with SessionLocal() as db:
+            queue_applications(db, model, args.applications, args.seed)
+        run = drain(officer_ids[:n], args, SessionLocal, model, loan_application_crud)
+        runs.append(run)
+        print(
+            f"{n:>3} officers  {run['ms']:>9.1f} ms  {run['per_s']:>7} decisions/s"
+            f"  double_claimed={run['double_claimed']} left={run['left_pending']} errors={len(run['errors'])}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"db_url": args.db_url, "runs": runs}, indent=2) + "\n")
+    failed = any(r["double_claimed"] or r["left_pending"] or r["errors"] for r in runs)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
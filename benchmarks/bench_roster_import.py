@@ -0,0 +1,96 @@
+"""
+Staff roster import benchmark (POST /customers/roster path, minus HTTP).
+
+    python benchmarks/bench_roster_import.py --reset
+    python benchmarks/bench_roster_import.py --rows 50000 --db-url postgresql+psycopg2://... --reset
+
+Imports a generated roster of --rows staff into an empty organization three
+times, as an HR team would over consecutive months:
+- initial: every row is new
+- monthly: --change-ratio of the rows have a new salary, the rest are as before
+- repeat: the same file again, nothing to write
+and reports wall time, rows/s and the inserted/updated/unchanged/rejected
+counts for each pass. Exits 1 if a pass reports different counts than the
+file implies. Needs an empty database; --reset drops and recreates the
+tables first.
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+HEADER = "staff_id,full_name,bvn,phone,email,net_salary\n"
+
+
+def roster(rows: int, salaries: dict) -> bytes:
+    out = io.StringIO()
+    out.write(HEADER)
+    for i in range(rows):
+        out.write(f"RS{i:07d},Roster Staff {i},3{i:010d},080{i:08d},staff{i}@roster.example.com,{salaries[i]}\n")
+    return out.getvalue().encode()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--change-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--db-url", default="sqlite:///bench_roster_import.db")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    os.environ["DB_URL"] = args.db_url
+    os.environ.setdefault("SECRET_KEY", "bench-roster-import")
+    from app import model
+    from app.crud import roster_crud
+    from app.db import SessionLocal, engine
+    from synthetic_data import prepare_database
+
+    prepare_database(engine, args.reset)
+    with SessionLocal() as db:
+        org = model.PartnerOrganization(name="Roster Bench Employer")
+        db.add(org)
+        db.commit()
+        org_id = org.id
+
+    rng = random.Random(args.seed)
+    salaries = {i: 100_000 + 500 * rng.randrange(400) for i in range(args.rows)}
+    changed = rng.sample(range(args.rows), int(args.rows * args.change_ratio))
+    initial = roster(args.rows, salaries)
+    for i in changed:
+        salaries[i] += 5_000
+    monthly = roster(args.rows, salaries)
+
+    passes = (
+        ("initial", initial, {"inserted": args.rows, "updated": 0, "unchanged": 0}),
+        ("monthly", monthly, {"inserted": 0, "updated": len(changed), "unchanged": args.rows - len(changed)}),
+        ("repeat", monthly, {"inserted": 0, "updated": 0, "unchanged": args.rows}),
+    )
+    results, failed = {}, False
+    for name, data, expected in passes:
+        with SessionLocal() as db:
+            t0 = time.perf_counter()
+            summary = roster_crud.import_roster_file(db, org_id, io.BytesIO(data))
+            wall = time.perf_counter() - t0
+        counts = {k: summary[k] for k in ("inserted", "updated", "unchanged", "rejected")}
+        ok = counts == dict(expected, rejected=0)
+        failed |= not ok
+        results[name] = dict(counts, ms=round(wall * 1000, 1), rows_per_s=round(args.rows / wall), ok=ok)
+        print(f"{name:<8} {wall * 1000:>9.1f} ms  {args.rows / wall:>9.0f} rows/s  {counts}{'' if ok else '  MISMATCH'}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"rows": args.rows, "db_url": args.db_url, "passes": results}, indent=2) + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Serialization benchmark: ORM + Pydantic vs projected rows + orjson.
+
+    python benchmarks/bench_serialization.py --rows 10000 --reset
+
+Seeds --rows inbound transactions (every other one partly allocated) for one
+organization and times, for the partner and admin transaction lists:
+- before: hydrate ORM objects, validate with from_attributes, FastAPI's
+  jsonable_encoder + json.dumps (admin list also with its old per-row SUM)
+- after:  column-projected rows, FastJSONResponse rendering (orjson)
+
+Allocations point at placeholder repayment ids, so run it on SQLite (the default).
+Needs an empty database; --reset drops and recreates the tables first.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def _seed(engine, model, rows: int) -> None:
+    from sqlalchemy import insert
+
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(model.PartnerOrganization), [{"id": 1, "name": "Bench Org", "is_active": True}])
+        conn.execute(
+            insert(model.InboundTransaction),
+            [
+                {
+                    "id": i,
+                    "organization_id": 1,
+                    "amount": Decimal("25000.00"),
+                    "reference": f"BENCH-{i:08d}",
+                    "narration": "Salary deduction",
+                    "sender_name": "Bench Org Payroll",
+                    "paid_at": now - timedelta(minutes=i),
+                    "match_status": "MATCHED" if i % 2 else "UNMATCHED",
+                    "created_at": now - timedelta(minutes=i),
+                }
+                for i in range(1, rows + 1)
+            ],
+        )
+        conn.execute(
+            insert(model.TransactionAllocation),
+            [
+                {"transaction_id": i, "repayment_id": i, "amount_applied": Decimal("20000.00")}
+                for i in range(1, rows + 1, 2)
+            ],
+        )
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--db-url", default="sqlite:///bench_serialization.db")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    args = parser.parse_args()
+
+    os.environ["DB_URL"] = args.db_url
+
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from sqlalchemy import func
+
+    from app.db import engine, SessionLocal
+    from app import model, schema
+    from app.crud import admin_remittance_crud, partner_dashboard_crud
+    from app.utils.fast_json import FastJSONResponse
+    from synthetic_data import prepare_database
+
+    prepare_database(engine, args.reset)
+    _seed(engine, model, args.rows)
+
+    tx_list = TypeAdapter(List[schema.InboundTransactionOut])
+
+    def partner_before():
+        db = SessionLocal()
+        try:
+            txs = (
+                db.query(model.InboundTransaction)
+                .filter(model.InboundTransaction.organization_id == 1)
+                .order_by(model.InboundTransaction.paid_at.desc())
+                .all()
+            )
+            validated = tx_list.validate_python(txs, from_attributes=True)
+            return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+        finally:
+            db.close()
+
+    def partner_after():
+        db = SessionLocal()
+        try:
+            return FastJSONResponse(partner_dashboard_crud.list_org_transactions(db, 1)).body
+        finally:
+            db.close()
+
+    def admin_before():
+        db = SessionLocal()
+        try:
+            txs = (
+                db.query(model.InboundTransaction)
+                .filter(model.InboundTransaction.organization_id == 1)
+                .order_by(model.InboundTransaction.paid_at.desc())
+                .all()
+            )
+            rows = []
+            for tx in txs:
+                applied = (
+                    db.query(func.coalesce(func.sum(model.TransactionAllocation.amount_applied), 0))
+                    .filter(model.TransactionAllocation.transaction_id == tx.id)
+                    .scalar()
+                )
+                applied = Decimal(str(applied or "0"))
+                rows.append({"tx": tx, "applied_amount": applied, "unallocated_amount": tx.amount - applied})
+            out = schema.AdminRemittanceTransactionsOut.model_validate(
+                {"organization_id": 1, "rows": rows}, from_attributes=True
+            )
+            return json.dumps(jsonable_encoder(out)).encode("utf-8")
+        finally:
+            db.close()
+
+    def admin_after():
+        db = SessionLocal()
+        try:
+            return FastJSONResponse(admin_remittance_crud.list_org_transactions_with_allocation(db, 1)).body
+        finally:
+            db.close()
+
+    print(f"{args.rows:,} rows, best of {args.repeat}")
+    for name, before, after in (
+        ("partner /transactions", partner_before, partner_after),
+        ("admin /transactions", admin_before, admin_after),
+    ):
+        b = _time(before, args.repeat)
+        a = _time(after, args.repeat)
+        print(f"  {name:24s} before {b * 1000:8.1f} ms   after {a * 1000:8.1f} ms   x{b / a:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Cold-start benchmark: how long a fresh worker takes to become useful.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --app-root /tmp/old-checkout --runs 15
+
+Each run is a fresh interpreter (what a gunicorn worker boot or recycle pays)
+that reports:
+- import_ms: `import app.main`
+- build_ms: getting the ASGI app object (create_app() / module attribute)
+- first_response_ms: lifespan startup + the first GET /
+- total_ms: all of the above
+
+--app-root points at another checkout (e.g. `git worktree add /tmp/old HEAD~1`)
+so two trees can be compared against the same database. Periodic jobs are
+disabled so only app startup is measured.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+METRICS = ("import_ms", "build_ms", "first_response_ms", "total_ms")
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app.main as main
+t1 = time.perf_counter()
+factory = getattr(main, "create_app", None)
+application = factory() if factory else main.app
+t2 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(application) as client:
+    status = client.get("/").status_code
+t3 = time.perf_counter()
+print(json.dumps({
+    "status": status,
+    "import_ms": (t1 - t0) * 1000,
+    "build_ms": (t2 - t1) * 1000,
+    "first_response_ms": (t3 - t2) * 1000,
+    "total_ms": (t3 - t0) * 1000,
+}))
+"""
+
+
+def run_once(app_root: Path, db_url: str) -> dict:
+    env = dict(os.environ)
+    env.update(
+        {
+            "DB_URL": db_url,
+            "PYTHONPATH": str(app_root),
+            "UNALLOCATED_SWEEP_ENABLED": "false",
+            "AS_OF_CHECKPOINT_ENABLED": "false",
+            "COHORT_REFRESH_ENABLED": "false",
+            "MONTH_CLOSE_ENABLED": "false",
+        }
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=str(app_root),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    if result["status"] != 200:
+        raise RuntimeError(f"GET / returned {result['status']}")
+    return result
+
+
+def summarize(runs: list) -> dict:
+    return {
+        m: {
+            "median": round(statistics.median(r[m] for r in runs), 1),
+            "min": round(min(r[m] for r in runs), 1),
+        }
+        for m in METRICS
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app-root", default=str(ROOT), help="checkout to boot (default: this one)")
+    parser.add_argument("--db-url", default=None, help="default: a temporary SQLite file")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", default=None, help="write the summary as JSON")
+    args = parser.parse_args()
+
+    app_root = Path(args.app_root).resolve()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.db_url or f"sqlite:///{tmp}/startup.db"
+        run_once(app_root, db_url)  # warm the bytecode cache; not counted
+        runs = [run_once(app_root, db_url) for _ in range(args.runs)]
+
+    summary = {"app_root": str(app_root), "runs": args.runs, "results": summarize(runs)}
+    print(f"{app_root}  ({args.runs} runs)")
+    print(f"{'metric':<20}{'median':>10}{'min':>10}")
+    for m in METRICS:
+        r = summary["results"][m]
+        print(f"{m:<20}{r['median']:>10.1f}{r['min']:>10.1f}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
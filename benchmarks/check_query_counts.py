@@ -0,0 +1,152 @@
+"""
+Query-count harness for list endpoints.
+
+    python benchmarks/check_query_counts.py [--db-url sqlite:///qc.db] [--reset]
+
+Seeds a small book, calls each list endpoint at two page sizes and checks
+that the number of SQL statements does not grow with the page size (i.e.
+the eager-load profiles cover everything the response schema touches).
+Needs an empty database; --reset drops and recreates the tables first.
+Runs with SQL_STRICT_MODE on, so @query_budget limits and the repeated
+statement limit are enforced as well. Exits non-zero on a mismatch.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+ROWS = 60
+SMALL, LARGE = 5, 50
+
+
+def _seed(db, model) -> None:
+    now = datetime.utcnow()
+    orgs = [model.PartnerOrganization(name=f"QC Org {i}", is_active=True) for i in range(3)]
+    products = [
+        model.LoanProduct(name=f"QC Product {i}", interest_rate=6.0, max_tenor_months=12, is_active=True)
+        for i in range(3)
+    ]
+    db.add_all(orgs + products)
+    db.flush()
+
+    links = [
+        model.CompanyLoanLink(
+            token=model.CompanyLoanLink.generate_token(),
+            organization_id=orgs[i % 3].id,
+            product_id=products[i % 3].id,
+            created_at=now - timedelta(minutes=i),
+        )
+        for i in range(ROWS)
+    ]
+    db.add_all(links)
+    db.flush()
+
+    for i in range(ROWS):
+        cust = model.Customer(
+            full_name=f"Staff {i}",
+            email=f"qc{i}@example.com",
+            phone="0",
+            staff_id=f"QC{i}",
+            organization_id=orgs[i % 3].id,
+            net_monthly_salary=Decimal("100000"),
+            created_at=now - timedelta(minutes=i),
+        )
+        db.add(cust)
+        db.flush()
+        app_row = model.LoanApplication(
+            customer_id=cust.id,
+            product_id=products[i % 3].id,
+            link_id=links[i].id,
+            requested_amount=Decimal("50000"),
+            tenor_months=6,
+            status="DISBURSED",
+            created_at=now - timedelta(minutes=i),
+        )
+        db.add(app_row)
+        db.flush()
+        db.add(
+            model.Loan(
+                application_id=app_row.id,
+                product_id=products[i % 3].id,
+                principal_amount=Decimal("50000"),
+                interest_rate=Decimal("6"),
+                total_payable=Decimal("53000"),
+                status="ACTIVE",
+                created_at=now - timedelta(minutes=i),
+            )
+        )
+    db.commit()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default="sqlite:///query_counts.db")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    args = parser.parse_args()
+
+    os.environ["DB_URL"] = args.db_url
+    os.environ.setdefault("SECRET_KEY", "query-count-harness")
+    os.environ["SQL_STRICT_MODE"] = "true"
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func
+
+    from app.db import engine, SessionLocal
+    from app import model
+    from app.main import app
+    from app.utils.query_counter import count_queries
+    from app.utils.sql_instrumentation import QueryBudgetExceeded
+    import app.security as security
+    from synthetic_data import prepare_database
+
+    prepare_database(engine, args.reset)
+
+    db = SessionLocal()
+    try:
+        _seed(db, model)
+        customer_id = db.query(func.min(model.Customer.id)).scalar()
+    finally:
+        db.close()
+
+    app.dependency_overrides[security.get_current_user] = lambda: model.User(
+        id=0, email="harness@example.com", full_name="Harness", role=model.UserRole.ADMIN, is_active=True
+    )
+    client = TestClient(app)
+
+    endpoints = [
+        "/loan-applications/",
+        "/loans/",
+        "/customers/",
+        "/loan-links/",
+        "/loan-products/",
+        f"/customers/{customer_id}/loan-history",
+    ]
+
+    failed = False
+    for url in endpoints:
+        counts = []
+        for limit in (SMALL, LARGE):
+            sep = "&" if "?" in url else "?"
+            with count_queries(engine) as log:
+                try:
+                    r = client.get(f"{url}{sep}limit={limit}")
+                except QueryBudgetExceeded as exc:
+                    print(f"{url:40s} {exc}")
+                    return 1
+            assert r.status_code == 200, (url, r.status_code, r.text)
+            counts.append(log.count)
+        status = "ok" if counts[0] == counts[1] else "GROWS WITH PAGE SIZE"
+        failed |= counts[0] != counts[1]
+        print(f"{url:40s} limit={SMALL}: {counts[0]:3d}  limit={LARGE}: {counts[1]:3d}  {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Open-loop load test for POST /loan-applications/public/{token}.
+
+    python benchmarks/load_public_apply.py --reset               # in-process, SQLite
+    python benchmarks/load_public_apply.py --db-url postgresql+psycopg2://... --reset
+    python benchmarks/load_public_apply.py --base-url http://127.0.0.1:8000 --token <link token>
+
+Submissions are scheduled at a fixed --rate (default 500/s, as during an
+employer campaign) regardless of how fast earlier ones finish, so a slow
+server shows up as latency and lag instead of a quietly lower request rate.
+Most submissions are distinct staff members; --repeat-ratio of them reuse an
+earlier staff ID, which exercises the upsert + open-application guard: every
+staff member must end up with exactly one accepted application.
+
+Reports achieved rate, p50/p95/p99 latency, start lag, status codes (429/503
+from admission control count as shed load) and the average SQL statements
+per request (from Server-Timing). Exits 1 when the achieved rate falls below
+--min-rate-ratio of the target or an unexpected outcome appears.
+
+In-process mode builds a small synthetic book (synthetic_data.py) in an
+empty database (--reset drops and recreates the tables first), uses its
+link and runs the app on this process's event loop: one worker, so with
+SQLite it checks correctness and statements per request rather than the
+500/s target. For the rate, run gunicorn/uvicorn workers on PostgreSQL and
+point --base-url (with --token) at them.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def payloads(total: int, repeat_ratio: float, seed: int):
+    rng = random.Random(seed)
+    run = f"{int(time.time()) % 100000:05d}"
+    issued = []
+    for i in range(total):
+        if issued and rng.random() < repeat_ratio:
+            yield rng.choice(issued), True
+            continue
+        staff_id = f"LD{run}-{i:07d}"
+        issued.append(staff_id)
+        yield {
+            "full_name": f"Load Tester {i}",
+            "email": f"load{run}.{i}@example.com",
+            "phone": f"081{i:08d}",
+            "staff_id": staff_id,
+            "net_pay": "250000",
+            "bvn": f"9{run}{i:05d}"[:11],
+            "requested_amount": "300000",
+            "tenor_months": 6,
+        }, False
+
+
+def make_client(args):
+    import httpx
+
+    if args.base_url:
+        return httpx.AsyncClient(base_url=args.base_url, timeout=30)
+
+    from app.main import app
+
+    # one event loop for the whole run, like a single worker process
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load", timeout=30)
+
+
+async def run(args, token: str) -> dict:
+    total = int(args.rate * args.duration)
+    by_staff = {}
+    jobs = []
+    for payload, repeat in payloads(total, args.repeat_ratio, args.seed):
+        if repeat:
+            payload = dict(by_staff[payload], full_name="Load Tester (again)")
+        else:
+            by_staff[payload["staff_id"]] = payload
+        jobs.append((payload, repeat))
+
+    url = f"/loan-applications/public/{token}"
+    latencies, lags, queries = [], [], []
+    statuses = Counter()
+    unexpected = Counter()
+    accepted = Counter()
+    shed = set()
+    limit = asyncio.Semaphore(args.max_in_flight)
+
+    async def submit(client, scheduled: float, payload: dict, repeat: bool):
+        async with limit:
+            lags.append(max(time.perf_counter() - scheduled, 0) * 1000)
+            t0 = time.perf_counter()
+            try:
+                r = await client.post(url, json=payload)
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+                unexpected[f"{type(e).__name__}: {e}"[:160]] += 1
+                return
+            latencies.append((time.perf_counter() - t0) * 1000)
+        statuses[r.status_code] += 1
+        if r.status_code == 201:
+            accepted[payload["staff_id"]] += 1
+        elif r.status_code in (429, 503):
+            # admission control shedding load is reported, not treated as a failure
+            shed.add(payload["staff_id"])
+        elif r.status_code != 400:
+            unexpected[f"{r.status_code}: {r.text[:120]}"] += 1
+        timing = r.headers.get("server-timing", "")
+        if 'desc="' in timing:
+            queries.append(int(timing.split('desc="')[1].split()[0]))
+
+    async with make_client(args) as client:
+        start = time.perf_counter() + 0.2
+        tasks = []
+        for i, (payload, repeat) in enumerate(jobs):
+            scheduled = start + i / args.rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(submit(client, scheduled, payload, repeat)))
+        await asyncio.gather(*tasks)
+        wall = time.perf_counter() - start
+
+    # a repeat may overtake its original, so check per staff member:
+    # exactly one accepted application each
+    wrong = sum(1 for staff_id in by_staff if accepted[staff_id] != 1 and staff_id not in shed)
+    if wrong:
+        unexpected["staff without exactly one accepted application"] = wrong
+
+    return {
+        "target_rps": args.rate,
+        "submitted": total,
+        "achieved_rps": round(total / wall, 1),
+        "p50_ms": round(pct(latencies, 50), 2),
+        "p95_ms": round(pct(latencies, 95), 2),
+        "p99_ms": round(pct(latencies, 99), 2),
+        "max_start_lag_ms": round(max(lags), 1),
+        "statuses": dict(statuses),
+        "shed": sum(statuses[code] for code in (429, 503)),
+        "unexpected": dict(unexpected),
+        "avg_queries": round(statistics.mean(queries), 2) if queries else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=500.0, help="submissions per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="cap on concurrent requests")
+    parser.add_argument("--repeat-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--min-rate-ratio", type=float, default=0.95)
+    parser.add_argument("--base-url", default=None, help="drive a running server instead of the in-process app")
+    parser.add_argument("--token", default=None, help="public link token (required with --base-url)")
+    parser.add_argument("--db-url", default="sqlite:///load_public_apply.db")
+    parser.add_argument("--loans", type=int, default=2_000, help="size of the in-process synthetic book")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    if args.base_url:
+        if not args.token:
+            parser.error("--token is required with --base-url")
+        token = args.token
+    else:
+        os.environ["DB_URL"] = args.db_url
+        os.environ.setdefault("SECRET_KEY", "load-public-apply")
+        from app import model  # noqa: F401  (registers the tables)
+        from app.db import engine
+        from synthetic_data import generate, prepare_database
+
+        prepare_database(engine, args.reset)
+        token = generate(engine, loans=args.loans, orgs=20, progress=False)["link_token"]
+
+    result = asyncio.run(run(args, token))
+    print(json.dumps(result, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2) + "\n")
+
+    failed = result["achieved_rps"] < args.rate * args.min_rate_ratio or result["unexpected"]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
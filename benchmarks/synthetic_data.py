@@ -0,0 +1,467 @@
+"""
+Synthetic loan book generator.
+
+    python benchmarks/synthetic_data.py --db-url sqlite:///synthetic.db --reset
+    python benchmarks/synthetic_data.py --db-url postgresql://... --loans 150000 --orgs 500 --reset
+
+Fills the real schema (app/model.py) with a deterministic book: orgs with a
+Zipf size distribution (a few huge employers, a long tail of small ones),
+products, links, customers, applications in every status, disbursed loans
+with schedules, disbursement journals, one remittance per org per month and
+the allocations/allocation events the inline waterfall would have written.
+
+Same --seed and --as-of give the same rows. Rows are written with COPY on
+PostgreSQL and executemany on SQLite; ~150k loans is ~1M repayments.
+Use --manifest to write credentials/ids for the benchmark harness.
+"""
+
+import argparse
+import csv
+import enum
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+FLUSH_ROWS = 50_000
+TENORS = (3, 6, 9, 12)
+TENOR_WEIGHTS = (0.2, 0.35, 0.25, 0.2)
+INTEREST_RATE = Decimal("6")
+
+ADMIN_EMAIL = "admin@synthetic.example.com"
+PARTNER_EMAIL = "partner@synthetic.example.com"
+PASSWORD = "synthetic-pass-1"
+
+# share of full / partial / missed monthly remittances per employer profile
+REMIT_PROFILES = {
+    "reliable": (0.97, 0.02, 0.01),
+    "average": (0.88, 0.08, 0.04),
+    "poor": (0.72, 0.16, 0.12),
+}
+
+# parents before children, so PostgreSQL FK checks pass on every flush
+TABLE_ORDER = (
+    "customers",
+    "loan_applications",
+    "loans",
+    "disbursements",
+    "journal_entries",
+    "journal_postings",
+    "repayments",
+    "inbound_transactions",
+    "transaction_allocations",
+    "allocation_events",
+)
+
+
+class _Writer:
+    """
+    Buffers plain row dicts per table and bulk-writes them in TABLE_ORDER.
+    """
+
+    def __init__(self, engine, tables):
+        self.engine = engine
+        self.tables = tables
+        self.postgres = engine.dialect.name == "postgresql"
+        self.buffers: Dict[str, List[dict]] = {name: [] for name in TABLE_ORDER}
+        self.counts: Dict[str, int] = {name: 0 for name in TABLE_ORDER}
+
+    def add(self, table: str, row: dict) -> None:
+        self.buffers[table].append(row)
+
+    def pending(self) -> int:
+        return sum(len(rows) for rows in self.buffers.values())
+
+    def flush(self) -> None:
+        with self.engine.begin() as conn:
+            for name in TABLE_ORDER:
+                rows = self.buffers[name]
+                if not rows:
+                    continue
+                if self.postgres:
+                    self._copy(conn, name, rows)
+                else:
+                    conn.execute(self.tables[name].insert(), rows)
+                self.counts[name] += len(rows)
+                self.buffers[name] = []
+
+    @staticmethod
+    def _copy(conn, name: str, rows: List[dict]) -> None:
+        columns = list(rows[0])
+        buf = io.StringIO()
+        out = csv.writer(buf)
+        for row in rows:
+            out.writerow([_copy_value(row[c]) for c in columns])
+        buf.seek(0)
+        cursor = conn.connection.cursor()
+        cursor.copy_expert(f"COPY {name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+def _copy_value(value):
+    if value is None:
+        return None
+    if isinstance(value, enum.Enum):
+        return value.name
+    return value
+
+
+def _cents(value: Decimal) -> int:
+    return int((value * 100).to_integral_value())
+
+
+def _money(cents: int) -> Decimal:
+    return Decimal(cents) / 100
+
+
+def _month_start(d: datetime) -> datetime:
+    return datetime(d.year, d.month, 1)
+
+
+def _next_month(d: datetime) -> datetime:
+    return datetime(d.year + (d.month == 12), d.month % 12 + 1, 1)
+
+
+def _org_sizes(rng: random.Random, orgs: int, loans: int, zipf: float) -> List[int]:
+    weights = [1 / (rank ** zipf) for rank in range(1, orgs + 1)]
+    sizes = [0] * orgs
+    for idx in rng.choices(range(orgs), weights=weights, k=loans):
+        sizes[idx] += 1
+    return sizes
+
+
+def generate(
+    engine,
+    loans: int = 150_000,
+    orgs: int = 500,
+    products: int = 4,
+    months: int = 24,
+    zipf: float = 1.1,
+    seed: int = 42,
+    as_of: Optional[date] = None,
+    progress: bool = True,
+) -> dict:
+    """
+    Writes the book into an empty schema and returns a manifest (counts,
+    credentials, largest org, a live link token).
+    """
+    from sqlalchemy import insert, text
+
+    from app import model
+    from app.security import get_password_hash
+
+    as_of_dt = datetime.combine(as_of or datetime.utcnow().date(), datetime.min.time())
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    tables = {name: model.Base.metadata.tables[name] for name in TABLE_ORDER}
+
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+
+    book_start = _month_start(as_of_dt - timedelta(days=30 * months))
+    sizes = _org_sizes(rng, orgs, loans, zipf)
+
+    org_rows, account_rows, product_rows, link_rows = [], [], [], []
+    for o in range(1, orgs + 1):
+        org_rows.append({
+            "id": o, "name": f"Employer {o:05d}", "email": f"hr{o}@employer.example.com", "phone": "0800000000",
+            "address": None, "contact_person_name": f"HR {o}", "contact_person_email": f"hr{o}@employer.example.com",
+            "contact_person_phone": "0800000000", "is_active": True, "created_at": book_start,
+        })
+        account_rows.append({
+            "id": o, "organization_id": o, "account_number": f"90{o:08d}", "bank_name": "NUN MFB",
+            "account_name": f"Employer {o:05d} Remittance", "provider": "synthetic", "is_active": True,
+            "created_at": book_start,
+        })
+    for p in range(1, products + 1):
+        product_rows.append({
+            "id": p, "name": f"Salary Advance {p}", "description": None, "interest_rate": float(INTEREST_RATE),
+            "max_tenor_months": max(TENORS), "min_amount": 10000.0, "max_amount": 5000000.0,
+            "repayment_frequency": "MONTHLY", "is_active": True, "created_at": book_start, "updated_at": book_start,
+        })
+    link_id = 0
+    for o in range(1, orgs + 1):
+        for p in range(1, products + 1):
+            link_id += 1
+            link_rows.append({
+                "id": link_id, "token": f"syn{seed}-{rng.getrandbits(64):016x}", "organization_id": o,
+                "product_id": p, "is_active": True, "expires_at": None, "created_at": book_start,
+            })
+
+    admin_hash = get_password_hash(PASSWORD)
+    largest_org = max(range(orgs), key=lambda i: sizes[i]) + 1
+    with engine.begin() as conn:
+        conn.execute(insert(model.PartnerOrganization), org_rows)
+        conn.execute(insert(model.PartnerRemittanceAccount), account_rows)
+        conn.execute(insert(model.LoanProduct), product_rows)
+        conn.execute(insert(model.CompanyLoanLink), link_rows)
+        conn.execute(insert(model.User), [{
+            "full_name": "Synthetic Admin", "email": ADMIN_EMAIL, "hashed_password": admin_hash,
+            "role": model.UserRole.ADMIN, "is_active": True, "created_at": book_start,
+        }])
+        conn.execute(insert(model.PartnerUser), [{
+            "organization_id": largest_org, "full_name": "Synthetic Partner", "email": PARTNER_EMAIL,
+            "hashed_password": admin_hash, "role": model.PartnerUserRole.PARTNER_ADMIN, "is_active": True,
+            "created_at": book_start,
+        }])
+
+    writer = _Writer(engine, tables)
+    ids = {name: 0 for name in TABLE_ORDER}
+
+    def next_id(table: str) -> int:
+        ids[table] += 1
+        return ids[table]
+
+    span_days = max((as_of_dt - book_start).days, 1)
+
+    for o in range(1, orgs + 1):
+        profile = REMIT_PROFILES[rng.choices(list(REMIT_PROFILES), weights=(0.5, 0.35, 0.15))[0]]
+        org_loans = sizes[o - 1]
+        extra_apps = int(org_loans * 0.25) + (1 if rng.random() < 0.5 else 0)
+        installments = []  # [due_date, installment_number, repayment row, loan_id, disbursed_at, outstanding cents]
+
+        for n in range(org_loans + extra_apps):
+            disbursed = n < org_loans
+            customer_id = next_id("customers")
+            salary = Decimal(max(30_000, round(rng.lognormvariate(12.0, 0.5), -3)))
+            principal = Decimal(min(5_000_000, max(10_000, round(float(salary) * rng.uniform(0.5, 2.5), -3))))
+            tenor = rng.choices(TENORS, weights=TENOR_WEIGHTS)[0]
+            product_id = rng.randint(1, products)
+            if disbursed:
+                disbursed_at = book_start + timedelta(days=rng.randrange(span_days), seconds=rng.randrange(86400))
+                applied_at = disbursed_at - timedelta(days=rng.randint(1, 10))
+            else:
+                applied_at = as_of_dt - timedelta(days=rng.randrange(60), seconds=rng.randrange(86400))
+
+            writer.add("customers", {
+                "id": customer_id, "full_name": f"Staff {customer_id}", "email": f"staff{customer_id}@employer.example.com",
+                "phone": f"080{customer_id:08d}", "staff_id": f"E{o:05d}-{n:06d}", "organization_id": o,
+                "bvn": f"2{customer_id:010d}", "net_monthly_salary": salary, "created_at": applied_at,
+                "nun_account_number": f"248{customer_id:08d}" if disbursed else None,
+                "account_balance": principal if disbursed else Decimal("0"),
+            })
+
+            status = "DISBURSED" if disbursed else rng.choices(("PENDING", "APPROVED", "REJECTED"), (0.4, 0.2, 0.4))[0]
+            app_id = next_id("loan_applications")
+            writer.add("loan_applications", {
+                "id": app_id, "customer_id": customer_id, "product_id": product_id,
+                "link_id": (o - 1) * products + product_id, "requested_amount": principal,
+                "approved_amount": principal if status in ("APPROVED", "DISBURSED") else None,
+                "tenor_months": tenor, "status": status, "officer_comment": None,
+                "created_at": applied_at, "updated_at": disbursed_at if disbursed else applied_at,
+            })
+            if not disbursed:
+                continue
+
+            loan_id = next_id("loans")
+            total = (principal + principal * INTEREST_RATE / 100 * tenor / 12).quantize(Decimal("0.01"))
+            monthly = (total / tenor).quantize(Decimal("0.01"))
+            reference = f"SYN-DISB-{loan_id:010d}"
+            loan_row = {
+                "id": loan_id, "application_id": app_id, "product_id": product_id, "principal_amount": principal,
+                "interest_rate": INTEREST_RATE, "total_payable": total, "start_date": disbursed_at,
+                "end_date": disbursed_at + timedelta(days=30 * tenor), "status": "ACTIVE",
+                "disbursed_at": disbursed_at, "disbursement_reference": reference, "created_at": disbursed_at,
+            }
+            writer.add("loans", loan_row)
+
+            disbursement_id = next_id("disbursements")
+            writer.add("disbursements", {
+                "id": disbursement_id, "loan_application_id": app_id, "loan_id": loan_id,
+                "customer_id": customer_id, "amount": principal, "method": "NUN_ACCOUNT", "reference": reference,
+                "narration": f"Loan disbursement for application #{app_id}", "created_at": disbursed_at,
+            })
+            entry_id = next_id("journal_entries")
+            writer.add("journal_entries", {
+                "id": entry_id, "entry_type": model.JournalEntryType.DISBURSEMENT_CREDIT,
+                "customer_id": customer_id, "disbursement_id": disbursement_id, "reverses_entry_id": None,
+                "reference": reference, "narration": f"Loan disbursement for application #{app_id}",
+                "created_at": disbursed_at,
+            })
+            for account, cust, amount, balance in (
+                ("CUSTOMER_DEPOSIT", customer_id, principal, principal),
+                ("LOAN_DISBURSEMENT_CLEARING", None, -principal, None),
+            ):
+                writer.add("journal_postings", {
+                    "id": next_id("journal_postings"), "entry_id": entry_id, "account": account,
+                    "customer_id": cust, "amount": amount, "balance_after": balance, "created_at": disbursed_at,
+                })
+
+            schedule = []
+            for i in range(1, tenor + 1):
+                rep = {
+                    "id": next_id("repayments"), "loan_id": loan_id, "installment_number": i,
+                    "due_date": disbursed_at + timedelta(days=30 * i), "amount_due": monthly,
+                    "amount_paid": Decimal("0.00"), "is_paid": False, "paid_at": None, "created_at": disbursed_at,
+                }
+                writer.add("repayments", rep)
+                schedule.append(rep)
+                installments.append([rep["due_date"], i, rep, loan_id, disbursed_at, _cents(monthly)])
+            loan_row["_schedule"] = schedule
+
+        _simulate_remittances(rng, writer, next_id, model, o, profile, installments, as_of_dt)
+
+        for row in writer.buffers["loans"]:
+            schedule = row.pop("_schedule", None)
+            if schedule is not None and all(r["is_paid"] for r in schedule):
+                row["status"] = "CLOSED"
+
+        if writer.pending() >= FLUSH_ROWS:
+            writer.flush()
+            if progress:
+                print(f"  orgs {o:,}/{orgs:,}  repayments {writer.counts['repayments']:,}", flush=True)
+
+    writer.flush()
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for name in TABLE_ORDER + ("partner_organizations", "partner_remittance_accounts", "loan_products",
+                                       "company_loan_links", "users", "partner_users"):
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), COALESCE(MAX(id), 1)) FROM {name}"
+                ))
+
+    link_token = next(r["token"] for r in link_rows if r["organization_id"] == largest_org)
+    return {
+        "seed": seed,
+        "as_of": as_of_dt.date().isoformat(),
+        "elapsed_seconds": round(time.perf_counter() - started, 1),
+        "counts": {"partner_organizations": orgs, "loan_products": products, **writer.counts},
+        "largest_organization_id": largest_org,
+        "largest_organization_loans": sizes[largest_org - 1],
+        "link_token": link_token,
+        "admin": {"email": ADMIN_EMAIL, "password": PASSWORD},
+        "partner": {"email": PARTNER_EMAIL, "password": PASSWORD},
+    }
+
+
+def _simulate_remittances(rng, writer, next_id, model, org_id, profile, installments, as_of_dt) -> None:
+    """
+    One remittance per month (around the 25th) sized to that month's dues,
+    applied oldest-due-first exactly like apply_inbound_transaction_to_org.
+    """
+    if not installments:
+        return
+    installments.sort(key=lambda r: (r[0], r[1]))
+
+    due_by_month: Dict[datetime, int] = {}
+    for due_date, _, _, _, _, cents in installments:
+        key = _month_start(due_date)
+        due_by_month[key] = due_by_month.get(key, 0) + cents
+
+    first_unpaid = 0
+    month = _month_start(installments[0][0])
+    while month <= as_of_dt:
+        paid_at = month + timedelta(days=24 + rng.randrange(5), hours=rng.randrange(8, 18))
+        due = due_by_month.get(month, 0)
+        outcome = rng.choices(("full", "partial", "missed"), weights=profile)[0]
+        month = _next_month(month)
+        if paid_at > as_of_dt or due == 0 or outcome == "missed":
+            continue
+        amount = due if outcome == "full" else int(due * rng.uniform(0.6, 0.95))
+        if amount <= 0:
+            continue
+
+        tx_id = next_id("inbound_transactions")
+        remaining = amount
+        applied = 0
+        i = first_unpaid
+        while remaining > 0 and i < len(installments):
+            inst = installments[i]
+            i += 1
+            if inst[5] <= 0 or inst[4] > paid_at:
+                continue
+            rep = inst[2]
+            cents = min(remaining, inst[5])
+            inst[5] -= cents
+            remaining -= cents
+            applied += 1
+            rep["amount_paid"] = _money(_cents(rep["amount_paid"]) + cents)
+            rep["paid_at"] = paid_at
+            rep["is_paid"] = inst[5] <= 0
+            writer.add("transaction_allocations", {
+                "id": next_id("transaction_allocations"), "transaction_id": tx_id, "repayment_id": rep["id"],
+                "amount_applied": _money(cents), "created_at": paid_at,
+            })
+            writer.add("allocation_events", {
+                "id": next_id("allocation_events"), "event_type": model.AllocationEventType.APPLIED,
+                "organization_id": org_id, "loan_id": inst[3], "repayment_id": rep["id"], "transaction_id": tx_id,
+                "amount": _money(cents), "effective_at": paid_at, "occurred_at": paid_at,
+            })
+        while first_unpaid < len(installments) and installments[first_unpaid][5] <= 0:
+            first_unpaid += 1
+
+        writer.add("inbound_transactions", {
+            "id": tx_id, "remittance_account_id": org_id, "organization_id": org_id, "amount": _money(amount),
+            "reference": f"SYN-RMT-{tx_id:010d}", "narration": f"Salary deductions {paid_at:%Y-%m}",
+            "sender_name": f"Employer {org_id:05d}", "paid_at": paid_at,
+            "match_status": model.TransactionMatchStatus.MATCHED if applied else model.TransactionMatchStatus.UNMATCHED,
+            "raw_payload": None, "created_at": paid_at,
+        })
+
+
+def prepare_database(engine, reset: bool) -> None:
+    """
+    Tables for a run: with reset they are dropped and recreated, otherwise only
+    missing ones are created and a database that already has data stops the
+    run. Nothing is dropped unless the caller asked for --reset.
+    """
+    from app.db import Base
+    from app import model
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.connect() as conn:
+        if conn.execute(model.PartnerOrganization.__table__.select().limit(1)).first() is not None:
+            sys.exit("Database already has data; pass --reset to rebuild it.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default="sqlite:///synthetic.db")
+    parser.add_argument("--loans", type=int, default=150_000, help="disbursed loans (~7 installments each)")
+    parser.add_argument("--orgs", type=int, default=500)
+    parser.add_argument("--products", type=int, default=4)
+    parser.add_argument("--months", type=int, default=24, help="disbursement window before --as-of")
+    parser.add_argument("--zipf", type=float, default=1.1, help="employer size skew (higher = more concentrated)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None, help="YYYY-MM-DD (default today, UTC)")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--manifest", default=None, help="write the manifest JSON here")
+    args = parser.parse_args()
+
+    os.environ["DB_URL"] = args.db_url
+    os.environ.setdefault("SECRET_KEY", "synthetic-data")
+
+    from app.db import engine
+
+    prepare_database(engine, args.reset)
+
+    manifest = generate(
+        engine,
+        loans=args.loans,
+        orgs=args.orgs,
+        products=args.products,
+        months=args.months,
+        zipf=args.zipf,
+        seed=args.seed,
+        as_of=args.as_of,
+    )
+    print(json.dumps(manifest, indent=2))
+    if args.manifest:
+        Path(args.manifest).write_text(json.dumps(manifest, indent=2))
+
+
+if __name__ == "__main__":
+    main()